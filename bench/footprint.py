@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Per-instance memory footprint of the statelogic building blocks.
+
+Usage: python bench/footprint.py
+
+Numbers are average bytes allocated per object as reported by tracemalloc,
+so they include every dict, closure and bound method an object pulls in.
+"""
+from __future__ import print_function, absolute_import, division
+from os.path import join, realpath
+import sys
+import tracemalloc
+
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import Attr, FSM, StateLogic
+from statelogic.Transition import Transition
+
+ROWS = [("e%d" % i, "S%d" % i, "S%d" % (i + 1)) for i in range(3)]
+
+class Holder(object):
+    pass
+
+def footprint(factory, count):
+    factory()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objects
+    return used // count
+
+def fsm_with_rows():
+    fsm = FSM()
+    for row in ROWS:
+        fsm.transition(*row)
+    return fsm
+
+CASES = [
+    ("Transition", lambda: Transition("go", "A", "B"), 5000),
+    ("Attr (holder + 1 value Attr)", lambda: Attr(Holder(), "x", "v"), 5000),
+    ("FSM()", FSM, 1000),
+    ("FSM() + 3 transitions", fsm_with_rows, 1000),
+    ("StateLogic()", StateLogic, 200),
+]
+
+def main():
+    for label, factory, count in CASES:
+        print("%-32s %8d bytes" % (label, footprint(factory, count)))
+
+if __name__ == '__main__':
+    main()
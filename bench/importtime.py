@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Import time of the statelogic entry points against a committed budget.
+
+Usage: python bench/importtime.py [--runs N]
+
+Each target is imported in a fresh ``python -X importtime`` process (Python
+3.7+). The median cumulative time is compared with ``bench/importtime.json``,
+which also lists stdlib modules a target must not pull in. The first run
+warms the bytecode cache and is discarded. Exits with status 1 when a
+budget is exceeded or a forbidden module is imported.
+"""
+from __future__ import print_function, absolute_import, division
+from os.path import dirname, join, realpath
+import json
+import os
+import subprocess
+import sys
+
+BENCH = dirname(realpath(__file__))
+SRC = realpath(join(BENCH, "../src/"))
+
+PROBE = "import sys; before = set(sys.modules); import %s; print(' '.join(sorted(set(sys.modules) - before)))"
+
+def run(target):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    process = subprocess.Popen([sys.executable, "-X", "importtime", "-c", PROBE % target],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, universal_newlines=True)
+    out, err = process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(err)
+    cumulative = None
+    for line in err.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == target:
+            cumulative = int(parts[1])
+    return cumulative, set(out.split())
+
+def main(argv):
+    runs = int(argv[argv.index("--runs") + 1]) if "--runs" in argv else 7
+    with open(join(BENCH, "importtime.json")) as f:
+        config = json.load(f)
+    failed = False
+    for target, budget in sorted(config["budget_us"].items()):
+        run(target)
+        results = [run(target) for i in range(runs)]
+        times = sorted(result[0] for result in results)
+        median = times[len(times) // 2]
+        loaded = results[-1][1] & set(config.get("forbidden", {}).get(target, []))
+        status = "ok"
+        if median > budget or loaded:
+            status = "OVER BUDGET" if median > budget else "FORBIDDEN IMPORTS"
+            failed = True
+        print("%-24s %8d us  (budget %8d us)  %s" % (target, median, budget, status))
+        if loaded:
+            print("    imports %s" % ", ".join(sorted(loaded)))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
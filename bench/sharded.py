@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Throughput of ShardedFleet for 1..N worker processes.
+
+Usage:
+    python bench/sharded.py                         # 1..cpu_count workers
+    python bench/sharded.py --workers 4             # 1..4 workers
+    python bench/sharded.py --events 400000 --entities 10000 --batch 1024
+
+Every run routes the same ``--events`` events over ``--entities`` order
+machines and reports events per second from the first ``submit()`` to
+``join()``. Scaling is bounded by the number of cores: on a single-core
+machine the extra workers only add scheduling overhead.
+"""
+from __future__ import print_function, absolute_import, division
+from os.path import join, realpath
+import multiprocessing
+import sys
+import time
+
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic.ShardedFleet import ShardedFleet
+
+ROWS = [("pay", "NEW", "PAID"), ("ship", "PAID", "SHIPPED"), ("restock", "SHIPPED", "NEW")]
+CYCLE = ("pay", "ship", "restock")
+
+def events(count, entities):
+    return [(i % entities, CYCLE[(i // entities) % 3]) for i in range(count)]
+
+def measure(workers, stream, batchSize):
+    fleet = ShardedFleet(ROWS, workers=workers, initial="NEW", batchSize=batchSize)
+    try:
+        fleet.states()  # wait until every worker is up
+        start = time.time()
+        fleet.submitMany(stream)
+        changes, outputs = fleet.join()
+        elapsed = time.time() - start
+    finally:
+        fleet.close()
+    assert len(changes) == len(stream)
+    return len(stream) / elapsed
+
+def option(argv, name, default=None):
+    return argv[argv.index(name) + 1] if name in argv else default
+
+def main(argv):
+    workers = int(option(argv, "--workers", multiprocessing.cpu_count()))
+    stream = events(int(option(argv, "--events", 200000)), int(option(argv, "--entities", 10000)))
+    batchSize = int(option(argv, "--batch", 1024))
+    print("%d events, %d cores" % (len(stream), multiprocessing.cpu_count()))
+    for count in range(1, workers + 1):
+        print("%3d workers %12.0f events/s" % (count, measure(count, stream, batchSize)))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""Timing benchmarks for construction, definition, firing, hooks and logging.
+
+Usage:
+    python bench/suite.py                      # print results
+    python bench/suite.py --json out.json      # also write them as JSON
+    python bench/suite.py --compare bench/baseline.json [--threshold 0.25]
+    python bench/suite.py --only fire          # cases whose name contains "fire"
+
+Each case reports the best of ``--repeat`` timeit runs in nanoseconds per
+operation. ``--compare`` flags every case that is more than ``--threshold``
+(a fraction, default 0.25) slower than the stored baseline. Timings depend on
+the machine, so a flagged case is only a warning unless ``--threshold`` is
+given, in which case the run exits with status 1. Refresh the baseline with
+``--json bench/baseline.json`` on the reference machine.
+"""
+from __future__ import print_function, absolute_import, division
+from os.path import join, realpath
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import Attr, FSM, StateLogic
+
+class Quiet(object):
+    """Swallow print() output while a logging case runs."""
+
+    def __enter__(self):
+        self.stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+
+    def __exit__(self, *exc):
+        sys.stdout.close()
+        sys.stdout = self.stdout
+
+def definition(count):
+    rows = [("e%d" % i, "S%d" % i, "S%d" % (i + 1)) for i in range(count)]
+    def define():
+        fsm = FSM()
+        for row in rows:
+            fsm.transition(*row)
+    return define
+
+def machine(hooks=0):
+    # Hooks are bound to the machine, so they take it as their argument
+    fsm = FSM()
+    fsm.transition("go", "IDLE", "BUSY").transition("back", "BUSY", "IDLE").state("IDLE")
+    for name in ("go", "back"):
+        if hooks >= 1:
+            fsm.on(name, lambda self: None)
+        if hooks >= 3:
+            fsm.before(name, lambda self: True)
+            fsm.after(name, lambda self: None)
+    return fsm
+
+def fire_direct(hooks):
+    fsm = machine(hooks)
+    def fire():
+        fsm.go()
+        fsm.back()
+    return fire
+
+def fire_by_name():
+    fsm = machine()
+    def fire():
+        fsm.fire("go")
+        fsm.fire("back")
+    return fire
+
+def message(useColor=True, logTo=False, level=None):
+    app = StateLogic()
+    app.useColor(useColor)
+    if logTo:
+        Attr(app, "logTo", join(message.dir, "bench.log"))
+    if level is not None:
+        app.logLevel(level)
+    def log():
+        app.infoMsg("processed %d items", "BENCH", 42)
+    return log
+
+# (name, factory returning the timed callable, operations per call, calls per run)
+CASES = [
+    ("construct FSM()", lambda: FSM, 1, 2000),
+    ("construct StateLogic()", lambda: StateLogic, 1, 200),
+    ("define 10 transitions", lambda: definition(10), 1, 200),
+    ("define 100 transitions", lambda: definition(100), 1, 20),
+    ("define 1000 transitions", lambda: definition(1000), 1, 2),
+    ("fire direct, 0 hooks", lambda: fire_direct(0), 2, 20000),
+    ("fire direct, 1 hook", lambda: fire_direct(1), 2, 20000),
+    ("fire direct, 3 hooks", lambda: fire_direct(3), 2, 20000),
+    ("fire by name, 0 hooks", fire_by_name, 2, 20000),
+    ("infoMsg color", lambda: message(True), 1, 2000),
+    ("infoMsg no color", lambda: message(False), 1, 2000),
+    ("infoMsg color + logTo", lambda: message(True, True), 1, 2000),
+    ("infoMsg no color + logTo", lambda: message(False, True), 1, 2000),
+    ("infoMsg below logLevel", lambda: message(True, True, StateLogic.CRITICAL), 1, 20000),
+]
+
+def measure(factory, per, number, repeat):
+    func = factory()
+    func()
+    best = min(timeit.Timer(func).repeat(repeat, number))
+    return best / number / per * 1e9
+
+def run(only=None, repeat=5):
+    results = {}
+    message.dir = tempfile.mkdtemp()
+    try:
+        with Quiet():
+            for name, factory, per, number in CASES:
+                if only is None or only in name:
+                    results[name] = measure(factory, per, number, repeat)
+    finally:
+        from statelogic import LogSink
+        LogSink.closeAll()
+        shutil.rmtree(message.dir)
+    return results
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name in sorted(results):
+        before = baseline.get(name)
+        if before is None:
+            print("%-28s %12.0f ns  (no baseline)" % (name, results[name]))
+            continue
+        change = results[name] / before - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print("%-28s %12.0f ns  %12.0f ns  %+7.1f%%%s" % (name, results[name], before, change * 100, flag))
+    return regressions
+
+def option(argv, name, default=None):
+    return argv[argv.index(name) + 1] if name in argv else default
+
+def main(argv):
+    results = run(option(argv, "--only"), int(option(argv, "--repeat", 5)))
+    baselinePath = option(argv, "--compare")
+    regressions = []
+    if baselinePath is None:
+        for name, factory, per, number in CASES:
+            if name in results:
+                print("%-28s %12.0f ns/op" % (name, results[name]))
+    else:
+        with open(baselinePath) as f:
+            baseline = json.load(f)["results"]
+        print("%-28s %15s  %15s  %8s" % ("case", "now", "baseline", "change"))
+        threshold = option(argv, "--threshold")
+        regressions = compare(results, baseline, float(threshold or 0.25))
+        if regressions and threshold is None:
+            print("warning: %d case(s) slower than the baseline; pass --threshold to fail" % len(regressions))
+            regressions = []
+    jsonPath = option(argv, "--json")
+    if jsonPath is not None:
+        with open(jsonPath, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "unit": "ns/op",
+                "results": dict((name, round(ns, 1)) for name, ns in results.items()),
+            }, f, indent=4, sort_keys=True)
+            f.write("\n")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
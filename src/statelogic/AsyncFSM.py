@@ -0,0 +1,177 @@
+# Python 3.5+ only: statelogic/__init__.py skips this module on Python 2
+import asyncio
+from .FSM import FSM
+
+# asyncio.current_task() is Python 3.7+
+current_task = getattr(asyncio, "current_task", None) or asyncio.Task.current_task
+
+class AsyncFSM(FSM):
+    """FSM whose event methods and fire() are coroutines.
+
+    Hooks may be plain functions or coroutine functions. A hook's result is
+    awaited only when it is awaitable, so sync hooks run inline without being
+    scheduled as tasks. Hooks run in the same before/on/after/onState order as
+    in FSM, through the same steps: only the hook calls are awaited.
+
+    Each transition, from the state check to the after and onState hooks,
+    runs under a per-instance asyncio.Lock, so two events awaited
+    concurrently cannot both pass a guard for the same state or overwrite
+    each other's transitionName()/fromState()/toState(). An event fired from
+    a hook in the same task re-enters the lock; a hook that waits for
+    another task firing the same machine deadlocks. threadSafe() is not
+    supported: one event loop thread drives the machine.
+    """
+
+    CLASSNAME = "AsyncFSM"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=AsyncFSM.CLASSNAME, ver=AsyncFSM)
+
+    @staticmethod
+    def __guard__(attrs):
+        # Made on first use, inside the running loop (Lock() binds to a loop
+        # before Python 3.10)
+        lock = attrs.get("__asyncLock__")
+        if lock is None:
+            lock = attrs["__asyncLock__"] = asyncio.Lock()
+            attrs["__holder__"] = None
+        return lock
+
+    @staticmethod
+    def __event__(fromClass, transition):
+        name, fromState, toState = transition.name(), transition.fromState(), transition.toState()
+        attrs = fromClass._
+        begin, commit, finish = FSM.__begin__, FSM.__commit__, FSM.__finish__
+        async def t(self):
+            if attrs["state"]._value != fromState:
+                return fromClass
+            lock = AsyncFSM.__guard__(attrs)
+            task = current_task()
+            held = attrs["__holder__"] is task
+            if not held:
+                await lock.acquire()
+                attrs["__holder__"] = task
+            try:
+                # Checked again: another event may have committed meanwhile
+                if attrs["state"]._value != fromState:
+                    return fromClass
+                before, on, after = transition.__hooks__
+                next = True
+                begin(attrs, name, fromState, toState)
+                if before is not None:
+                    next = before()
+                    if hasattr(next, "__await__"):
+                        next = await next
+                if next:
+                    attrs["nextState"]=toState
+                    if on is not None:
+                        result = on()
+                        if hasattr(result, "__await__"):
+                            await result
+                    commit(fromClass, attrs, name, fromState, toState)
+                    if after is not None:
+                        result = after()
+                        if hasattr(result, "__await__"):
+                            await result
+                    hook = attrs["__stateHooks__"].get(toState)
+                    if hook is not None:
+                        result = hook()
+                        if hasattr(result, "__await__"):
+                            await result
+                finish(attrs)
+            finally:
+                if not held:
+                    attrs["__holder__"] = None
+                    lock.release()
+            return fromClass
+        return t
+
+    @staticmethod
+    def __timed_event__(fromClass, transition, event):
+        attrs = fromClass._
+        fromState = transition.fromState()
+        clock, fired = FSM.__stopwatch__(fromClass, transition)
+        async def t(self):
+            if attrs["state"]._value != fromState:
+                return await event(self)
+            start = clock()
+            await event(self)
+            fired(start)
+            return fromClass
+        return t
+
+    @staticmethod
+    def __timed_hook__(hook, entry, kind, clock):
+        # The latency of a coroutine hook includes awaiting it
+        record = FSM.__hook_timer__(entry, kind, clock)
+        async def awaited(start, result):
+            return record(start, await result)
+        def timed():
+            start = clock()
+            result = hook()
+            if hasattr(result, "__await__"):
+                return awaited(start, result)
+            return record(start, result)
+        return timed
+
+    @staticmethod
+    def __queued_event__(fromClass, event):
+        attrs = fromClass._
+        queue = attrs["__queue__"]
+        async def queued(self):
+            if attrs["__busy__"]:
+                queue.append(event)
+                return fromClass
+            attrs["__busy__"] = True
+            try:
+                await event(self)
+                if queue:
+                    await AsyncFSM.__drain__(fromClass, None)
+            finally:
+                attrs["__busy__"] = False
+            return fromClass
+        return queued
+
+    @staticmethod
+    async def __drain__(fromClass, max):
+        attrs = fromClass._
+        queue = attrs["__queue__"]
+        raw = attrs["__raw__"] or {}
+        count = 0
+        while queue and (max is None or count < max):
+            result = FSM.__run_item__(fromClass, raw, queue.popleft())
+            if hasattr(result, "__await__"):
+                await result
+            count += 1
+        return count
+
+    async def drain(self, max=None):
+        fromClass = self.fromClass if hasattr(self, 'fromClass') else self
+        attrs = fromClass._
+        if attrs["__busy__"] or not attrs["__queue__"]:
+            return 0
+        attrs["__busy__"] = True
+        try:
+            return await AsyncFSM.__drain__(fromClass, max)
+        finally:
+            attrs["__busy__"] = False
+
+    async def fire(self, transition_name):
+        fromClass = self.fromClass if hasattr(self, 'fromClass') else self
+        method = FSM.__resolve__(fromClass, transition_name)
+        if method is not None:
+            result = method()
+            if hasattr(result, "__await__"):
+                await result
+        return fromClass
+
+    def threadSafe(self, flag=True):
+        # Coroutines run on one event loop thread, where a blocking lock would
+        # stall the loop; transitions are already serialized by the asyncio.Lock
+        if flag:
+            raise TypeError("AsyncFSM machines cannot be made thread-safe; drive them from one event loop")
+        return self.fromClass if hasattr(self, 'fromClass') else self
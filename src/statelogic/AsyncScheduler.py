@@ -0,0 +1,57 @@
+# Python 3.5+ only: statelogic/__init__.py skips this module on Python 2
+import asyncio
+from .Scheduler import Scheduler
+
+class AsyncScheduler(Scheduler):
+    """Scheduler driven by an asyncio task.
+
+    ``run()`` sleeps until the earliest deadline, waking early when a
+    machine arms an earlier one, and awaits the events of ``AsyncFSM``
+    machines. ``tick()`` is a coroutine.
+    """
+
+    CLASSNAME = "AsyncScheduler"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=AsyncScheduler.CLASSNAME, ver=AsyncScheduler)
+
+    def __init__(self, clock=None):
+        super().__init__(clock)
+        self.__event__ = None
+        self.__running__ = False
+
+    def __wake__(self):
+        if self.__event__ is not None:
+            self.__event__.set()
+
+    async def tick(self, now=None):
+        count = 0
+        for fromClass, event in self.__due__(self.__clock__() if now is None else now):
+            result = fromClass.fire(event)
+            if hasattr(result, "__await__"):
+                await result
+            count += 1
+        return count
+
+    async def run(self):
+        """Fire timeouts as they come due until ``stop()``."""
+        self.__event__ = asyncio.Event()
+        self.__running__ = True
+        try:
+            while self.__running__:
+                await self.tick()
+                self.__event__.clear()
+                try:
+                    await asyncio.wait_for(self.__event__.wait(), self.nextDeadline())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.__event__ = None
+
+    def stop(self):
+        self.__running__ = False
+        self.__wake__()
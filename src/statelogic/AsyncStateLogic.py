@@ -0,0 +1,15 @@
+# Python 3.5+ only: statelogic/__init__.py skips this module on Python 2
+from .AsyncFSM import AsyncFSM
+from .StateLogic import StateLogic
+
+class AsyncStateLogic(AsyncFSM, StateLogic):
+    """StateLogic driven by the coroutine-based transition engine of AsyncFSM."""
+
+    CLASSNAME = "AsyncStateLogic"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=AsyncStateLogic.CLASSNAME, ver=AsyncStateLogic)
@@ -22,67 +22,109 @@ class Attr(object):
         'yield', 'break', 'for', 'not', 'class', 'from', 'or', 'continue',
         'global', 'pass', 'attrList', 'hasattr']
 
+    # The instance dict is only materialised for standalone Attr objects
+    # (fromClass=None), which host their own accessors
+    __slots__ = ("_class", "_name", "_value", "_list", "_readonly", "_autostrip",
+        "_sorting", "_onChange", "_valueChoice", "_choiceSet", "_useChoiceOnly", "_set", "_sorted",
+        "__dict__")
+
+    def __call__(self, x=None):
+        if self._list is not None:
+            return self.lists(x)
+        return self.value(x)
+
     def lists(self,x=None):
         if x is None:
-            if self._["sorting"]:
-                return sorted(self._["list"])
-            elif self._["list"] is None:
+            if self._sorting:
+                if self._set is None:
+                    return sorted(self._list)
+                if self._sorted is None:
+                    self._sorted = sorted(self._list)
+                # A copy: callers must not be able to edit the cache
+                return list(self._sorted)
+            elif self._list is None:
                 return None
             else:
-                return self._["list"]
-        elif x not in self._["list"] and (not self._["readonly"] or self._["list"] is None):
-            if self._["list"] is None:
-                self._["list"]=[]
+                return self._list
+        elif self._set is not None:
+            if not self._readonly:
+                for l in (x if isinstance(x,list) else [x]):
+                    if isinstance(l,basestring) and self._autostrip:
+                        l=l.strip()
+                    if l not in self._set:
+                        self._set.add(l)
+                        self._list.append(l)
+                        self._sorted = None
+        elif x not in self._list and (not self._readonly or self._list is None):
+            if self._list is None:
+                self._list=[]
             if isinstance(x,list):
                 for l in x:
-                    if isinstance(l,basestring) and self._["autostrip"]:
+                    if isinstance(l,basestring) and self._autostrip:
                         l=l.strip()
-                    self._["list"].append(l)
+                    self._list.append(l)
             else:
-                if isinstance(x,basestring) and self._["autostrip"]:
+                if isinstance(x,basestring) and self._autostrip:
                     x=x.strip()
-                if x not in self._["list"]:
-                    self._["list"].append(x)
-        return self._["class"]
+                if x not in self._list:
+                    self._list.append(x)
+        return self._class
+
+    def contains(self,x):
+        if self._set is not None:
+            return x in self._set
+        return self._list is not None and x in self._list
 
     def value(self,x=None):
         if x is None:
-            return self._["value"]
+            return self._value
         elif isinstance(x,list):
-            return self._["class"]
-        if not self._["readonly"] or self._["value"] is None or self._["value"]=="":
+            return self._class
+        if not self._readonly or self._value is None or self._value=="":
             changed = False
-            if isinstance(x,basestring) and self._["autostrip"]:
+            if isinstance(x,basestring) and self._autostrip:
                 x=x.strip()
-            if self._["value"] is None or self._["value"]!=x:
-                if self._["valueChoice"] is not None and len(self._["valueChoice"]) > 0:
-                    for y in self._["valueChoice"]:
-                        if x==y:
-                            self._["value"]=x
-                            changed = True
-                            break
-                elif not self._["useChoiceOnly"]:
-                    self._["value"]=x
+            if self._value is None or self._value!=x:
+                if self._valueChoice is not None and len(self._valueChoice) > 0:
+                    if self.__chosen__(x):
+                        self._value=x
+                        changed = True
+                elif not self._useChoiceOnly:
+                    self._value=x
                     changed = True
-                if changed and self._["onChange"] is not None:
-                    self._["onChange"]()
-        return self._["class"]
+                if changed and self._onChange is not None:
+                    self._onChange()
+        return self._class
     
     def valueChoice(self,x=None):
         if x is None:
-            return self._["valueChoice"]
+            return self._valueChoice
         elif isinstance(x,list):
-            if self._["valueChoice"] is None:
-                self._["valueChoice"]=[]
+            if self._valueChoice is None:
+                self._valueChoice=[]
+                self._choiceSet=set()
             if isinstance(x,list):
                 for l in x:
                     if isinstance(l,basestring):
                         l=l.strip()
-                    if l not in self._["valueChoice"]:
-                        self._["valueChoice"].append(l)
-        return self._["class"]
+                    if not self.__chosen__(l):
+                        try:
+                            self._choiceSet.add(l)
+                        except TypeError:
+                            pass  # unhashable: kept in the list only
+                        self._valueChoice.append(l)
+        return self._class
+
+    def __chosen__(self, x):
+        # Set lookup, with the list as fallback for unhashable choices
+        try:
+            if x in self._choiceSet:
+                return True
+        except TypeError:
+            return x in self._valueChoice
+        return len(self._choiceSet) < len(self._valueChoice) and x in self._valueChoice
 
-    def __init__(self,fromClass=None,attrName='',value=None, readonly=False, autostrip=True, sorting=True, onChange=None, valueChoice=None, useChoiceOnly=False):
+    def __init__(self,fromClass=None,attrName='',value=None, readonly=False, autostrip=True, sorting=True, onChange=None, valueChoice=None, useChoiceOnly=False, indexed=False):
         if isinstance(attrName, basestring):
             attrName=attrName.strip()
             if attrName=="" or attrName in Attr.RESERVED:
@@ -95,26 +137,40 @@ class Attr(object):
                     def attrList(self):
                         return sorted(self._['attrList'])
                     fromClass.__dict__['attrList'] = attrList.__get__(fromClass)
-            if not hasattr(fromClass._, attrName):
+            if attrName not in fromClass._:
                 fromClass._['attrList'].append( attrName )
+            self._class = fromClass
+            self._name = attrName
+            self._readonly = readonly
+            self._autostrip = autostrip
+            self._onChange = onChange
+            self._valueChoice = None
+            self._choiceSet = None
+            self._useChoiceOnly = useChoiceOnly
+            self._sorted = None
             if isinstance(value, list):
-                self._ ={"class":fromClass,"name":attrName, "value":None,"list":value, "readonly":readonly, "autostrip": autostrip, "sorting": sorting, "onChange": onChange, "valueChoice": None, "useChoiceOnly": useChoiceOnly }
+                self._value = None
+                self._list = value
+                self._sorting = sorting
+                self._set = set(value) if indexed else None
             else:
                 if isinstance(value,basestring) and autostrip:
                     value = value.strip()
-                self._ ={"class":fromClass,"name":attrName, "value":value, "list":None, "readonly":readonly, "autostrip": autostrip, "sorting": False, "onChange": onChange, "valueChoice": None, "useChoiceOnly": useChoiceOnly}
+                self._value = value
+                self._list = None
+                self._sorting = False
+                self._set = None
             if valueChoice is not None:
                 self.valueChoice(valueChoice)
             fromClass._[attrName]=self
-            if not hasattr(fromClass,attrName):
-                if isinstance(value, list):
-                    def lists(self, value=None):
-                        return fromClass._[attrName].lists(value)
-                    fromClass.__dict__[attrName] = lists.__get__(fromClass)
-                else:
-                    def attr(self, value=None):
-                        return fromClass._[attrName].value(value)
-                    fromClass.__dict__[attrName] = attr.__get__(fromClass)
-                    def choice(self, choice=None):
-                        return fromClass._[attrName].valueChoice(choice)
-                    fromClass.__dict__[attrName+'Choice']=choice.__get__(fromClass)
\ No newline at end of file
+            # FSM picks its stateChanged() path from these: have it pick again
+            if attrName in ("logTo", "stateChanged") and "__settings__" in fromClass._:
+                fromClass._["__settings__"] = None
+            # Snapshot caches the user Attrs: a new or replaced one drops it
+            if "__userAttrs__" in fromClass._:
+                fromClass._["__userAttrs__"] = None
+            # The Attr itself is the accessor: fromClass.attrName(value=None)
+            if not hasattr(fromClass,attrName) or isinstance(fromClass.__dict__.get(attrName), Attr):
+                fromClass.__dict__[attrName] = self
+                if not isinstance(value, list):
+                    fromClass.__dict__[attrName+'Choice'] = self.valueChoice
@@ -0,0 +1,130 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import threading
+from collections import deque
+from .LogSink import LogSink
+
+class BufferedSink(LogSink):
+    """Queue lines in memory and hand them to ``sink`` in batches.
+
+    A daemon writer thread drains the queue whenever ``batchSize`` lines are
+    waiting or every ``interval`` seconds, so ``write()`` never touches the
+    file. When ``maxSize`` lines are queued, ``policy`` decides: ``"block"``
+    waits for the writer (back-pressure), ``"drop"`` discards the new line and
+    counts it in ``dropped()``.
+    """
+
+    CLASSNAME = "BufferedSink"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    POLICIES = ("block", "drop")
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=BufferedSink.CLASSNAME, ver=BufferedSink)
+
+    def __init__(self, sink, maxSize=10000, policy="block", batchSize=256, interval=0.5):
+        if policy not in BufferedSink.POLICIES:
+            raise ValueError("policy must be one of %s" % (", ".join(BufferedSink.POLICIES)))
+        try:
+            super().__init__()
+        except:
+            super(BufferedSink, self).__init__()
+        self.__sink__ = sink
+        self.__maxSize__ = maxSize
+        self.__policy__ = policy
+        self.__batchSize__ = batchSize
+        self.__interval__ = interval
+        self.__queue__ = deque()
+        self.__cond__ = threading.Condition()
+        # Reentrant: Signal.signal_handler() may flush in the middle of a
+        # drain on the same thread
+        self.__writeLock__ = threading.RLock()
+        self.__inflight__ = None
+        self.__dropped__ = 0
+        self.__closed__ = False
+        self.__thread__ = None
+
+    def __drain__(self):
+        # Taking the batch under the write lock keeps batches in queue order
+        with self.__writeLock__:
+            inflight = self.__inflight__
+            if inflight is not None:
+                # Reentered from a signal handler, which exits right after
+                # flushing: write the interrupted batch first. Its lines are
+                # written twice if the handler returns instead
+                self.__inflight__ = None
+                self.__sink__.writeLines(inflight)
+            with self.__cond__:
+                batch = list(self.__queue__)
+                self.__queue__.clear()
+                self.__cond__.notify_all()
+            if batch:
+                self.__inflight__ = batch
+                try:
+                    self.__sink__.writeLines(batch)
+                finally:
+                    self.__inflight__ = None
+
+    def __run__(self):
+        while True:
+            with self.__cond__:
+                if len(self.__queue__) < self.__batchSize__ and not self.__closed__:
+                    self.__cond__.wait(self.__interval__)
+                closed = self.__closed__
+            self.__drain__()
+            if closed:
+                return
+
+    def __start__(self):
+        thread = threading.Thread(target=self.__run__, name="BufferedSink")
+        thread.daemon = True
+        self.__thread__ = thread
+        thread.start()
+
+    def close(self):
+        with self.__cond__:
+            self.__closed__ = True
+            self.__cond__.notify_all()
+        thread = self.__thread__
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.__interval__ + 1)
+        try:
+            super().close()
+        except TypeError:
+            super(BufferedSink, self).close()
+        self.__sink__.close()
+
+    def dropped(self):
+        return self.__dropped__
+
+    def flush(self):
+        self.__drain__()
+        self.__sink__.flush()
+
+    def pending(self):
+        return len(self.__queue__)
+
+    def sink(self):
+        return self.__sink__
+
+    def writeLines(self, lines):
+        if self.__closed__:
+            self.__sink__.writeLines(lines)
+            return
+        with self.__cond__:
+            if self.__thread__ is None:
+                self.__start__()
+            for line in lines:
+                while len(self.__queue__) >= self.__maxSize__:
+                    if self.__policy__ == "drop":
+                        self.__dropped__ += 1
+                        break
+                    self.__cond__.notify_all()
+                    self.__cond__.wait(self.__interval__)
+                else:
+                    self.__queue__.append(line)
+            if len(self.__queue__) >= self.__batchSize__:
+                self.__cond__.notify_all()
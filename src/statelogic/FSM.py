@@ -1,8 +1,10 @@
 from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
 
-import os
 from .Attr import Attr  
+from .Settings import Settings
 from .Transition import Transition 
+from .TransitionContext import TransitionContext
+from .TransitionStats import TransitionStats
 from .Reflection import Reflection 
 
 class FSM(Reflection):
@@ -25,83 +27,184 @@ class FSM(Reflection):
 
     def fire(self, transition_name):
         fromClass = self.fromClass if hasattr(self, 'fromClass') else self
-        
-        # First, try direct method call (backward compat)
-        if transition_name in fromClass.methods():
-            fromClass.__dict__[transition_name]()
-            return fromClass
-        
-        # Second, search through registered transitions
-        for trans in fromClass.transitions():
-            if trans.name() == transition_name:
-                current = fromClass.state()
-                if current == trans.fromState():
-                    # Simulate the transition
-                    getattr(fromClass, transition_name)()  # will exist or be created dynamically
-                return fromClass
-                
+        method = FSM.__resolve__(fromClass, transition_name)
+        if method is not None:
+            method()
+        return fromClass
+
+    @staticmethod
+    def __resolve__(fromClass, transition_name):
+        # The method fire() calls for transition_name, or None when there is
+        # nothing to call now (shared with AsyncFSM.fire())
+
+        # Run-to-completion: an event fired during a transition waits its turn
+        attrs = fromClass._
+        if attrs["__busy__"] and attrs["__raw__"] and transition_name in attrs["__raw__"]:
+            attrs["__queue__"].append(attrs["__raw__"][transition_name])
+            return None
+
+        # First, look up the (state, event) dispatch index
+        if (fromClass.state(), transition_name) in fromClass._["__dispatch__"]:
+            return fromClass.__dict__[transition_name]
+
+        # A registered event that cannot fire from the current state is a no-op
+        if transition_name in fromClass._["__eventIndex__"]:
+            return None
+
+        # Otherwise, try direct method call (backward compat)
+        if fromClass._["methods"].contains(transition_name):
+            return fromClass.__dict__[transition_name]
+
         # If not found, maybe warn?
         if hasattr(fromClass, 'infoMsg'):
-            # NEW: Replace f-string with .format() for Py2 compat
-            fromClass.infoMsg("No transition named '{}' found from state '{}'".format(transition_name, fromClass.state()), "FSM")
-        return fromClass
+            # Formatted by infoMsg() only when its level is enabled
+            fromClass.infoMsg("No transition named '%s' found from state '%s'", "FSM", transition_name, fromClass.state())
+        return None
+
+    def can(self, transition_name):
+        fromClass = self.fromClass if hasattr(self, 'fromClass') else self
+        return (fromClass.state(), transition_name) in fromClass._["__dispatch__"]
 
     def after(self, name, foo):
         fromClass = self
         if hasattr(self, 'fromClass'):
             fromClass = self.fromClass
         name = name.strip()
-        if name in fromClass.events():
+        if fromClass._["events"].contains(name):
             newname="after" +name[0].upper() + name[1:]
-            if newname not in fromClass.methods():
+            if not fromClass._["methods"].contains(newname):
                 fromClass.__dict__[newname] = foo.__get__(self)
                 fromClass.methods(newname)
+                FSM.__bind_hooks__(fromClass, newname)
+        return fromClass
+
+    def context(self):
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        local = fromClass._["__local__"]
+        if local is not None:
+            stack = getattr(local, "stack", None)
+            return stack[-1] if stack else None
+        if fromClass._.get("transitionName", "") == "":
+            return None
+        return TransitionContext(fromClass._["transitionName"], fromClass._["fromState"],
+            fromClass._["toState"], fromClass._["nextState"])
+
+    def drain(self, max=None):
+        """Run up to ``max`` queued events (all when None) in FIFO order and
+        return how many ran. Events queued meanwhile join the end of the queue.
+        """
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        attrs = fromClass._
+        if attrs["__busy__"] or not attrs["__queue__"]:
+            return 0
+        lock = attrs["__lock__"]
+        if lock is not None:
+            lock.acquire()
+        attrs["__busy__"] = True
+        try:
+            return FSM.__drain__(fromClass, max)
+        finally:
+            attrs["__busy__"] = False
+            if lock is not None:
+                lock.release()
+
+    def post(self, event):
+        """Queue an event name (or a callable taking the machine) for drain()."""
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        attrs = fromClass._
+        if attrs["__queue__"] is None:
+            from collections import deque
+            attrs["__queue__"] = deque()
+        attrs["__queue__"].append(event)
         return fromClass
 
+    def runToCompletion(self, flag=True):
+        """Queue events raised during a transition until it has committed.
+
+        Without it, an event method called from a hook runs nested inside the
+        outer transition and clears its transitionName/fromState/toState.
+        """
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        attrs = fromClass._
+        if flag and attrs["__raw__"] is None:
+            if attrs["__queue__"] is None:
+                from collections import deque
+                attrs["__queue__"] = deque()
+            attrs["__raw__"] = {}
+        elif not flag and attrs["__raw__"] is not None:
+            attrs["__raw__"] = None
+        else:
+            return fromClass
+        for transition in fromClass.transitions():
+            FSM.__install__(fromClass, transition)
+        return fromClass
+
+    @staticmethod
+    def __current__(fromClass, key):
+        # Thread-safe mode keeps the running transition in a per-thread stack of
+        # TransitionContext objects instead of the shared fromClass._ fields
+        local = fromClass._["__local__"]
+        if local is None:
+            return fromClass._[key]
+        stack = getattr(local, "stack", None)
+        if not stack:
+            return ""
+        return getattr(stack[-1], key)()
+
     def fromState(self):
         fromClass = self
         if hasattr(self, 'fromClass'):
             fromClass = self.fromClass
-        return fromClass._["toState"]
+        return FSM.__current__(fromClass, "toState")
 
     def nextState(self):
         fromClass = self
         if hasattr(self, 'fromClass'):
             fromClass = self.fromClass
-        return fromClass._["nextState"]
+        return FSM.__current__(fromClass, "nextState")
 
     def toState(self):
         fromClass = self
         if hasattr(self, 'fromClass'):
             fromClass = self.fromClass
-        return fromClass._["fromState"]
+        return FSM.__current__(fromClass, "fromState")
 
     def transitionName(self):
         fromClass = self
         if hasattr(self, 'fromClass'):
             fromClass = self.fromClass
-        return fromClass._["transitionName"]
+        return FSM.__current__(fromClass, "transitionName")
 
     def on(self, name, foo):
         fromClass = self
         if hasattr(self, 'fromClass'):
             fromClass = self.fromClass
         name = name.strip()
-        if name in fromClass.events():
+        if fromClass._["events"].contains(name):
             newname= "on" +name[0].upper() + name[1:]
-            if newname not in fromClass.methods():
+            if not fromClass._["methods"].contains(newname):
                 fromClass.__dict__[newname] = foo.__get__(self)
                 fromClass.methods(newname)
-        elif name in fromClass.states():
+                FSM.__bind_hooks__(fromClass, newname)
+        elif fromClass._["states"].contains(name):
             newname= "on" + name.upper()
             newname2= "on" + self.__name_convert__(name.upper())
-            if newname not in fromClass.methods():
+            if not fromClass._["methods"].contains(newname):
                 if newname in fromClass.__dict__:
                     fromClass.methods(newname)
                 else:
                     fromClass.__dict__[newname] = foo.__get__(self)
                     fromClass.methods(newname)
-            elif newname2 not in fromClass.methods():
+                FSM.__bind_hooks__(fromClass, newname)
+            elif not fromClass._["methods"].contains(newname2):
                 if newname2 in fromClass.__dict__:
                     fromClass.methods(newname2)
                 else:
@@ -109,17 +212,35 @@ class FSM(Reflection):
                     fromClass.methods(newname2)
         return fromClass
 
+    def timeout(self, state, seconds, event):
+        """Fire ``event`` once the machine has spent ``seconds`` in ``state``.
+
+        The deadline is armed on entering ``state`` and only counts while
+        the machine is attached to a ``Scheduler``.
+        """
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        attrs = fromClass._
+        if attrs["__timeouts__"] is None:
+            attrs["__timeouts__"] = {}
+        attrs["__timeouts__"][state] = (seconds, event)
+        hookName = "on" + state.upper()
+        if hookName in attrs["__hookIndex__"]:
+            FSM.__bind_hooks__(fromClass, hookName)
+        return fromClass
+
     def stateChanged(self, func=""):
-        if ('STATE' in os.environ and os.environ['STATE'].lower() == 'show') \
-            or ('state' in os.environ and os.environ['state'].lower() == 'show') \
-            or (self.hasFunc('logTo') and self.logTo()!=''):
-            if func!="":
-                func = " in %s" % func
-            name = self._["transitionName"]
-            fromState = self._["fromState"]
-            toState = self._["toState"]
+        if Settings.showState() or (self.hasFunc('logTo') and self.logTo()!=''):
+            name = FSM.__current__(self, "transitionName")
+            fromState = FSM.__current__(self, "fromState")
+            toState = FSM.__current__(self, "toState")
+            # Formatted by infoMsg() only when its level is enabled
             if self.hasFunc('infoMsg'):
-                self.infoMsg("Transition (%s%s) : [%s] -> [%s]" % ( name, func, fromState, toState), "STATE CHANGED")
+                if func!="":
+                    self.infoMsg("Transition (%s in %s) : [%s] -> [%s]", "STATE CHANGED", name, func, fromState, toState)
+                else:
+                    self.infoMsg("Transition (%s) : [%s] -> [%s]", "STATE CHANGED", name, fromState, toState)
         return self
 
     def before(self, name, foo):
@@ -127,11 +248,12 @@ class FSM(Reflection):
         if hasattr(self, 'fromClass'):
             fromClass = self.fromClass
         name = name.strip()
-        if name in fromClass.events():
+        if fromClass._["events"].contains(name):
             newname= "before" +name[0].upper() + name[1:]
-            if newname not in fromClass.methods():
+            if not fromClass._["methods"].contains(newname):
                 fromClass.__dict__[newname] = foo.__get__(self)
                 fromClass.methods(newname)
+                FSM.__bind_hooks__(fromClass, newname)
         return fromClass
 
     def method(self, name, foo):
@@ -139,63 +261,463 @@ class FSM(Reflection):
         if hasattr(self, 'fromClass'):
             fromClass = self.fromClass
         name = name.strip()
-        if name not in fromClass.methods():
+        if not fromClass._["methods"].contains(name):
             fromClass.__dict__[name] = foo.__get__(self)
             fromClass.methods(name)
+            FSM.__bind_hooks__(fromClass, name)
+            if name in ("stateChanged", "logTo"):
+                fromClass._["__settings__"] = None
         return fromClass
+
+    @staticmethod
+    def __hook_names__(name):
+        suffix = name[0].upper() + name[1:]
+        return ("before" + suffix, "on" + suffix, "after" + suffix)
+
+    @staticmethod
+    def __bind_hooks__(fromClass, hookName):
+        # Hooks are resolved once here, never while firing
+        target = fromClass._["__hookIndex__"].get(hookName)
+        if target is None:
+            return
+        methods = fromClass._["methods"]
+        if isinstance(target, Transition):
+            hooks = []
+            for newname in FSM.__hook_names__(target.name()):
+                hooks.append(fromClass.__dict__.get(newname) if methods.contains(newname) else None)
+            stats = fromClass._["__stats__"]
+            if stats is not None:
+                entry = stats.setdefault(target.name(), TransitionStats())
+                timed = fromClass._["__fsm__"].__timed_hook__
+                clock = fromClass._["__clock__"]
+                hooks = [hook if hook is None else timed(hook, entry, kind, clock) \
+                    for hook, kind in zip(hooks, ("before", "on", "after"))]
+            target.__hooks__ = tuple(hooks)
+        else:
+            hook = None
+            if methods.contains(hookName) and hookName in fromClass.__dict__:
+                hook = fromClass.__dict__[hookName]
+            timeout = (fromClass._["__timeouts__"] or {}).get(target)
+            if timeout is not None:
+                hook = FSM.__timeout_hook__(fromClass, target, timeout, hook)
+            if hook is not None:
+                fromClass._["__stateHooks__"][target] = hook
+
+    @staticmethod
+    def __listen__(fromClass, listener):
+        # Listeners run right after an event method commits the new state,
+        # as listener(transitionName, fromState, toState), in attach order
+        attrs = fromClass._
+        previous = attrs["__committed__"]
+        if previous is None:
+            attrs["__committed__"] = listener
+            return
+        def committed(name, fromState, toState):
+            previous(name, fromState, toState)
+            listener(name, fromState, toState)
+        attrs["__committed__"] = committed
+
+    @staticmethod
+    def __timeout_hook__(fromClass, state, timeout, hook):
+        # Entering the state arms its deadline, then runs the on(state) hook
+        attrs = fromClass._
+        seconds, event = timeout
+        def entered():
+            scheduler = attrs["__scheduler__"]
+            if scheduler is not None:
+                scheduler.arm(fromClass, state, seconds, event)
+            if hook is not None:
+                return hook()
+        return entered
     
     def transition(self, name, fromState, toState):
         fromClass = self
         if hasattr(self, 'fromClass'):
             fromClass = self.fromClass
-        if name not in fromClass.events() and name not in Attr.RESERVED:
-            
-            for t in fromClass.transitions():
-                if t.fromState()==fromState and t.toState()==toState:
-                    return fromClass
-            def t(self):
-                if fromClass.state() == fromState:
-                    before= "before" +name[0].upper() + name[1:]
-                    next = True
-                    fromClass._["transitionName"]=name
-                    fromClass._["fromState"]=fromState
-                    fromClass._["toState"]=toState
-                    fromClass._["nextState"]=""
-                    if before in fromClass.methods():
-                        next = fromClass.__dict__[before]()
-                    if next:
-                        fromClass._["nextState"]=toState
-                        on= "on" +name[0].upper() + name[1:]
-                        if on in fromClass.methods():
-                            fromClass.__dict__[on]()
-                        fromClass.stateChanged()
-                        fromClass._["state"]._["value"] = toState
-                        fromClass._["nextState"]=""
-                        after= "after" +name[0].upper() + name[1:]
-                        if after in fromClass.methods():
-                            fromClass.__dict__[after]()
-                        self.onState(toState)
-                    fromClass._["transitionName"]=""
-                    fromClass._["fromState"]=""
-                    fromClass._["toState"]=""
-                    fromClass._["nextState"]=""
-                return fromClass
-            fromClass.__dict__[name] = t.__get__(self)
-            fromClass.events(name)
+        if FSM.__add_transition__(fromClass, name, fromState, toState):
+            FSM.__add_states__(fromClass, (fromState, toState))
+        return fromClass
+
+    def fromTable(self, rows):
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        if isinstance(rows, dict):
+            rows = [(name,) + tuple(row) for name, row in rows.items()]
+        states = []
+        hooked = []
+        for row in rows:
+            name, fromState, toState = row[0], row[1], row[2]
+            if FSM.__add_transition__(fromClass, name, fromState, toState):
+                states.append(fromState)
+                states.append(toState)
+            if len(row) > 3 and row[3]:
+                hooked.append((name, row[3]))
+        FSM.__add_states__(fromClass, states)
+        for name, hooks in hooked:
+            for kind in ("before", "on", "after"):
+                if kind in hooks:
+                    getattr(fromClass, kind)(name, hooks[kind])
+        return fromClass
+
+    @staticmethod
+    def __add_transition__(fromClass, name, fromState, toState):
+        # Returns False only for a duplicate (fromState, toState) edge,
+        # which leaves the states untouched
+        if not fromClass._["events"].contains(name) and name not in Attr.RESERVED:
+            if (fromState, toState) in fromClass._["__edges__"]:
+                return False
             transition = Transition(name, fromState, toState)
+            attrs = fromClass._
+            FSM.__install__(fromClass, transition)
+            attrs["__definition__"] = None
+            fromClass.events(name)
             fromClass.transitions(transition)
+            attrs["__edges__"].add((fromState, toState))
+            attrs["__dispatch__"][(fromState, name)] = transition
+            attrs["__eventIndex__"][name] = transition
             fromClass.methods(name)
-        fromClass.states(fromState)
-        fromClass.states(toState)
-        fromClass.stateChoice(fromClass.states())
+            hookNames = FSM.__hook_names__(name)
+            for newname in hookNames:
+                attrs["__hookIndex__"][newname] = transition
+            FSM.__bind_hooks__(fromClass, hookNames[0])
+        return True
+
+    @staticmethod
+    def __install__(fromClass, transition):
+        # Instrumentation is decided here, when the event method is built
+        attrs = fromClass._
+        t = attrs["__event__"](fromClass, transition)
+        if attrs["__stats__"] is not None:
+            t = attrs["__fsm__"].__timed_event__(fromClass, transition, t)
+        if attrs["__raw__"] is not None:
+            attrs["__raw__"][transition.name()] = t
+            t = attrs["__fsm__"].__queued_event__(fromClass, t)
+        fromClass.__dict__[transition.name()] = t.__get__(fromClass)
+
+    @staticmethod
+    def __queued_event__(fromClass, event):
+        # Run-to-completion: while a transition runs, events raised by its
+        # hooks are queued, then run in FIFO order once it has committed
+        attrs = fromClass._
+        queue = attrs["__queue__"]
+        lock = attrs["__lock__"]
+        def queued(self):
+            if attrs["__busy__"]:
+                queue.append(event)
+                return fromClass
+            attrs["__busy__"] = True
+            try:
+                event(self)
+                if queue:
+                    FSM.__drain__(fromClass, None)
+            finally:
+                attrs["__busy__"] = False
+            return fromClass
+        if lock is None:
+            return queued
+        def t(self):
+            with lock:
+                return queued(self)
+        return t
+
+    @staticmethod
+    def __drain__(fromClass, max):
+        attrs = fromClass._
+        queue = attrs["__queue__"]
+        raw = attrs["__raw__"] or {}
+        count = 0
+        while queue and (max is None or count < max):
+            FSM.__run_item__(fromClass, raw, queue.popleft())
+            count += 1
+        return count
+
+    @staticmethod
+    def __run_item__(fromClass, raw, item):
+        # One queued event: a callable, a raw event method or an event name
+        if callable(item):
+            return item(fromClass)
+        if item in raw:
+            return raw[item](fromClass)
+        return fromClass.fire(item)
+
+    @staticmethod
+    def __stopwatch__(fromClass, transition):
+        # The clock and a function recording one fire started at ``start``
+        attrs = fromClass._
+        entry = attrs["__stats__"].setdefault(transition.name(), TransitionStats())
+        clock = attrs["__clock__"]
+        def fired(start):
+            entry.transition.add(clock() - start)
+            entry.fires += 1
+        return clock, fired
+
+    @staticmethod
+    def __timed_event__(fromClass, transition, event):
+        attrs = fromClass._
+        fromState = transition.fromState()
+        clock, fired = FSM.__stopwatch__(fromClass, transition)
+        lock = attrs["__lock__"]
+        def timed(self):
+            if attrs["state"]._value != fromState:
+                return event(self)
+            start = clock()
+            event(self)
+            fired(start)
+            return fromClass
+        if lock is None:
+            return timed
+        def t(self):
+            with lock:
+                return timed(self)
+        return t
+
+    @staticmethod
+    def __hook_timer__(entry, kind, clock):
+        # Records one ``kind`` hook call started at ``start`` and passes its
+        # result through
+        histogram = getattr(entry, kind)
+        def record(start, result):
+            histogram.add(clock() - start)
+            if kind == "before" and not result:
+                entry.rejected += 1
+            return result
+        return record
+
+    @staticmethod
+    def __timed_hook__(hook, entry, kind, clock):
+        record = FSM.__hook_timer__(entry, kind, clock)
+        def timed():
+            start = clock()
+            return record(start, hook())
+        return timed
+
+    def instrument(self, flag=True):
+        """Record fire counts, guard rejections and hook/transition latencies.
+
+        Enabling (again) starts from empty counters; disabling reinstalls the
+        plain event methods and hooks.
+        """
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        attrs = fromClass._
+        if flag:
+            import time  # only paid for by machines that opt in
+            attrs["__clock__"] = getattr(time, "perf_counter", time.time)
+            attrs["__stats__"] = {}
+        elif attrs["__stats__"] is None:
+            return fromClass
+        else:
+            attrs["__stats__"] = None
+        for transition in fromClass.transitions():
+            FSM.__install__(fromClass, transition)
+            FSM.__bind_hooks__(fromClass, FSM.__hook_names__(transition.name())[0])
         return fromClass
 
+    def __reduce__(self):
+        # The injected bound methods cannot be pickled: rebuild the instance
+        # with type(self)() and replay its definition and snapshot instead
+        from .Snapshot import Snapshot
+        if self.fromClass is not self:
+            raise TypeError("cannot pickle an FSM attached to another object")
+        definitionId, rows, states, codes = Snapshot.definition(self)
+        return (type(self), (), (rows, states, Snapshot.pack(self)))
+
+    def __setstate__(self, state):
+        from .Snapshot import Snapshot
+        rows, states, record = state
+        self.fromTable(rows)
+        FSM.__add_states__(self, states)
+        Snapshot.unpack(self, record, states)
+
+    def restore(self, record):
+        """Set the state and user Attrs from a snapshot() of the same machine."""
+        from .Snapshot import Snapshot
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        return Snapshot.unpack(fromClass, record)
+
+    def snapshot(self):
+        """Compact binary record of the definition ID, state and user Attrs."""
+        from .Snapshot import Snapshot
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        return Snapshot.pack(fromClass)
+
+    def stats(self):
+        """Per-transition counters and histogram summaries (ns), or None when
+        instrumentation is off."""
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        stats = fromClass._["__stats__"]
+        if stats is None:
+            return None
+        return dict((name, entry.summary()) for name, entry in stats.items())
+
+    def statsText(self):
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        stats = fromClass.stats()
+        if stats is None:
+            return "instrumentation off"
+        lines = ["%-20s %8s %8s %10s %10s %10s %10s %10s %10s" % ("transition", "fires", "rejected",
+            "mean us", "p50 us", "p99 us", "before p99", "on p99", "after p99")]
+        for name in sorted(stats):
+            entry = stats[name]
+            timing = entry["transition"]
+            lines.append("%-20s %8d %8d %10.1f %10.1f %10.1f %10.1f %10.1f %10.1f" % (name,
+                entry["fires"], entry["rejected"], timing["mean"] / 1000.0, timing["p50"] / 1000.0,
+                timing["p99"] / 1000.0, entry["before"]["p99"] / 1000.0, entry["on"]["p99"] / 1000.0,
+                entry["after"]["p99"] / 1000.0))
+        return "\n".join(lines)
+
+    @staticmethod
+    def __configure__(fromClass):
+        # Pick the stateChanged() path once per settings snapshot: None when
+        # nothing would be logged and stateChanged() is not overridden
+        attrs = fromClass._
+        snapshot = Settings.snapshot()
+        changed = fromClass.stateChanged
+        if getattr(changed, "__func__", None) is FSM.__dict__["stateChanged"] \
+            and not snapshot["showState"] and not fromClass.hasFunc('logTo'):
+            changed = None
+        attrs["__changed__"] = changed
+        attrs["__settings__"] = snapshot
+
+    @staticmethod
+    def __begin__(attrs, name, fromState, toState):
+        # Publish the transition being tried to transitionName() and friends
+        attrs["transitionName"]=name
+        attrs["fromState"]=fromState
+        attrs["toState"]=toState
+        attrs["nextState"]=""
+
+    @staticmethod
+    def __commit__(fromClass, attrs, name, fromState, toState):
+        # The guard passed and the on hook ran: log, then commit the state
+        if attrs["__settings__"] is not Settings.__snapshot__:
+            FSM.__configure__(fromClass)
+        if attrs["__changed__"] is not None:
+            attrs["__changed__"]()
+        attrs["state"]._value = toState
+        if attrs["__committed__"] is not None:
+            attrs["__committed__"](name, fromState, toState)
+        attrs["nextState"]=""
+
+    @staticmethod
+    def __finish__(attrs):
+        attrs["transitionName"]=""
+        attrs["fromState"]=""
+        attrs["toState"]=""
+        attrs["nextState"]=""
+
+    @staticmethod
+    def __event__(fromClass, transition):
+        # Builds the event method installed as fromClass.<name>; AsyncFSM
+        # runs the same steps and awaits the hooks
+        name, fromState, toState = transition.name(), transition.fromState(), transition.toState()
+        attrs = fromClass._
+        begin, commit, finish = FSM.__begin__, FSM.__commit__, FSM.__finish__
+        def t(self):
+            if attrs["state"]._value == fromState:
+                before, on, after = transition.__hooks__
+                next = True
+                begin(attrs, name, fromState, toState)
+                if before is not None:
+                    next = before()
+                if next:
+                    attrs["nextState"]=toState
+                    if on is not None:
+                        on()
+                    commit(fromClass, attrs, name, fromState, toState)
+                    if after is not None:
+                        after()
+                    fromClass.onState(toState)
+                finish(attrs)
+            return fromClass
+        return t
+
+    @staticmethod
+    def __safe_event__(fromClass, transition):
+        # Thread-safe event method: the whole transition runs under the
+        # instance's re-entrant lock and publishes its context per thread
+        name, fromState, toState = transition.name(), transition.fromState(), transition.toState()
+        attrs = fromClass._
+        lock = attrs["__lock__"]
+        local = attrs["__local__"]
+        pending = TransitionContext(name, fromState, toState, "")
+        entering = TransitionContext(name, fromState, toState, toState)
+        commit = FSM.__commit__
+        def t(self):
+            with lock:
+                if attrs["state"]._value == fromState:
+                    before, on, after = transition.__hooks__
+                    stack = local.__dict__.setdefault("stack", [])
+                    stack.append(pending)
+                    try:
+                        next = True
+                        if before is not None:
+                            next = before()
+                        if next:
+                            stack[-1] = entering
+                            if on is not None:
+                                on()
+                            commit(fromClass, attrs, name, fromState, toState)
+                            stack[-1] = pending
+                            if after is not None:
+                                after()
+                            fromClass.onState(toState)
+                    finally:
+                        stack.pop()
+            return fromClass
+        return t
+
+    def threadSafe(self, flag=True):
+        fromClass = self
+        if hasattr(self, 'fromClass'):
+            fromClass = self.fromClass
+        attrs = fromClass._
+        if flag and attrs["__lock__"] is None:
+            import threading  # only paid for by machines that opt in
+            attrs["__lock__"] = threading.RLock()
+            attrs["__local__"] = threading.local()
+            attrs["__event__"] = FSM.__safe_event__
+        elif not flag and attrs["__lock__"] is not None:
+            attrs["__lock__"] = None
+            attrs["__local__"] = None
+            attrs["__event__"] = attrs["__fsm__"].__event__
+        else:
+            return fromClass
+        for transition in fromClass.transitions():
+            FSM.__install__(fromClass, transition)
+        return fromClass
+
+    @staticmethod
+    def __add_states__(fromClass, states):
+        newStates = []
+        for state in states:
+            if not fromClass._["states"].contains(state):
+                fromClass.states(state)
+                newStates.append(state)
+                newname = "on" + state.upper()
+                if newname not in fromClass._["__hookIndex__"]:
+                    fromClass._["__hookIndex__"][newname] = state
+                    FSM.__bind_hooks__(fromClass, newname)
+        if newStates:
+            fromClass.stateChoice(newStates)
+            fromClass._["__definition__"] = None
+
     def onState(self, state=None):
         if state is None:
             state = self.state()
-        newname= "on" + state.upper()
-        if newname in self.fromClass.methods():
-            self.fromClass.__dict__[newname]()
+        hook = self.fromClass._["__stateHooks__"].get(state)
+        if hook is not None:
+            hook()
 
     def __init__(self, fromClass=None):
         isSelf = False
@@ -205,19 +727,60 @@ class FSM(Reflection):
         self.fromClass = fromClass
         Attr(fromClass, "state", readonly=True, useChoiceOnly=True)
         Attr(fromClass, "nextState", "", readonly=True)
-        Attr(fromClass, attrName="methods", value = [])
-        Attr(fromClass, attrName="events", value = [])
-        Attr(fromClass, attrName="transitions", sorting=False, value = [])
-        Attr(fromClass, attrName="states", value = [])
+        Attr(fromClass, attrName="methods", value = [], indexed=True)
+        Attr(fromClass, attrName="events", value = [], indexed=True)
+        Attr(fromClass, attrName="transitions", sorting=False, value = [], indexed=True)
+        Attr(fromClass, attrName="states", value = [], indexed=True)
+        fromClass._["__fsm__"] = type(self)
+        fromClass._["__event__"] = type(self).__event__
+        fromClass._["__lock__"] = None
+        fromClass._["__local__"] = None
+        fromClass._["__changed__"] = None
+        fromClass._["__stats__"] = None
+        fromClass._["__definition__"] = None
+        fromClass._["__committed__"] = None
+        fromClass._["__queue__"] = None
+        fromClass._["__raw__"] = None
+        fromClass._["__busy__"] = False
+        fromClass._["__timeouts__"] = None
+        fromClass._["__scheduler__"] = None
+        fromClass._["__timer__"] = 0
+        fromClass._["__registry__"] = None
+        fromClass._["__clock__"] = None
+        fromClass._["__settings__"] = None
+        # Taken now so the first transition selects the stateChanged() path
+        Settings.snapshot()
+        fromClass._["__edges__"] = set()
+        fromClass._["__dispatch__"] = {}
+        fromClass._["__eventIndex__"] = {}
+        fromClass._["__hookIndex__"] = {}
+        fromClass._["__stateHooks__"] = {}
         fromClass.__dict__['onState'] = self.onState.__get__(fromClass)
         if not isSelf:
             fromClass.__dict__['fromClass'] = fromClass
             fromClass.__dict__['transition'] = self.transition.__get__(fromClass)
+            fromClass.__dict__['fromTable'] = self.fromTable.__get__(fromClass)
             fromClass.__dict__['after'] = self.after.__get__(fromClass)
             fromClass.__dict__['on'] = self.on.__get__(fromClass)   
             fromClass.__dict__['before'] = self.before.__get__(fromClass)
             fromClass.__dict__['method'] = self.method.__get__(fromClass)
             fromClass.__dict__['fire'] = self.fire.__get__(fromClass)
+            fromClass.__dict__['can'] = self.can.__get__(fromClass)
+            fromClass.__dict__['context'] = self.context.__get__(fromClass)
+            fromClass.__dict__['threadSafe'] = self.threadSafe.__get__(fromClass)
+            fromClass.__dict__['instrument'] = self.instrument.__get__(fromClass)
+            fromClass.__dict__['runToCompletion'] = self.runToCompletion.__get__(fromClass)
+            fromClass.__dict__['post'] = self.post.__get__(fromClass)
+            fromClass.__dict__['drain'] = self.drain.__get__(fromClass)
+            fromClass.__dict__['timeout'] = self.timeout.__get__(fromClass)
+            fromClass.__dict__['snapshot'] = self.snapshot.__get__(fromClass)
+            fromClass.__dict__['restore'] = self.restore.__get__(fromClass)
+            fromClass.__dict__['stats'] = self.stats.__get__(fromClass)
+            fromClass.__dict__['statsText'] = self.statsText.__get__(fromClass)
             fromClass.__dict__['stateChanged'] = self.stateChanged.__get__(fromClass)
             fromClass.__dict__['hasFunc'] = self.hasFunc.__get__(fromClass)
-            fromClass.__dict__['transitionName'] = self.transitionName.__get__(fromClass)
\ No newline at end of file
+            fromClass.__dict__['transitionName'] = self.transitionName.__get__(fromClass)
+        # Classes registered with Registry.register() join it at construction
+        registry = getattr(fromClass, "__registry__", None)
+        if registry is not None:
+            registry.join(fromClass)
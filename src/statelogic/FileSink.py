@@ -0,0 +1,91 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import io
+import os
+from .LogSink import LogSink
+
+class FileSink(LogSink):
+    """Append lines to a file through one persistent handle.
+
+    With ``maxBytes`` the file is rotated to ``path.1`` ... ``path.<backupCount>``
+    before a write would take it past that size.
+    """
+
+    CLASSNAME = "FileSink"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=FileSink.CLASSNAME, ver=FileSink)
+
+    def __init__(self, path, maxBytes=0, backupCount=1, autoflush=True):
+        try:
+            super().__init__()
+        except:
+            super(FileSink, self).__init__()
+        self.__path__ = path
+        self.__maxBytes__ = maxBytes
+        self.__backupCount__ = backupCount
+        self.__autoflush__ = autoflush
+        self.__handle__ = None
+        self.__size__ = 0
+
+    def __open__(self):
+        if self.__handle__ is None:
+            self.__handle__ = io.open(self.__path__, 'a', encoding='utf-8')
+            self.__size__ = self.__handle__.tell()
+        return self.__handle__
+
+    def __rotate__(self):
+        self.__handle__.close()
+        self.__handle__ = None
+        for i in range(self.__backupCount__, 0, -1):
+            # os.rename() does not replace an existing file on Windows
+            older = "%s.%d" % (self.__path__, i - 1) if i > 1 else self.__path__
+            newer = "%s.%d" % (self.__path__, i)
+            if os.path.exists(older):
+                if os.path.exists(newer):
+                    os.remove(newer)
+                os.rename(older, newer)
+        if os.path.exists(self.__path__):
+            os.remove(self.__path__)
+
+    def close(self):
+        try:
+            super().close()
+        except TypeError:
+            super(FileSink, self).close()
+        if self.__handle__ is not None:
+            try:
+                self.__handle__.close()
+            except (IOError, OSError):
+                pass
+            self.__handle__ = None
+
+    def flush(self):
+        if self.__handle__ is not None:
+            try:
+                self.__handle__.flush()
+            except (IOError, OSError):
+                pass
+
+    def path(self):
+        return self.__path__
+
+    def writeLines(self, lines):
+        data = u"\n".join(lines) + u"\n"
+        # maxBytes counts bytes on disk, not characters
+        size = len(data.encode('utf-8'))
+        try:
+            handle = self.__open__()
+            if self.__maxBytes__ and self.__size__ > 0 and self.__size__ + size > self.__maxBytes__:
+                self.__rotate__()
+                handle = self.__open__()
+            handle.write(data)
+            self.__size__ += size
+            if self.__autoflush__:
+                handle.flush()
+        except (IOError, OSError):
+            pass
@@ -0,0 +1,240 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+try:
+    basestring
+except NameError:
+    basestring=str  # Already Py2/3 compat shim
+# numpy is optional: only FleetFSM needs it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from .Machine import Machine
+
+class FleetFSM(object):
+    """Vectorized state machine for many entities sharing one definition.
+
+    States are stored as integer codes in a NumPy array indexed by entity ID,
+    and transitions as a dense ``(state, event) -> next state`` table. The
+    definition comes from an ``FSM``/``StateLogic`` instance (state codes follow
+    its ``stateChoice()`` list), a ``Machine`` or a ``SharedFSM`` subclass.
+    Code ``-1`` means "no state yet".
+
+    Hooks receive an array of entity IDs and run once per event group:
+    ``before`` returns ``True``/``False`` or a boolean mask over those IDs,
+    ``on``/``after`` run around the commit, and ``on(state, foo)`` runs for the
+    entities entering ``state``.
+
+    With a ``StateStore``, the code array is a view of the store's mapped
+    file: fleet transitions are persisted as they happen, and entities that
+    already have a state in the file keep it instead of taking ``initial``.
+    With a ``SharedStateStore``, every write is bracketed by the store's
+    ``begin()``/``end()`` so readers in other processes see whole steps.
+    """
+
+    CLASSNAME = "FleetFSM"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    NONE = -1
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=FleetFSM.CLASSNAME, ver=FleetFSM)
+
+    @staticmethod
+    def definition(source):
+        """Return ``(states, transitions)`` for an FSM, Machine or SharedFSM class."""
+        machine = getattr(source, "machine", None)
+        if isinstance(machine, Machine):
+            source = machine
+        if isinstance(source, Machine):
+            return list(source.stateList()), source.transitions()
+        return list(source.stateChoice() or []), list(source.transitions())
+
+    def __init__(self, source, size, initial=None, store=None):
+        if numpy is None:
+            raise ImportError("FleetFSM requires numpy")
+        states, transitions = FleetFSM.definition(source)
+        self.__states__ = states
+        self.__codes__ = dict((state, code) for code, state in enumerate(states))
+        self.__events__ = [t.name() for t in transitions]
+        self.__eventCodes__ = dict((name, code) for code, name in enumerate(self.__events__))
+        self.__dtype__ = numpy.int16 if len(states) < 32767 else numpy.int32
+        # The extra last row is the "no state" row, so code -1 indexes it directly
+        table = numpy.full((len(states) + 1, max(len(transitions), 1)), FleetFSM.NONE, dtype=self.__dtype__)
+        for code, t in enumerate(transitions):
+            table[self.__codes__[t.fromState()], code] = self.__codes__[t.toState()]
+        self.__table__ = table
+        self.__hooks__ = {}
+        self.__stateHooks__ = {}
+        initialCode = self.__codes__.get(initial, FleetFSM.NONE)
+        # Stores shared with reader processes bracket every write (seqlock)
+        self.__writer__ = store if hasattr(store, "begin") else None
+        if store is None:
+            self.__fleet__ = numpy.full(size, initialCode, dtype=self.__dtype__)
+        else:
+            if store.states() != states:
+                raise ValueError("the store was created for the states %r" % (store.states(),))
+            self.__fleet__ = store.reserve(size).codes()[:size]
+            if initialCode != FleetFSM.NONE:
+                self.__write__(self.__fleet__ == FleetFSM.NONE, initialCode)
+
+    def __len__(self):
+        return len(self.__fleet__)
+
+    def __ids__(self, ids):
+        if ids is None:
+            return numpy.arange(len(self.__fleet__))
+        return numpy.atleast_1d(numpy.asarray(ids, dtype=numpy.intp))
+
+    def __hook__(self, kind, name, foo):
+        name = name.strip()
+        if name in self.__eventCodes__:
+            hooks = list(self.__hooks__.get(self.__eventCodes__[name], (None, None, None)))
+            hooks[("before", "on", "after").index(kind)] = foo
+            self.__hooks__[self.__eventCodes__[name]] = tuple(hooks)
+        elif kind == "on" and name in self.__codes__:
+            self.__stateHooks__[self.__codes__[name]] = foo
+        return self
+
+    def after(self, name, foo):
+        return self.__hook__("after", name, foo)
+
+    def before(self, name, foo):
+        return self.__hook__("before", name, foo)
+
+    def can(self, event, ids=None):
+        """Boolean mask of the entities that may fire ``event``."""
+        ids = self.__ids__(ids)
+        events = self.eventCodes(event)
+        if events is None:
+            return numpy.zeros(len(ids), dtype=bool)
+        return self.__table__[self.__fleet__[ids], events] != FleetFSM.NONE
+
+    def code(self, state):
+        return self.__codes__.get(state, FleetFSM.NONE)
+
+    def codes(self):
+        """The state code array itself, indexed by entity ID."""
+        return self.__fleet__
+
+    def count(self, state):
+        return int(numpy.count_nonzero(self.__fleet__ == self.code(state)))
+
+    def countByState(self):
+        counts = numpy.bincount(self.__fleet__[self.__fleet__ != FleetFSM.NONE], minlength=len(self.__states__))
+        return dict((state, int(counts[code])) for code, state in enumerate(self.__states__))
+
+    def eventCodes(self, events):
+        """Map an event name, or a sequence of names or codes, to event codes."""
+        if isinstance(events, basestring):
+            return self.__eventCodes__.get(events)
+        events = numpy.asarray(events)
+        if events.ndim == 0:
+            code = int(events) if events.dtype.kind in "iu" else self.__eventCodes__.get(events.item(), -1)
+            return code if 0 <= code < len(self.__events__) else None
+        if events.dtype.kind in "iu":
+            # Out-of-range codes become -1, like unknown names
+            return numpy.where((events >= 0) & (events < len(self.__events__)), events, -1).astype(numpy.intp)
+        return numpy.array([self.__eventCodes__.get(e, -1) for e in events], dtype=numpy.intp)
+
+    def events(self):
+        return sorted(self.__events__)
+
+    def fire(self, event, ids=None, mask=None):
+        """Apply ``event`` (a name, or one event per ID) to ``ids`` in one step.
+
+        ``mask`` is an optional boolean array of guard results aligned with
+        ``ids``. Returns the IDs that changed state.
+        """
+        ids = self.__ids__(ids)
+        events = self.eventCodes(event)
+        if events is None:
+            return ids[:0]
+        if not numpy.isscalar(events):
+            known = events >= 0
+            if not known.all():
+                ids, events = ids[known], events[known]
+                if mask is not None:
+                    mask = numpy.asarray(mask)[known]
+        nextCodes = self.__table__[self.__fleet__[ids], events]
+        ok = nextCodes != FleetFSM.NONE
+        if mask is not None:
+            ok &= numpy.asarray(mask, dtype=bool)
+        if not self.__hooks__ and not self.__stateHooks__:
+            ids = ids[ok]
+            self.__write__(ids, nextCodes[ok])
+            return ids
+        if numpy.isscalar(events):
+            groups = [(events, ok)]
+        else:
+            groups = [(code, ok & (events == code)) for code in numpy.unique(events[ok])]
+        changed = []
+        for code, rows in groups:
+            changed.append(self.__fire_group__(int(code), ids, nextCodes, rows))
+        return numpy.concatenate(changed) if changed else ids[:0]
+
+    def __fire_group__(self, code, ids, nextCodes, rows):
+        before, on, after = self.__hooks__.get(code, (None, None, None))
+        if before is not None and rows.any():
+            passed = before(ids[rows])
+            if passed is not True:
+                selected = numpy.flatnonzero(rows)
+                rows = rows.copy()
+                rows[selected] = numpy.asarray(passed, dtype=bool)
+        group = ids[rows]
+        if len(group) == 0:
+            return group
+        if on is not None:
+            on(group)
+        toCode = nextCodes[rows]
+        self.__write__(group, toCode)
+        if after is not None:
+            after(group)
+        if self.__stateHooks__:
+            for stateCode in numpy.unique(toCode):
+                hook = self.__stateHooks__.get(int(stateCode))
+                if hook is not None:
+                    hook(group[toCode == stateCode])
+        return group
+
+    def __write__(self, ids, codes):
+        writer = self.__writer__
+        if writer is None:
+            self.__fleet__[ids] = codes
+            return
+        writer.begin()
+        try:
+            self.__fleet__[ids] = codes
+        finally:
+            writer.end()
+
+    def inState(self, state):
+        return numpy.flatnonzero(self.__fleet__ == self.code(state))
+
+    def name(self, code):
+        if code == FleetFSM.NONE:
+            return None
+        return self.__states__[code]
+
+    def on(self, name, foo):
+        return self.__hook__("on", name, foo)
+
+    def state(self, ids, state=None):
+        """Get the state name of one entity (or a list for many); with ``state``,
+        set it for the entities that have no state yet, like ``FSM.state()``."""
+        if state is None:
+            if numpy.isscalar(ids):
+                return self.name(int(self.__fleet__[ids]))
+            return [self.name(int(code)) for code in self.__fleet__[self.__ids__(ids)]]
+        code = self.code(state)
+        if code != FleetFSM.NONE:
+            ids = self.__ids__(ids)
+            ids = ids[self.__fleet__[ids] == FleetFSM.NONE]
+            self.__write__(ids, code)
+        return self
+
+    def states(self):
+        return sorted(self.__states__)
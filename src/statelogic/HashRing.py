@@ -0,0 +1,45 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import bisect
+import zlib
+
+class HashRing(object):
+    """Consistent hashing of entity IDs onto shards.
+
+    Every shard owns ``replicas`` points on a CRC32 ring and an entity
+    belongs to the first point at or after its own hash, so adding or
+    removing a shard only moves the entities of its neighbours. CRC32 is
+    stable across processes and interpreter runs, unlike ``hash()``.
+    """
+
+    CLASSNAME = "HashRing"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    CACHE = 1 << 20  # memoized entities before the cache is reset
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=HashRing.CLASSNAME, ver=HashRing)
+
+    @staticmethod
+    def key(value):
+        return zlib.crc32(str(value).encode("utf-8")) & 0xffffffff
+
+    def __init__(self, shards, replicas=64):
+        points = sorted((HashRing.key("%s#%d" % (shard, replica)), shard) \
+            for shard in shards for replica in range(replicas))
+        self.__points__ = [point for point, shard in points]
+        self.__shards__ = [shard for point, shard in points]
+        self.__cache__ = {}
+
+    def shard(self, entity):
+        """The shard that owns ``entity``."""
+        shard = self.__cache__.get(entity)
+        if shard is None:
+            if len(self.__cache__) >= HashRing.CACHE:
+                self.__cache__.clear()
+            index = bisect.bisect_left(self.__points__, HashRing.key(entity))
+            shard = self.__cache__[entity] = self.__shards__[index % len(self.__shards__)]
+        return shard
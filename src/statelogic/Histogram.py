@@ -0,0 +1,70 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+class Histogram(object):
+    """Latency histogram with power-of-two nanosecond buckets.
+
+    Bucket ``b`` counts samples below ``2 ** b`` ns (and at least
+    ``2 ** (b - 1)`` ns), so percentiles are upper bounds within a factor of 2.
+    """
+
+    CLASSNAME = "Histogram"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    BUCKETS = 48  # 2 ** 47 ns is about 39 hours
+
+    __slots__ = ("_count", "_total", "_min", "_max", "_buckets")
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Histogram.CLASSNAME, ver=Histogram)
+
+    def __init__(self):
+        self._count = 0
+        self._total = 0
+        self._min = 0
+        self._max = 0
+        self._buckets = [0] * Histogram.BUCKETS
+
+    def add(self, seconds):
+        ns = int(seconds * 1e9)
+        if self._count == 0 or ns < self._min:
+            self._min = ns
+        if ns > self._max:
+            self._max = ns
+        self._count += 1
+        self._total += ns
+        self._buckets[min(ns.bit_length(), Histogram.BUCKETS - 1)] += 1
+        return self
+
+    def count(self):
+        return self._count
+
+    def mean(self):
+        return self._total // self._count if self._count else 0
+
+    def percentile(self, p):
+        """Upper bound, in ns, of the bucket holding the ``p``-th percentile."""
+        if self._count == 0:
+            return 0
+        rank = p / 100.0 * self._count
+        seen = 0
+        for bucket, count in enumerate(self._buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(2 ** bucket, self._max)
+        return self._max
+
+    def summary(self):
+        return {
+            "count": self._count,
+            "total": self._total,
+            "min": self._min,
+            "max": self._max,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": dict((2 ** bucket, count) for bucket, count in enumerate(self._buckets) if count),
+        }
@@ -0,0 +1,316 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import io
+import numbers
+import os
+import struct
+import threading
+import time
+from collections import deque
+from .FSM import FSM
+from .LogSink import LogSink
+
+class Journal(LogSink):
+    """Append-only binary log of committed transitions with group commit.
+
+    Machines joined with ``attach(fsm, entity)`` append one record per
+    transition at the point where ``state`` is committed. Records are
+    queued in memory and a daemon thread commits them (write, flush and,
+    with ``sync``, ``fsync``) once ``batchSize`` records are waiting or
+    every ``interval`` seconds; ``commit()`` is the synchronous barrier.
+
+    The file is a sequence of tagged little-endian records::
+
+        N  name id (uint16), length (uint16), UTF-8 name
+        T  entity (int64), transition, from, to (name ids), timestamp (double)
+        S  entity (int64), state (name id)          -- written by compact()
+
+    Names are interned on first use, so a transition costs 23 bytes. A torn
+    record at the end of the file (a crash mid-write) is ignored by
+    ``records()`` and truncated when the journal is reopened.
+    """
+
+    CLASSNAME = "Journal"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    NAME = struct.Struct("<cHH")
+    TRANSITION = struct.Struct("<cqHHHd")
+    STATE = struct.Struct("<cqH")
+    MAX_NAMES = 1 << 16
+    MIN_ENTITY = -(1 << 63)
+    MAX_ENTITY = (1 << 63) - 1
+    CHUNK = 1 << 20
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Journal.CLASSNAME, ver=Journal)
+
+    @staticmethod
+    def __parse__(handle, names):
+        # Yields (file offset after the record, record) for each complete
+        # record, None for name records; reads in chunks so memory does not
+        # grow with the file
+        buffer = b""
+        base = 0
+        while True:
+            chunk = handle.read(Journal.CHUNK)
+            if not chunk:
+                return
+            # What is left of buffer is at most one partial record
+            buffer += chunk
+            offset = 0
+            size = len(buffer)
+            while offset < size:
+                tag = buffer[offset:offset + 1]
+                if tag == b"T":
+                    end = offset + Journal.TRANSITION.size
+                    if end > size:
+                        break
+                    _, entity, name, fromState, toState, timestamp = Journal.TRANSITION.unpack_from(buffer, offset)
+                    record = (entity, names[name], names[fromState], names[toState], timestamp)
+                elif tag == b"S":
+                    end = offset + Journal.STATE.size
+                    if end > size:
+                        break
+                    _, entity, state = Journal.STATE.unpack_from(buffer, offset)
+                    record = (entity, None, None, names[state], None)
+                elif tag == b"N":
+                    if offset + Journal.NAME.size > size:
+                        break
+                    _, code, length = Journal.NAME.unpack_from(buffer, offset)
+                    end = offset + Journal.NAME.size + length
+                    if end > size:
+                        break
+                    names[code] = buffer[offset + Journal.NAME.size:end].decode("utf-8")
+                    record = None
+                else:
+                    raise ValueError("corrupt journal record %r at offset %d" % (tag, base + offset))
+                yield base + end, record
+                offset = end
+            base += offset
+            buffer = buffer[offset:]
+
+    @staticmethod
+    def records(path):
+        """Iterate over ``(entity, transition, fromState, toState, timestamp)``.
+
+        Compacted states come back as ``(entity, None, None, state, None)``.
+        """
+        with io.open(path, "rb") as handle:
+            for end, record in Journal.__parse__(handle, {}):
+                if record is not None:
+                    yield record
+
+    @staticmethod
+    def replay(path, machines=None):
+        """Rebuild the latest state of every entity from the journal at ``path``.
+
+        Returns ``{entity: state}``. With ``machines`` (a ``{entity: fsm}``
+        mapping or a ``StateStore``) the states are also written back in
+        bulk; no hooks run, as with ``restore()``.
+        """
+        states = {}
+        for entity, transition, fromState, toState, timestamp in Journal.records(path):
+            states[entity] = toState
+        if machines is None:
+            return states
+        if hasattr(machines, "attach"):
+            for entity, state in states.items():
+                machines.state(entity, state)
+            return states
+        for entity, state in states.items():
+            fsm = machines.get(entity)
+            if fsm is not None:
+                fromClass = fsm.fromClass if hasattr(fsm, 'fromClass') else fsm
+                fromClass._["state"]._value = state
+                if fromClass._["state"]._onChange is not None:
+                    fromClass._["state"]._onChange()
+        return states
+
+    def __init__(self, path, batchSize=512, interval=0.05, sync=True):
+        try:
+            super().__init__()
+        except:
+            super(Journal, self).__init__()
+        self.__path__ = path
+        self.__batchSize__ = batchSize
+        self.__interval__ = interval
+        self.__sync__ = sync
+        self.__pending__ = deque()
+        self.__names__ = {}
+        self.__cond__ = threading.Condition()
+        self.__writeLock__ = threading.Lock()
+        self.__closed__ = False
+        self.__thread__ = None
+        self.__handle__ = self.__open__()
+
+    def __open__(self):
+        # Rebuild the name table and cut off a torn tail left by a crash
+        names = {}
+        valid = 0
+        exists = os.path.exists(self.__path__)
+        if exists:
+            with io.open(self.__path__, "rb") as handle:
+                for valid, record in Journal.__parse__(handle, names):
+                    pass
+        self.__names__ = dict((name, code) for code, name in names.items())
+        handle = io.open(self.__path__, "r+b" if exists else "w+b")
+        handle.truncate(valid)
+        handle.seek(valid)
+        return handle
+
+    def __intern__(self, names):
+        # The name record is queued before the code is published, so any
+        # record using the code comes after it in the file
+        with self.__cond__:
+            for name in names:
+                if name not in self.__names__:
+                    code = len(self.__names__)
+                    if code >= Journal.MAX_NAMES:
+                        raise ValueError("%s already holds %d names, the most a journal can intern" % (self.__path__, code))
+                    data = name.encode("utf-8")
+                    if len(data) > 0xffff:
+                        raise ValueError("name %r is longer than 65535 bytes" % (name[:32],))
+                    self.__pending__.append(Journal.NAME.pack(b"N", code, len(data)) + data)
+                    self.__names__[name] = code
+
+    def __commit__(self):
+        # Taking the batch under the write lock keeps batches in append order
+        with self.__writeLock__:
+            pending = self.__pending__
+            batch = [pending.popleft() for _ in range(len(pending))]
+            if batch and self.__handle__ is not None:
+                self.__handle__.write(b"".join(batch))
+                self.__handle__.flush()
+                if self.__sync__:
+                    os.fsync(self.__handle__.fileno())
+
+    def __run__(self):
+        while True:
+            with self.__cond__:
+                if len(self.__pending__) < self.__batchSize__ and not self.__closed__:
+                    self.__cond__.wait(self.__interval__)
+                closed = self.__closed__
+            self.__commit__()
+            if closed:
+                return
+
+    def __wake__(self):
+        with self.__cond__:
+            closed = self.__closed__
+            if closed:
+                pass
+            elif self.__thread__ is None:
+                thread = threading.Thread(target=self.__run__, name="Journal")
+                thread.daemon = True
+                self.__thread__ = thread
+                thread.start()
+            else:
+                self.__cond__.notify_all()
+        if closed:
+            self.__commit__()
+
+    def append(self, entity, transition, fromState, toState, timestamp=None):
+        """Queue one transition record; it is durable after the next commit."""
+        if self.__closed__:
+            raise ValueError("journal %s is closed" % self.__path__)
+        if timestamp is None:
+            timestamp = time.time()
+        names = self.__names__
+        if transition not in names or fromState not in names or toState not in names:
+            self.__intern__((transition, fromState, toState))
+        # deque.append is atomic: appenders take no lock
+        pending = self.__pending__
+        pending.append(Journal.TRANSITION.pack(b"T", entity, names[transition],
+            names[fromState], names[toState], timestamp))
+        # Wake the writer once, when the batch fills up, not on every append
+        # while it waits for the GIL
+        if len(pending) == self.__batchSize__ or self.__thread__ is None or self.__closed__:
+            self.__wake__()
+        return self
+
+    def attach(self, fsm, entity):
+        """Journal every transition ``fsm`` commits under ``entity``.
+
+        ``entity`` must be an int64 ID, and the machine's names are interned
+        now: a record that cannot be written fails here, not after a
+        transition has committed.
+        """
+        if not isinstance(entity, numbers.Integral):
+            raise TypeError("journal entities are integer IDs, not %r" % (entity,))
+        if not Journal.MIN_ENTITY <= entity <= Journal.MAX_ENTITY:
+            raise ValueError("entity %d does not fit in 64 bits" % (entity,))
+        fromClass = fsm.fromClass if hasattr(fsm, 'fromClass') else fsm
+        self.__intern__([transition.name() for transition in fromClass.transitions()] + list(fromClass.states()))
+        journal = self
+        def record(transition, fromState, toState):
+            journal.append(entity, transition, fromState, toState)
+        FSM.__listen__(fromClass, record)
+        return fsm
+
+    def close(self):
+        with self.__cond__:
+            self.__closed__ = True
+            self.__cond__.notify_all()
+        thread = self.__thread__
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.__interval__ + 1)
+        try:
+            super().close()
+        except TypeError:
+            super(Journal, self).close()
+        with self.__writeLock__:
+            if self.__handle__ is not None:
+                self.__handle__.close()
+                self.__handle__ = None
+
+    def commit(self):
+        """Write, flush and (with ``sync``) fsync every queued record now."""
+        if self.__closed__:
+            raise ValueError("journal %s is closed" % self.__path__)
+        self.__commit__()
+        return self
+
+    def compact(self):
+        """Rewrite the journal as the latest state of each entity.
+
+        The compacted file is a snapshot: ``replay()`` gives the same states,
+        and new transitions are appended after it.
+        """
+        if self.__closed__:
+            raise ValueError("journal %s is closed" % self.__path__)
+        with self.__writeLock__:
+            pending = self.__pending__
+            self.__handle__.write(b"".join([pending.popleft() for _ in range(len(pending))]))
+            self.__handle__.flush()
+            states = Journal.replay(self.__path__)
+            # Codes stay valid: appends racing with compaction keep using them
+            with self.__cond__:
+                records = [Journal.NAME.pack(b"N", code, len(name.encode("utf-8"))) + name.encode("utf-8") \
+                    for name, code in sorted(self.__names__.items(), key=lambda item: item[1])]
+            names = self.__names__
+            for entity in sorted(states):
+                records.append(Journal.STATE.pack(b"S", entity, names[states[entity]]))
+            temp = self.__path__ + ".compact"
+            with io.open(temp, "wb") as handle:
+                handle.write(b"".join(records))
+                handle.flush()
+                os.fsync(handle.fileno())
+            self.__handle__.close()
+            if os.name == "nt" and os.path.exists(self.__path__):
+                os.remove(self.__path__)  # rename does not replace on Windows
+            os.rename(temp, self.__path__)
+            self.__handle__ = io.open(self.__path__, "r+b")
+            self.__handle__.seek(0, os.SEEK_END)
+        return self
+
+    def flush(self):
+        self.__commit__()
+
+    def path(self):
+        return self.__path__
+
+    def pending(self):
+        return len(self.__pending__)
@@ -0,0 +1,66 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import atexit
+
+class LogSink(object):
+    """Destination for the lines written by ``Sh.prn()``.
+
+    Subclasses implement ``writeLines()``; every sink is flushed and closed
+    at interpreter exit and from ``Signal.signal_handler``.
+    """
+
+    CLASSNAME = "LogSink"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    __sinks__ = []
+    __paths__ = {}
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=LogSink.CLASSNAME, ver=LogSink)
+
+    @staticmethod
+    def closeAll():
+        for sink in list(LogSink.__sinks__):
+            sink.close()
+
+    @staticmethod
+    def flushAll():
+        for sink in list(LogSink.__sinks__):
+            sink.flush()
+
+    @staticmethod
+    def forPath(path):
+        """Shared sink for ``path`` (used for ``logTo()``): a ``BufferedSink``
+        over a persistent ``FileSink``, so ``prn()`` never waits on the file."""
+        sink = LogSink.__paths__.get(path)
+        if sink is None:
+            from .BufferedSink import BufferedSink
+            from .FileSink import FileSink
+            sink = LogSink.__paths__[path] = BufferedSink(FileSink(path))
+        return sink
+
+    def __init__(self):
+        if not LogSink.__sinks__:
+            atexit.register(LogSink.closeAll)
+        LogSink.__sinks__.append(self)
+
+    def close(self):
+        self.flush()
+        if self in LogSink.__sinks__:
+            LogSink.__sinks__.remove(self)
+        for path, sink in list(LogSink.__paths__.items()):
+            if sink is self:
+                del LogSink.__paths__[path]
+
+    def flush(self):
+        pass
+
+    def write(self, line):
+        self.writeLines([line])
+        return self
+
+    def writeLines(self, lines):
+        pass
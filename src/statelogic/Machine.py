@@ -0,0 +1,160 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+from operator import methodcaller
+from .Attr import Attr
+from .Transition import Transition
+try:
+    basestring
+except NameError:
+    basestring=str  # Already Py2/3 compat shim
+# Read-only views of the lookup tables; Py2 has no proxy, so keep a copy
+try:
+    from types import MappingProxyType as frozenDict
+except ImportError:
+    frozenDict = dict
+
+class Machine(object):
+    """Frozen machine definition shared by every instance of a class.
+
+    Rows follow ``FSM.fromTable()``: ``(name, fromState, toState)`` or
+    ``(name, fromState, toState, hooks)``, or a ``{name: (fromState, toState[, hooks])}``
+    dict. Hooks map ``"before"``, ``"on"`` and ``"after"`` to callables taking the
+    instance, or to a method name. ``stateHooks`` maps a state to the hook run
+    when it is entered.
+
+    The state, event and transition lists are tuples and the lookup tables
+    are read-only mappings, so no instance can change the definition that
+    the others share.
+    """
+
+    CLASSNAME = "Machine"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    __slots__ = ("__initial__", "__states__", "__codes__", "__events__",
+        "__transitions__", "__dispatch__", "__eventIndex__", "__stateHooks__",
+        "__sortedStates__", "__sortedEvents__")
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Machine.CLASSNAME, ver=Machine)
+
+    @staticmethod
+    def __hook__(hook):
+        if isinstance(hook, basestring):
+            return methodcaller(hook)
+        return hook
+
+    def __init__(self, rows, initial=None, stateHooks=None):
+        if isinstance(rows, dict):
+            rows = [(name,) + tuple(row) for name, row in rows.items()]
+        states = []
+        codes = {}
+        events = []
+        transitions = []
+        edges = set()
+        dispatch = {}
+        eventIndex = {}
+        for row in rows:
+            name, fromState, toState = row[0], row[1], row[2]
+            if name not in eventIndex and name not in Attr.RESERVED:
+                if (fromState, toState) in edges:
+                    continue
+                hooks = row[3] if len(row) > 3 and row[3] else {}
+                transition = Transition(name, fromState, toState)
+                transition.__hooks__ = tuple(Machine.__hook__(hooks.get(kind)) for kind in ("before", "on", "after"))
+                edges.add((fromState, toState))
+                events.append(name)
+                transitions.append(transition)
+                dispatch[(fromState, name)] = transition
+                eventIndex[name] = transition
+            for state in (fromState, toState):
+                if state not in codes:
+                    codes[state] = len(states)
+                    states.append(state)
+        hooks = {}
+        for state, hook in (stateHooks or {}).items():
+            hooks[state] = Machine.__hook__(hook)
+        object.__setattr__(self, "__initial__", initial if initial in codes else None)
+        object.__setattr__(self, "__states__", tuple(states))
+        object.__setattr__(self, "__codes__", frozenDict(codes))
+        object.__setattr__(self, "__events__", tuple(events))
+        object.__setattr__(self, "__transitions__", tuple(transitions))
+        object.__setattr__(self, "__dispatch__", frozenDict(dispatch))
+        object.__setattr__(self, "__eventIndex__", frozenDict(eventIndex))
+        object.__setattr__(self, "__stateHooks__", frozenDict(hooks))
+        object.__setattr__(self, "__sortedStates__", tuple(sorted(states)))
+        object.__setattr__(self, "__sortedEvents__", tuple(sorted(events)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Machine definitions are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Machine definitions are immutable")
+
+    def bind(self, cls):
+        """Install one method per event on ``cls`` and attach this definition."""
+        def event(name):
+            def e(self):
+                return self.fire(name)
+            e.__name__ = str(name)
+            return e
+        for name in self.__events__:
+            if name not in cls.__dict__:
+                setattr(cls, name, event(name))
+        cls.machine = self
+        cls.__machine_bound__ = self
+        return cls
+
+    def can(self, state, name):
+        return (state, name) in self.__dispatch__
+
+    def code(self, state):
+        return self.__codes__.get(state)
+
+    def events(self):
+        return list(self.__sortedEvents__)
+
+    def fire(self, obj, name):
+        transition = self.__dispatch__.get((obj.__fsm_state__, name))
+        if transition is not None:
+            before, on, after = transition.__hooks__
+            obj.__fsm_transition__ = transition
+            obj.__fsm_next__ = ""
+            next = True
+            if before is not None:
+                next = before(obj)
+            if next:
+                toState = transition.toState()
+                obj.__fsm_next__ = toState
+                if on is not None:
+                    on(obj)
+                obj.__fsm_state__ = toState
+                obj.__fsm_next__ = ""
+                if after is not None:
+                    after(obj)
+                hook = self.__stateHooks__.get(toState)
+                if hook is not None:
+                    hook(obj)
+            obj.__fsm_transition__ = None
+        return obj
+
+    def initial(self):
+        return self.__initial__
+
+    def name(self, code):
+        return self.__states__[code]
+
+    def stateList(self):
+        """States in registration order; a state's index is its code."""
+        return self.__states__
+
+    def states(self):
+        return list(self.__sortedStates__)
+
+    def transition(self, name):
+        return self.__eventIndex__.get(name)
+
+    def transitions(self):
+        return list(self.__transitions__)
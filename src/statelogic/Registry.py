@@ -0,0 +1,96 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import weakref
+from .FSM import FSM
+
+class Registry(object):
+    """Index of live machines by current state.
+
+    Machines join with ``join(fsm)``, or at construction once their class
+    is registered with ``register(cls)``. Each machine sits in the bucket of
+    its state and is moved by a commit listener when an event method
+    commits a new state, and by the ``state`` Attr's ``onChange`` when the
+    first state is set, so queries cost time proportional to their result.
+    Buckets hold weak references: the index never keeps a machine alive.
+    A machine belongs to at most one registry.
+    """
+
+    CLASSNAME = "Registry"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Registry.CLASSNAME, ver=Registry)
+
+    def __init__(self):
+        self.__buckets__ = {}
+
+    def __move__(self, fromClass, toState):
+        attrs = fromClass._
+        filed = attrs["__filed__"]
+        if filed == toState:
+            return
+        bucket = self.__buckets__.get(filed)
+        if bucket is not None:
+            bucket.discard(fromClass)
+        bucket = self.__buckets__.get(toState)
+        if bucket is None:
+            bucket = self.__buckets__[toState] = weakref.WeakSet()
+        bucket.add(fromClass)
+        attrs["__filed__"] = toState
+
+    def broadcast(self, event, state=None):
+        """Fire ``event`` on every member in ``state`` (all members when None);
+        returns how many were sent it."""
+        if state is None:
+            members = [member for bucket in list(self.__buckets__.values()) for member in list(bucket)]
+        else:
+            members = self.inState(state)
+        for member in members:
+            member.fire(event)
+        return len(members)
+
+    def countByState(self):
+        return dict((state, len(bucket)) for state, bucket in self.__buckets__.items() if len(bucket))
+
+    def inState(self, state):
+        bucket = self.__buckets__.get(state)
+        return list(bucket) if bucket is not None else []
+
+    def join(self, fsm):
+        fromClass = fsm.fromClass if hasattr(fsm, 'fromClass') else fsm
+        attrs = fromClass._
+        if attrs["__registry__"] is not None:
+            return fsm
+        attrs["__registry__"] = self
+        attrs["__filed__"] = object()  # in no bucket yet
+        registry = self
+        member = weakref.ref(fromClass)
+        def moved(name=None, fromState=None, toState=None):
+            # Weak: the machine stores this listener, so a strong reference
+            # would make every member a reference cycle
+            machine = member()
+            if machine is not None:
+                registry.__move__(machine, machine._["state"]._value)
+        FSM.__listen__(fromClass, moved)
+        state = attrs["state"]
+        onChange = state._onChange
+        if onChange is None:
+            state._onChange = moved
+        else:
+            def changed():
+                onChange()
+                moved()
+            state._onChange = changed
+        self.__move__(fromClass, state._value)
+        return fsm
+
+    def register(self, cls):
+        """Make every machine constructed from ``cls`` join this registry."""
+        cls.__registry__ = self
+        return cls
+
+    def states(self):
+        return sorted([state for state, bucket in self.__buckets__.items() if state is not None and len(bucket)])
@@ -0,0 +1,342 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import csv
+import io
+import json
+import os
+import pickle
+import time
+try:
+    basestring
+except NameError:
+    basestring=str  # Already Py2/3 compat shim
+from .FleetFSM import FleetFSM, numpy
+from .SharedFSM import SharedFSM
+
+class Replay(object):
+    """Stream recorded events from a JSONL or CSV file through machines.
+
+    ``target`` is one machine (every record's event is fired on it), a
+    ``{entity: machine}`` mapping (``factory(entity)`` builds the missing
+    ones, otherwise their records are skipped) or a ``FleetFSM`` (entity IDs
+    are fleet indexes and each chunk is applied with vectorized ``fire()``
+    calls). ``fields`` names the entity and event fields: keys of the JSON
+    objects or CSV header columns, or positions in JSON arrays and
+    headerless CSV rows. CSV fields are strings: ``entityType`` (e.g.
+    ``int``) converts each entity before the mapping is looked up, and
+    records it rejects count as errors.
+
+    The file is read in ``chunkSize`` blocks and each block is decoded in
+    one pass, so memory use depends on the block size and the machines,
+    not on the length of the file. CSV blocks end outside quoted fields, so
+    a quoted field may contain newlines; a JSONL record is one line.
+    Iterating a ``Replay`` yields ``stats()`` after every block; ``run()``
+    consumes it and returns the final stats.
+
+    With ``checkpoint``, the byte offset, the counters and the machines'
+    states are saved to that file at the first block boundary after every
+    ``every`` records and at the end, and ``progress(stats)`` is called at
+    the same points. ``resume=True`` restores the saved states and carries
+    on after the saved offset.
+    """
+
+    CLASSNAME = "Replay"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    CHUNK = 1 << 20
+    VERSION = 1
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Replay.CLASSNAME, ver=Replay)
+
+    @staticmethod
+    def __set_state__(machine, state):
+        # Write the state back without running hooks, as restore() does
+        if isinstance(machine, SharedFSM):
+            machine.__fsm_state__ = state
+            return
+        fromClass = machine.fromClass if hasattr(machine, 'fromClass') else machine
+        fromClass._["state"]._value = state
+        if fromClass._["state"]._onChange is not None:
+            fromClass._["state"]._onChange()
+
+    def __init__(self, source, target, fields=("entity", "event"), format=None, checkpoint=None,
+            every=100000, resume=False, progress=None, factory=None, chunkSize=None, entityType=None):
+        name = source if isinstance(source, basestring) else getattr(source, "name", None)
+        if format is None:
+            format = "csv" if isinstance(name, basestring) and name.lower().endswith(".csv") else "jsonl"
+        if format not in ("jsonl", "csv"):
+            raise ValueError("unknown format %r" % (format,))
+        if isinstance(target, FleetFSM):
+            self.__kind__ = "fleet"
+        elif hasattr(target, "fire"):
+            self.__kind__ = "machine"
+        else:
+            self.__kind__ = "mapping"
+        self.__source__ = source
+        self.__path__ = name
+        self.__target__ = target
+        # One machine: records need no entity field
+        self.__fields__ = (None, fields[1]) if self.__kind__ == "machine" else tuple(fields)
+        self.__format__ = format
+        self.__checkpoint__ = checkpoint
+        self.__every__ = every
+        self.__resume__ = resume
+        self.__progress__ = progress
+        self.__factory__ = factory
+        self.__entityType__ = entityType
+        self.__chunkSize__ = chunkSize or Replay.CHUNK
+        if self.__kind__ == "fleet":
+            self.__eventCodes__ = dict((event, target.eventCodes(event)) for event in target.events())
+        self.__offset__ = 0
+        self.__records__ = 0
+        self.__errors__ = 0
+        self.__skipped__ = 0
+        self.__start__ = 0
+        self.__started__ = None
+
+    def __iter__(self):
+        handle = io.open(self.__source__, "rb") if isinstance(self.__source__, basestring) else self.__source__
+        try:
+            self.__started__ = time.time()
+            self.__start__ = self.__records__
+            columns = self.__open__(handle)
+            dispatch = getattr(self, "__dispatch_%s__" % self.__kind__)
+            saved = self.__records__
+            for offset, block in self.__blocks__(handle):
+                dispatch(self.__decode__(block, columns))
+                self.__offset__ = offset
+                if self.__records__ - saved >= self.__every__:
+                    self.__save__()
+                    saved = self.__records__
+                yield self.stats()
+            self.__save__()
+        finally:
+            if handle is not self.__source__:
+                handle.close()
+
+    def __open__(self, handle):
+        # Returns the (entity, event) positions for CSV rows, None for JSON
+        if self.__resume__ and self.__checkpoint__ is not None and os.path.exists(self.__checkpoint__):
+            self.__load__()
+        columns = None
+        if self.__format__ == "csv":
+            columns = self.__fields__
+            if not all(field is None or isinstance(field, int) for field in columns):
+                handle.seek(0)
+                line = handle.readline()
+                while line.count(b'"') % 2:
+                    more = handle.readline()  # a quoted newline in the header
+                    if not more:
+                        break
+                    line += more
+                header = self.__rows__(line)[0]
+                columns = tuple(field if field is None or isinstance(field, int) else header.index(field) for field in columns)
+                self.__offset__ = max(self.__offset__, handle.tell())
+        if self.__offset__:
+            handle.seek(self.__offset__)
+        return columns
+
+    def __blocks__(self, handle):
+        # Whole lines only: a partial last line waits for the next read
+        offset = self.__offset__
+        size = self.__chunkSize__
+        tail = b""
+        while True:
+            data = handle.read(size)
+            if not data:
+                if tail.strip():
+                    yield offset + len(tail), tail
+                return
+            if tail:
+                data = tail + data
+            end = self.__end__(data)
+            if end == 0:
+                tail = data
+                continue
+            tail = data[end:]
+            offset += end
+            yield offset, data[:end]
+
+    def __end__(self, data):
+        # End of the last whole record in data, 0 if there is none. Blocks
+        # start on a record boundary, so a CSV newline ends a record only
+        # after an even number of quotes
+        end = data.rfind(b"\n") + 1
+        if self.__format__ == "csv":
+            quotes = data.count(b'"', 0, end)
+            while end and quotes % 2:
+                previous = data.rfind(b"\n", 0, end - 1) + 1
+                quotes -= data.count(b'"', previous, end)
+                end = previous
+        return end
+
+    def __rows__(self, data):
+        # One stream for the whole block keeps quoted newlines in their field
+        stream = io.StringIO(data.decode("utf-8"), newline="") if bytes is not str else io.BytesIO(data)
+        return [row for row in csv.reader(stream) if len(row) > 1 or (row and row[0].strip())]
+
+    def __decode__(self, block, columns):
+        if columns is not None:
+            records = self.__rows__(block)
+            entity, event = columns
+        else:
+            entity, event = self.__fields__
+            lines = [line for line in block.split(b"\n") if line.strip()]
+            try:
+                records = json.loads((b"[" + b",".join(lines) + b"]").decode("utf-8"))
+            except ValueError:
+                records = None
+            # A line like {"a":1},{"b":2} decodes as two records: only a
+            # record per line keeps the records aligned with the lines
+            if records is None or len(records) != len(lines):
+                # Find the bad lines one by one
+                records = []
+                for line in lines:
+                    try:
+                        records.append(json.loads(line.decode("utf-8")))
+                    except ValueError:
+                        self.__errors__ += 1
+        if entity is None:
+            try:
+                return [(None, record[event]) for record in records]
+            except (KeyError, IndexError, TypeError):
+                pass
+        try:
+            return [(record[entity], record[event]) for record in records]
+        except (KeyError, IndexError, TypeError):
+            pairs = []
+            for record in records:
+                try:
+                    pairs.append((None if entity is None else record[entity], record[event]))
+                except (KeyError, IndexError, TypeError):
+                    self.__errors__ += 1
+            return pairs
+
+    def __dispatch_machine__(self, pairs):
+        fire = self.__target__.fire
+        for entity, event in pairs:
+            fire(event)
+        self.__records__ += len(pairs)
+
+    def __dispatch_mapping__(self, pairs):
+        machines = self.__target__
+        factory = self.__factory__
+        if self.__entityType__ is not None:
+            convert = self.__entityType__
+            converted = []
+            for entity, event in pairs:
+                try:
+                    converted.append((convert(entity), event))
+                except (TypeError, ValueError):
+                    self.__errors__ += 1
+            pairs = converted
+        for entity, event in pairs:
+            machine = machines.get(entity)
+            if machine is None:
+                if factory is None:
+                    self.__skipped__ += 1
+                    continue
+                machine = machines[entity] = factory(entity)
+            machine.fire(event)
+        self.__records__ += len(pairs)
+
+    def __dispatch_fleet__(self, pairs):
+        if not pairs:
+            return
+        fleet = self.__target__
+        try:
+            ids = numpy.array([int(entity) for entity, event in pairs], dtype=numpy.intp)
+        except (TypeError, ValueError):
+            valid = []
+            for pair in pairs:
+                try:
+                    valid.append((int(pair[0]), pair[1]))
+                except (TypeError, ValueError):
+                    self.__errors__ += 1
+            pairs = valid
+            ids = numpy.array([entity for entity, event in pairs], dtype=numpy.intp)
+        code = self.__eventCodes__.get
+        events = numpy.array([code(event, -1) for entity, event in pairs], dtype=numpy.intp)
+        self.__records__ += len(ids)
+        inside = (ids >= 0) & (ids < len(fleet))
+        if not inside.all():
+            self.__skipped__ += int(len(ids) - numpy.count_nonzero(inside))
+            ids, events = ids[inside], events[inside]
+        # One fire() per wave, where wave k holds each entity's k-th event of
+        # the block: no entity appears twice in a wave, and waves keep order
+        order = numpy.argsort(ids, kind="mergesort")
+        sortedIds = ids[order]
+        first = numpy.ones(len(ids), dtype=bool)
+        first[1:] = sortedIds[1:] != sortedIds[:-1]
+        positions = numpy.arange(len(ids))
+        rank = numpy.empty(len(ids), dtype=numpy.intp)
+        rank[order] = positions - numpy.maximum.accumulate(numpy.where(first, positions, 0))
+        waves = numpy.argsort(rank, kind="mergesort")
+        bounds = numpy.cumsum(numpy.bincount(rank))
+        start = 0
+        for end in bounds:
+            wave = waves[start:end]
+            fleet.fire(events[wave], ids[wave])
+            start = end
+
+    def __load__(self):
+        with io.open(self.__checkpoint__, "rb") as handle:
+            saved = pickle.load(handle)
+        if saved["source"] != self.__path__:
+            raise ValueError("the checkpoint was taken from %r" % (saved["source"],))
+        self.__offset__ = saved["offset"]
+        self.__records__ = saved["records"]
+        self.__errors__ = saved["errors"]
+        self.__skipped__ = saved["skipped"]
+        target = self.__target__
+        states = saved["states"]
+        if self.__kind__ == "fleet":
+            target.codes()[:] = states
+        elif self.__kind__ == "machine":
+            Replay.__set_state__(target, states)
+        else:
+            for entity, state in states.items():
+                machine = target.get(entity)
+                if machine is None and self.__factory__ is not None:
+                    machine = target[entity] = self.__factory__(entity)
+                if machine is not None:
+                    Replay.__set_state__(machine, state)
+
+    def __save__(self):
+        if self.__checkpoint__ is not None:
+            target = self.__target__
+            if self.__kind__ == "fleet":
+                states = numpy.array(target.codes())
+            elif self.__kind__ == "machine":
+                states = target.state()
+            else:
+                states = dict((entity, machine.state()) for entity, machine in target.items())
+            saved = {"version": Replay.VERSION, "source": self.__path__, "offset": self.__offset__,
+                "records": self.__records__, "errors": self.__errors__, "skipped": self.__skipped__,
+                "states": states}
+            # Write aside and rename, so a crash leaves the previous checkpoint
+            temporary = self.__checkpoint__ + ".tmp"
+            with io.open(temporary, "wb") as handle:
+                pickle.dump(saved, handle, pickle.HIGHEST_PROTOCOL)
+            getattr(os, "replace", os.rename)(temporary, self.__checkpoint__)
+        if self.__progress__ is not None:
+            self.__progress__(self.stats())
+
+    def run(self):
+        """Replay to the end of the source and return ``stats()``."""
+        for stats in self:
+            pass
+        return self.stats()
+
+    def stats(self):
+        """``records``, ``errors`` (undecodable records), ``skipped`` (no
+        machine for the entity) and ``offset`` so far; ``seconds`` and
+        ``rate`` (records per second) for the current run."""
+        seconds = time.time() - self.__started__ if self.__started__ is not None else 0.0
+        return {"records": self.__records__, "errors": self.__errors__, "skipped": self.__skipped__,
+            "offset": self.__offset__, "seconds": seconds,
+            "rate": (self.__records__ - self.__start__) / seconds if seconds > 0 else 0.0}
@@ -0,0 +1,97 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import heapq
+import time
+import weakref
+
+class Scheduler(object):
+    """One deadline heap for the state timeouts of many machines.
+
+    ``fsm.timeout(state, seconds, event)`` declares a timeout; once the
+    machine is attached with ``attach(fsm)``, entering ``state`` arms a
+    deadline (from the state's entry hook, like ``on(state, foo)``) and
+    ``tick()`` fires ``event`` for every deadline that has passed while the
+    machine is still in that state.
+
+    Leaving a state does not touch the heap: every machine carries a timer
+    token, bumped when it is armed again or ``cancel()``-ed, and an entry
+    whose token or state no longer matches is dropped when it comes due.
+    Machines are held through weak references.
+    """
+
+    CLASSNAME = "Scheduler"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Scheduler.CLASSNAME, ver=Scheduler)
+
+    def __init__(self, clock=None):
+        self.__clock__ = clock or getattr(time, "monotonic", time.time)
+        self.__heap__ = []
+        self.__seq__ = 0
+
+    def __due__(self, now):
+        # Yields (machine, event) for the live entries due at ``now``;
+        # entries armed meanwhile wait for the next tick
+        heap = self.__heap__
+        last = self.__seq__
+        while heap and heap[0][0] <= now and heap[0][1] <= last:
+            deadline, seq, ref, token, state, event = heapq.heappop(heap)
+            fromClass = ref()
+            if fromClass is None:
+                continue
+            attrs = fromClass._
+            if attrs["__timer__"] == token and attrs["state"]._value == state:
+                yield fromClass, event
+
+    def __wake__(self):
+        pass
+
+    def arm(self, fsm, state, seconds, event):
+        """Fire ``event`` on ``fsm`` after ``seconds`` unless it leaves ``state``."""
+        fromClass = fsm.fromClass if hasattr(fsm, 'fromClass') else fsm
+        attrs = fromClass._
+        token = attrs["__timer__"] = attrs["__timer__"] + 1
+        self.__seq__ += 1
+        entry = (self.__clock__() + seconds, self.__seq__, weakref.ref(fromClass), token, state, event)
+        heapq.heappush(self.__heap__, entry)
+        if self.__heap__[0] is entry:
+            self.__wake__()
+        return self
+
+    def attach(self, fsm):
+        """Let ``fsm`` arm its timeouts here, starting with its current state."""
+        fromClass = fsm.fromClass if hasattr(fsm, 'fromClass') else fsm
+        attrs = fromClass._
+        attrs["__scheduler__"] = self
+        timeout = (attrs["__timeouts__"] or {}).get(attrs["state"]._value)
+        if timeout is not None:
+            self.arm(fromClass, attrs["state"]._value, timeout[0], timeout[1])
+        return fsm
+
+    def cancel(self, fsm):
+        """Drop the pending timeout of ``fsm``, if any."""
+        fromClass = fsm.fromClass if hasattr(fsm, 'fromClass') else fsm
+        fromClass._["__timer__"] += 1
+        return self
+
+    def nextDeadline(self):
+        """Seconds until the earliest deadline (may be stale), or None."""
+        if not self.__heap__:
+            return None
+        return max(self.__heap__[0][0] - self.__clock__(), 0)
+
+    def pending(self):
+        """Entries in the heap, including ones that will be dropped as stale."""
+        return len(self.__heap__)
+
+    def tick(self, now=None):
+        """Fire every timeout due by ``now`` (default: the clock); returns the count."""
+        count = 0
+        for fromClass, event in self.__due__(self.__clock__() if now is None else now):
+            fromClass.fire(event)
+            count += 1
+        return count
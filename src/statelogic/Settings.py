@@ -0,0 +1,81 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import os
+
+class Settings(object):
+    """Process-wide snapshot of the environment and shell probes.
+
+    The snapshot is taken on first use and kept until ``refresh()``, so hot
+    paths such as ``FSM.stateChanged()`` never read ``os.environ`` or probe
+    the filesystem. Machines re-select their ``stateChanged()`` path on the
+    first transition after a refresh.
+    """
+
+    CLASSNAME = "Settings"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    SHELLS = [
+        '/usr/bin/fish',
+        '/bin/ash',
+        '/bin/bash',
+        '/bin/cash',
+        '/bin/dash',
+        '/bin/ksh',
+        '/bin/pwsh',
+        '/bin/tcsh',
+        '/bin/zsh',
+        '/bin/sh',
+        'C:\\Windows\\System32\\cmd.exe',
+        'C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe',
+        'C:\\Program Files\\Git\\usr\\bin\\bash.exe'
+    ]
+
+    __snapshot__ = None
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Settings.CLASSNAME, ver=Settings)
+
+    @staticmethod
+    def __probe_shell__():
+        # Check if SHELL environment variable exists
+        shell = os.environ.get('SHELL')
+        # If SHELL is not set, check for known shell paths
+        if shell is None:
+            for shell_path in Settings.SHELLS:
+                if os.path.exists(shell_path):
+                    shell = shell_path
+                    break
+        return shell
+
+    @staticmethod
+    def isGitBash():
+        return Settings.snapshot()["isGitBash"]
+
+    @staticmethod
+    def refresh():
+        """Re-read the environment and re-probe the shell."""
+        shell = Settings.__probe_shell__()
+        Settings.__snapshot__ = {
+            "showState": os.environ.get('STATE', '').lower() == 'show' \
+                or os.environ.get('state', '').lower() == 'show',
+            "shell": shell,
+            "isGitBash": shell is not None and shell.split('\\')[-1] == 'bash.exe',
+        }
+        return Settings.__snapshot__
+
+    @staticmethod
+    def shell():
+        return Settings.snapshot()["shell"]
+
+    @staticmethod
+    def showState():
+        return Settings.snapshot()["showState"]
+
+    @staticmethod
+    def snapshot():
+        if Settings.__snapshot__ is None:
+            return Settings.refresh()
+        return Settings.__snapshot__
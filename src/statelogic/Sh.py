@@ -8,6 +8,8 @@ try:
     import pwd
 except ImportError:
     pwd = None  # No pwd on Windows; fallback to os.getlogin()
+from .LogSink import LogSink
+from .Settings import Settings
 from .Signal import Signal
 
 class Sh(Signal):
@@ -41,43 +43,38 @@ class Sh(Signal):
     def pid(self):
         return os.getpid()
 
-    def prn(self, val):
+    def logSink(self, sink=None):
+        """Get or set the LogSink that prn() writes to.
+
+        Without one, prn() prints and appends to logTo() through a shared
+        BufferedSink over a FileSink, so the file is written by a background
+        thread. A sink set here receives every line instead of print(): use
+        BufferedSink(StreamSink()) to take console output off the caller's
+        thread as well.
+        """
+        if sink is not None:
+            self.__log_sink__ = sink
+            return self
+        if hasattr(self, '__log_sink__'):
+            return self.__log_sink__
         if self.hasFunc('logTo') and self.logTo() != '':
-            try:
-                with open(self.logTo(), 'a') as f:
-                    f.write(val + '\n')
-            except:
-                pass
+            return LogSink.forPath(self.logTo())
+        return None
+
+    def prn(self, val):
+        if hasattr(self, '__log_sink__'):
+            self.__log_sink__.write(val)
+            return self
+        sink = self.logSink()
+        if sink is not None:
+            sink.write(val)
         print(val)
         return self
 
 
     def determine_shell(self):
-        # Check if SHELL environment variable exists
-        shell = os.environ.get('SHELL')
-        
-        # If SHELL is not set, check for known shell paths
-        if shell is None:
-            possible_shells = [
-                '/usr/bin/fish',
-                '/bin/ash',
-                '/bin/bash',
-                '/bin/cash',
-                '/bin/dash',
-                '/bin/ksh',
-                '/bin/pwsh',
-                '/bin/tcsh',
-                '/bin/zsh',
-                '/bin/sh',
-                'C:\\Windows\\System32\\cmd.exe',
-                'C:\\Windows\\System32\\WindowsPowerShell\\v1.0\\powershell.exe',
-                'C:\\Program Files\\Git\\usr\\bin\\bash.exe'
-            ]
-            for shell_path in possible_shells:
-                if os.path.exists(shell_path):
-                    shell = shell_path
-                    break
-        return shell
+        # Probed once per process; Settings.refresh() probes again
+        return Settings.shell()
 
     def shellCmd(self, cmd=None):
         if cmd is not None:
@@ -0,0 +1,225 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import multiprocessing
+import traceback
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # Py2
+from .HashRing import HashRing
+from .Machine import Machine
+from .SharedFSM import SharedFSM
+
+class ShardedFleet(object):
+    """Run one machine per entity across worker processes.
+
+    ``source`` is a machine class (an ``FSM``/``StateLogic`` or ``SharedFSM``
+    subclass, instantiated once per entity) or ``fromTable()`` rows, which
+    each worker turns into one shared ``Machine``; ``initial`` is the state
+    new machines start in. Entity IDs are assigned to ``workers`` shards by
+    a ``HashRing`` and events are sent to the owning shard in batches of
+    ``batchSize``, so each entity's events are applied in submission order
+    by a single process.
+
+    Workers report back ``(entity, event, fromState, toState)`` for every
+    event that changed a state, and ``(entity, value)`` for every
+    ``self.emit(value)`` made by a machine's hooks. ``SharedFSM`` classes and
+    rows have no instance dict, so workers run them through a subclass that
+    adds ``emit()``; ``Machine`` hooks call it on the object they receive. An exception raised
+    while a worker applies a batch stops that batch (the events before it
+    stay applied) and is raised again by ``join()``, ``collect()`` or
+    ``states()`` as a ``RuntimeError``; a worker that dies raises the same
+    way instead of leaving the caller waiting.
+    """
+
+    CLASSNAME = "ShardedFleet"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    POLL = 0.5  # seconds between liveness checks while waiting on workers
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=ShardedFleet.CLASSNAME, ver=ShardedFleet)
+
+    @staticmethod
+    def __emit__(self, value):
+        # emit() of the SharedFSM subclasses made by __factory__()
+        self.__shard_emit__(value)
+
+    @staticmethod
+    def __factory__(source, initial):
+        # Rows become one shared Machine: per-entity objects then only hold a state
+        members = {"__slots__": ("__shard_emit__",), "emit": ShardedFleet.__emit__}
+        if isinstance(source, type):
+            if issubclass(source, SharedFSM):
+                return type(source.__name__, (source,), members)
+            return source
+        members["machine"] = Machine(source, initial=initial)
+        return type("ShardMachine", (SharedFSM,), members)
+
+    @staticmethod
+    def __build__(factory, initial, entity, outputs):
+        machine = factory()
+        if initial is not None and not machine.state():
+            machine.state(initial)
+        emit = lambda value: outputs.append((entity, value))
+        if isinstance(machine, SharedFSM):
+            machine.__shard_emit__ = emit
+        else:
+            machine.__dict__["emit"] = emit
+        return machine
+
+    @staticmethod
+    def __worker__(shard, source, initial, inbox, outbox):
+        factory = ShardedFleet.__factory__(source, initial)
+        machines = {}
+        outputs = []
+        while True:
+            message = inbox.get()
+            if message is None:
+                return
+            kind, payload = message
+            if kind == "states":
+                outbox.put((shard, "states", dict((entity, machine.state()) for entity, machine in machines.items()), None))
+                continue
+            changes = []
+            try:
+                for entity, event in payload:
+                    machine = machines.get(entity)
+                    if machine is None:
+                        machine = machines[entity] = ShardedFleet.__build__(factory, initial, entity, outputs)
+                    fromState = machine.state()
+                    machine.fire(event)
+                    toState = machine.state()
+                    if toState != fromState:
+                        changes.append((entity, event, fromState, toState))
+            except Exception:
+                outbox.put((shard, "error", changes, (list(outputs), "entity %r, event %r:\n%s" % (entity, event,
+                    traceback.format_exc()))))
+            else:
+                outbox.put((shard, "events", changes, list(outputs)))
+            # Cleared in place: the machines' emit() appends to this list,
+            # and the queue pickles the copy from its feeder thread
+            del outputs[:]
+
+    def __init__(self, source, workers=None, initial=None, batchSize=1024, replicas=64):
+        workers = workers or multiprocessing.cpu_count()
+        self.__ring__ = HashRing(range(workers), replicas)
+        self.__batchSize__ = batchSize
+        self.__batches__ = [[] for shard in range(workers)]
+        self.__inboxes__ = [multiprocessing.Queue() for shard in range(workers)]
+        self.__outbox__ = multiprocessing.Queue()
+        self.__outstanding__ = 0
+        self.__changes__ = []
+        self.__outputs__ = []
+        self.__processes__ = []
+        for shard in range(workers):
+            process = multiprocessing.Process(target=ShardedFleet.__worker__, name="ShardedFleet-%d" % shard,
+                args=(shard, source, initial, self.__inboxes__[shard], self.__outbox__))
+            process.daemon = True
+            process.start()
+            self.__processes__.append(process)
+
+    def __send__(self, shard):
+        batch = self.__batches__[shard]
+        if batch:
+            self.__inboxes__[shard].put(("events", batch))
+            self.__batches__[shard] = []
+            self.__outstanding__ += 1
+
+    def __reply__(self, block):
+        # Wait in POLL steps so a dead worker raises instead of hanging
+        while True:
+            try:
+                return self.__outbox__.get(block, ShardedFleet.POLL if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+            for shard, process in enumerate(self.__processes__):
+                if not process.is_alive():
+                    raise RuntimeError("ShardedFleet worker %d exited with code %s" % (shard, process.exitcode))
+
+    def __receive__(self, block):
+        shard, kind, changes, outputs = self.__reply__(block)
+        self.__outstanding__ -= 1
+        self.__changes__.extend(changes)
+        if kind == "error":
+            outputs, error = outputs
+            self.__outputs__.extend(outputs)
+            raise RuntimeError("ShardedFleet worker %d failed at %s" % (shard, error))
+        self.__outputs__.extend(outputs)
+
+    def __wait__(self):
+        self.flush()
+        while self.__outstanding__:
+            self.__receive__(True)
+
+    def close(self):
+        for inbox in self.__inboxes__:
+            inbox.put(None)
+        for process in self.__processes__:
+            process.join()
+        self.__processes__ = []
+
+    def collect(self):
+        """Changes and hook outputs received so far, as ``(changes, outputs)``;
+        they are handed over once."""
+        try:
+            while self.__outstanding__:
+                self.__receive__(False)
+        except queue.Empty:
+            pass
+        changes, outputs = self.__changes__, self.__outputs__
+        self.__changes__, self.__outputs__ = [], []
+        return changes, outputs
+
+    def flush(self):
+        """Send every partial batch."""
+        for shard in range(len(self.__batches__)):
+            self.__send__(shard)
+        return self
+
+    def join(self):
+        """Flush, wait until every batch has been applied, then ``collect()``."""
+        self.__wait__()
+        return self.collect()
+
+    def shard(self, entity):
+        return self.__ring__.shard(entity)
+
+    def states(self):
+        """``{entity: state}`` for every entity, after the pending events."""
+        self.__wait__()
+        for inbox in self.__inboxes__:
+            inbox.put(("states", None))
+        states = {}
+        for inbox in self.__inboxes__:
+            shard, kind, shardStates, outputs = self.__reply__(True)
+            states.update(shardStates)
+        return states
+
+    def submit(self, entity, event):
+        shard = self.__ring__.shard(entity)
+        batch = self.__batches__[shard]
+        batch.append((entity, event))
+        if len(batch) >= self.__batchSize__:
+            self.__send__(shard)
+        return self
+
+    def submitMany(self, events):
+        """Route an iterable of ``(entity, event)`` pairs."""
+        ring = self.__ring__
+        batches = self.__batches__
+        batchSize = self.__batchSize__
+        for entity, event in events:
+            shard = ring.shard(entity)
+            batch = batches[shard]
+            batch.append((entity, event))
+            if len(batch) >= batchSize:
+                self.__send__(shard)
+        return self
+
+    def workers(self):
+        return len(self.__inboxes__)
@@ -0,0 +1,80 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+class SharedFSM(object):
+    """Base class for objects whose machine is a class-level ``Machine``.
+
+    Instances only carry their current state; transitions, hooks and indexes
+    live in the shared ``machine`` definition::
+
+        class Order(SharedFSM):
+            machine = Machine([("pay", "NEW", "PAID")], initial="NEW")
+
+    During a transition ``fromState()`` and ``toState()`` return the
+    transition's source and target states. ``FSM`` has always returned them
+    the other way round (its ``fromState()`` is the target); that is kept
+    there for compatibility, so hooks moved between the two must swap them.
+    """
+
+    CLASSNAME = "SharedFSM"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    __slots__ = ("__fsm_state__", "__fsm_transition__", "__fsm_next__")
+
+    machine = None
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=SharedFSM.CLASSNAME, ver=SharedFSM)
+
+    def __init__(self, state=None):
+        cls = type(self)
+        if cls.__dict__.get("__machine_bound__") is not cls.machine:
+            cls.machine.bind(cls)
+        self.__fsm_transition__ = None
+        self.__fsm_next__ = ""
+        self.__fsm_state__ = cls.machine.initial() if state is None else None
+        if state is not None:
+            self.state(state)
+
+    def can(self, name):
+        return self.machine.can(self.__fsm_state__, name)
+
+    def events(self):
+        return self.machine.events()
+
+    def fire(self, name):
+        return self.machine.fire(self, name)
+
+    def fromState(self):
+        if self.__fsm_transition__ is None:
+            return ""
+        return self.__fsm_transition__.fromState()
+
+    def nextState(self):
+        return self.__fsm_next__
+
+    def state(self, state=None):
+        if state is None:
+            return self.__fsm_state__
+        # Like FSM.state(): only a registered state, and only as the first state
+        if (self.__fsm_state__ is None or self.__fsm_state__ == "") and self.machine.code(state) is not None:
+            self.__fsm_state__ = state
+        return self
+
+    def states(self):
+        return self.machine.states()
+
+    def toState(self):
+        if self.__fsm_transition__ is None:
+            return ""
+        return self.__fsm_transition__.toState()
+
+    def transitionName(self):
+        if self.__fsm_transition__ is None:
+            return ""
+        return self.__fsm_transition__.name()
+
+    def transitions(self):
+        return self.machine.transitions()
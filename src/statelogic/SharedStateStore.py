@@ -0,0 +1,221 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import sys
+import threading
+import time
+# multiprocessing.shared_memory is Python 3.8+: only SharedStateStore needs it
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+from .StateStore import StateStore
+
+class SharedStateStore(StateStore):
+    """``StateStore`` in a named shared-memory segment, with a seqlock.
+
+    One writer creates the segment with ``SharedStateStore(source=...)``
+    and applies transitions (through ``attach()`` or a ``FleetFSM`` built
+    with ``store=``); any number of processes open it by name with
+    ``readonly=True`` and read states straight from the segment.
+
+    The segment holds the ``StateStore`` header and state names, a sequence
+    counter at ``SEQUENCE_OFFSET`` and the records. The writer makes the
+    counter odd while it changes records (``begin()``/``end()``) and even
+    again after; ``code()``, ``stateOf()`` and ``statesOf()`` retry until
+    they read under one even value, so a reader never sees part of a fleet
+    step. A reader that finds the counter odd with the same value for
+    ``timeout`` seconds raises ``IOError``: the writer died inside a write
+    section. Threads of the writing process may write concurrently; a lock
+    taken by ``begin()`` and released by the matching ``end()`` serializes
+    them. The counter and the records use the host's byte order, since the
+    segment never leaves the machine, and the capacity is fixed when the
+    segment is created.
+    """
+
+    CLASSNAME = "SharedStateStore"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    MAGIC = b"SLSM"
+    SEQUENCE_OFFSET = 24
+    NAMES_OFFSET = 32
+    TIMEOUT = 1.0
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=SharedStateStore.CLASSNAME, ver=SharedStateStore)
+
+    @staticmethod
+    def __segment__(name):
+        # Before 3.13 attaching registers the segment with the resource
+        # tracker, which would unlink it when the reader exits
+        if sys.version_info >= (3, 13):
+            return shared_memory.SharedMemory(name, track=False)
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+    def __init__(self, name=None, source=None, capacity=1024, readonly=False, timeout=None):
+        if shared_memory is None:
+            raise ImportError("SharedStateStore requires multiprocessing.shared_memory (Python 3.8+)")
+        if name is None and source is None:
+            raise ValueError("a new shared state store needs a source")
+        self.__readonly__ = readonly
+        self.__owner__ = source is not None and not readonly
+        self.__map__ = None
+        self.__view__ = None
+        self.__depth__ = 0
+        self.__writeLock__ = threading.RLock()
+        self.__timeout__ = SharedStateStore.TIMEOUT if timeout is None else timeout
+        if self.__owner__:
+            self.__create__(name, StateStore.stateList(source), max(capacity, 1))
+        else:
+            self.__open__(name, source)
+
+    def __create__(self, name, states, capacity):
+        names = "\n".join(states).encode("utf-8")
+        width = 2 if len(states) < 32767 else 4
+        offset = (SharedStateStore.NAMES_OFFSET + len(names) + 7) // 8 * 8
+        self.__map__ = shared_memory.SharedMemory(name, create=True, size=offset + capacity * width)
+        self.__path__ = self.__map__.name
+        buf = self.__map__.buf
+        StateStore.HEADER.pack_into(buf, 0, SharedStateStore.MAGIC, StateStore.VERSION, width, len(names), capacity)
+        buf[SharedStateStore.NAMES_OFFSET:SharedStateStore.NAMES_OFFSET + len(names)] = names
+        # 0xff bytes decode to -1 ("no state") at either width
+        buf[offset:offset + capacity * width] = b"\xff" * (capacity * width)
+        self.__views__(states, width, capacity, offset)
+        self.__counter__[0] = 0
+
+    def __open__(self, name, source):
+        self.__map__ = SharedStateStore.__segment__(name)
+        self.__path__ = name
+        try:
+            buf = self.__map__.buf
+            magic, version, width, length, capacity = StateStore.HEADER.unpack_from(buf, 0)
+            if magic != SharedStateStore.MAGIC or version != StateStore.VERSION:
+                raise ValueError("%s is not a shared state store" % name)
+            start = SharedStateStore.NAMES_OFFSET
+            states = bytes(buf[start:start + length]).decode("utf-8").split("\n") if length else []
+            if source is not None and StateStore.stateList(source) != states:
+                raise ValueError("%s was created for the states %r" % (name, states))
+            self.__views__(states, width, capacity, (start + length + 7) // 8 * 8)
+        except Exception:
+            self.close()
+            raise
+
+    def __views__(self, states, width, capacity, offset):
+        # Indexing a cast memoryview is much cheaper than struct.unpack_from
+        self.__layout__(states, width, capacity)
+        self.__offset__ = offset
+        buf = self.__map__.buf
+        at = SharedStateStore.SEQUENCE_OFFSET
+        self.__counter__ = buf[at:at + 8].cast("Q")
+        self.__view__ = buf[offset:offset + capacity * width].cast("h" if width == 2 else "i")
+
+    def __read__(self, read, *args):
+        # Seqlock read: retry until no write section overlapped ``read``. A
+        # busy writer moves the counter on; a dead one leaves it odd
+        counter = self.__counter__
+        stuck = deadline = None
+        while True:
+            before = counter[0]
+            if not before & 1:
+                value = read(*args)
+                if counter[0] == before:
+                    return value
+            elif before != stuck:
+                stuck, deadline = before, time.time() + self.__timeout__
+            elif time.time() > deadline:
+                raise IOError("%s: writer did not finish" % self.__path__)
+            time.sleep(0)
+
+    def begin(self):
+        """Open a write section: readers retry until the matching ``end()``."""
+        if self.__readonly__:
+            raise IOError("%s is open read-only" % self.__path__)
+        # Held until the matching end(): one writer thread at a time
+        self.__writeLock__.acquire()
+        self.__depth__ += 1
+        if self.__depth__ == 1:
+            self.__counter__[0] += 1
+        return self
+
+    def close(self):
+        """Detach from the segment; the writer also removes it.
+
+        NumPy views from ``codes()`` must be released first.
+        """
+        if self.__map__ is not None:
+            if self.__view__ is not None:
+                self.__view__.release()
+                self.__counter__.release()
+                self.__view__ = self.__counter__ = None
+            self.__map__.close()
+            if self.__owner__:
+                self.__map__.unlink()
+            self.__map__ = None
+
+    def code(self, entity, code=None):
+        """Get the state code of ``entity``; with ``code``, write it."""
+        if code is not None:
+            if entity >= self.__capacity__:
+                self.reserve(entity + 1)
+            self.begin()
+            try:
+                self.__view__[entity] = code
+            finally:
+                self.end()
+            return self
+        if entity >= self.__capacity__:
+            return StateStore.NONE
+        return self.__read__(self.__view__.__getitem__, entity)
+
+    def codes(self):
+        """NumPy view of every record in the segment; writes through it
+        belong between ``begin()`` and ``end()``."""
+        import numpy  # optional: only needed for the array view
+        return numpy.frombuffer(self.__view__, dtype=numpy.int16 if self.__width__ == 2 else numpy.int32)
+
+    def end(self):
+        self.__depth__ -= 1
+        if self.__depth__ == 0:
+            self.__counter__[0] += 1
+        self.__writeLock__.release()
+        return self
+
+    def flush(self):
+        return self
+
+    def reserve(self, capacity):
+        if capacity > self.__capacity__ and not self.__readonly__:
+            raise ValueError("%s holds %d entities; shared segments cannot grow" % (self.__path__, self.__capacity__))
+        return self
+
+    def stateOf(self, entity):
+        """State name of ``entity``, read without copying or IPC."""
+        if entity >= self.__capacity__:
+            return None
+        # code() and name() inlined: this is the readers' hot path. Only a
+        # read that overlaps a write section goes through the retry loop
+        counter, view = self.__counter__, self.__view__
+        before = counter[0]
+        code = view[entity]
+        if before & 1 or counter[0] != before:
+            code = self.__read__(view.__getitem__, entity)
+        return self.__states__[code] if code != StateStore.NONE else None
+
+    def statesOf(self, ids):
+        """State names of several entities, all read under one sequence value."""
+        capacity, view = self.__capacity__, self.__view__
+        def read():
+            return [view[entity] if entity < capacity else StateStore.NONE for entity in ids]
+        return [self.name(code) for code in self.__read__(read)]
+
+    def version(self):
+        """Number of completed write sections; unchanged means no new writes."""
+        return self.__counter__[0] // 2
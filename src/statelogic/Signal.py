@@ -2,9 +2,10 @@ from __future__ import print_function, division, absolute_import  # NEW: Enhance
 
 import signal
 import sys  # NEW: For sys.exit() compat across versions
-from .Attr import Attr 
-from .Reflection import Reflection 
+import weakref
+from .Reflection import Reflection
 from .FSM import FSM
+from .LogSink import LogSink
 
 class Signal(Reflection):
 
@@ -13,24 +14,58 @@ class Signal(Reflection):
     MINOR_VERSION = 2
     PATCH_VERSION = 3
 
+    # One process-wide SIGINT handler fans out to the live instances,
+    # keyed by registration order and held through weak references
+    __receivers__ = weakref.WeakValueDictionary()
+    __registered__ = 0
+    __installed__ = False
+
     @staticmethod
     def class_version():
         # NEW: Replace f-string with .format() for Py2 compat
         return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Signal.CLASSNAME, ver=Signal)
 
+    @staticmethod
+    def __dispatch__(sig, frame):
+        receivers = [Signal.__receivers__.get(key) for key in sorted(Signal.__receivers__.keys())]
+        receivers = [receiver for receiver in receivers if receiver is not None]
+        if not receivers:
+            return signal.default_int_handler(sig, frame)
+        for receiver in receivers[:-1]:
+            receiver.signal(sig)
+        # As with the former per-instance handler, the newest instance reports and exits
+        receivers[-1].signal_handler(sig, frame)
+
     def __init__(self):
         self.__init_signal__()
 
     def __init_signal__(self):
         if not hasattr(self, '__signal_inited__'):
             self.__signal_inited__=True
-            Attr(self, 'signal', 0)
-            self.errorState = FSM()
-            self.errorState.transition("hasError","normal","error") \
+            Signal.__registered__ += 1
+            Signal.__receivers__[Signal.__registered__] = self
+            if not Signal.__installed__:
+                try:
+                    signal.signal(signal.SIGINT, Signal.__dispatch__)
+                    Signal.__installed__ = True
+                except ValueError:
+                    pass  # Not the main thread: a later instance installs it
+
+    def __error_state__(self):
+        if '__error_state__' not in self.__dict__:
+            errorState = FSM()
+            errorState.transition("hasError","normal","error") \
                 .transition("ignoreError","normal","errorIgnored") \
                 .transition("resetNormal","errorIgnored","normal") \
                 .state("normal")
-            signal.signal(signal.SIGINT, self.signal_handler)
+            self.__dict__['__error_state__'] = errorState
+        return self.__dict__['__error_state__']
+
+    def __set_error_state__(self, errorState):
+        self.__dict__['__error_state__'] = errorState
+
+    # Built on first use: most instances never touch the error API
+    errorState = property(__error_state__, __set_error_state__)
 
     def hasError(self):
         self.errorState.hasError()
@@ -45,15 +80,22 @@ class Signal(Reflection):
         return self
 
     def testIgnoredResetNormal(self):
-        state = self.errorState.state() 
+        state = self.errorState.state()
         self.errorState.resetNormal()
         return state=="errorIgnored"
 
+    def signal(self, sig=None):
+        if sig is not None:
+            self.__signal__=sig
+            return self
+        return self.__dict__.get('__signal__', 0)
+
     def signal_handler(self, sig, frame):
         self.signal(sig)
         if sig == 2:
             self.prn('\nYou pressed Ctrl + c!\n')
         if sig == 3:
             self.prn('\nYou pressed Ctrl + Back Slash!')
+        LogSink.flushAll()
         # NEW: Use sys.exit for reliable exit in scripts (avoids REPL dependency in Py2)
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
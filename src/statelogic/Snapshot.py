@@ -0,0 +1,107 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import struct
+import zlib
+try:
+    import cPickle as pickle  # Py2: C implementation
+except ImportError:
+    import pickle
+from .Attr import Attr
+
+class Snapshot(object):
+    """Binary records of an FSM's definition ID, state code and user Attrs.
+
+    A record is a little-endian header ``(definition ID: uint32, state code:
+    int16, payload length: uint32)`` followed by the pickled
+    ``((attrName, value), ...)`` pairs of the user Attrs, or nothing when there
+    are none. The definition ID is a CRC32 of the transition rows and state
+    list, so it is the same in every process that builds the same machine,
+    and the state code is the state's index in that list (``-1``: no state).
+    """
+
+    CLASSNAME = "Snapshot"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    HEADER = struct.Struct("<IhI")
+    NONE = -1
+    # Rebuilt from the definition, never stored as values
+    STRUCTURAL = frozenset(["state", "nextState", "methods", "events", "transitions", "states"])
+
+    # (rows, states) -> (ID, rows, states, codes), shared by identical
+    # machines; emptied when it reaches SHARED definitions
+    __shared__ = {}
+    SHARED = 256
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Snapshot.CLASSNAME, ver=Snapshot)
+
+    @staticmethod
+    def definition(fromClass):
+        """``(id, rows, states, codes)`` of a machine, cached until it changes."""
+        attrs = fromClass._
+        definition = attrs.get("__definition__")
+        if definition is None:
+            rows = tuple([(t._name, t._fromState, t._toState) for t in attrs["transitions"]._list])
+            states = tuple(fromClass.stateChoice() or ())
+            definition = Snapshot.__shared__.get((rows, states))
+            if definition is None:
+                key = "\n".join(["\t".join(row) for row in rows] + ["", "\t".join(states)])
+                definitionId = zlib.crc32(key.encode("utf-8")) & 0xffffffff
+                definition = (definitionId, rows, states, dict((state, code) for code, state in enumerate(states)))
+                if len(Snapshot.__shared__) >= Snapshot.SHARED:
+                    Snapshot.__shared__.clear()
+                Snapshot.__shared__[(rows, states)] = definition
+            attrs["__definition__"] = definition
+        return definition
+
+    @staticmethod
+    def __user_attrs__(fromClass):
+        # Cached until Attr.__init__ registers another Attr on fromClass
+        attrs = fromClass._
+        cached = attrs.get("__userAttrs__")
+        if cached is None:
+            cached = attrs["__userAttrs__"] = [attr for name, attr in attrs.items() \
+                if isinstance(attr, Attr) and name not in Snapshot.STRUCTURAL and not name.startswith("__")]
+        return cached
+
+    @staticmethod
+    def pack(fromClass):
+        definitionId, rows, states, codes = Snapshot.definition(fromClass)
+        userAttrs = Snapshot.__user_attrs__(fromClass)
+        payload = b""
+        if userAttrs:
+            payload = pickle.dumps(tuple([(attr._name, list(attr._list) if attr._list is not None else attr._value) \
+                for attr in userAttrs]), 2)
+        code = codes.get(fromClass._["state"]._value, Snapshot.NONE)
+        return Snapshot.HEADER.pack(definitionId, code, len(payload)) + payload
+
+    @staticmethod
+    def unpack(fromClass, record, states=None):
+        """Restore ``record``; with ``states`` (the list it was packed
+        against) the definition ID is not checked."""
+        recordId, code, length = Snapshot.HEADER.unpack_from(record)
+        if states is None:
+            definitionId, rows, states, codes = Snapshot.definition(fromClass)
+            if recordId != definitionId:
+                raise ValueError("snapshot of machine %08x cannot restore machine %08x" % (recordId, definitionId))
+        attrs = fromClass._
+        attrs["state"]._value = None if code == Snapshot.NONE else states[code]
+        if attrs["state"]._onChange is not None:
+            attrs["state"]._onChange()
+        if length:
+            start = Snapshot.HEADER.size
+            for name, value in pickle.loads(bytes(record[start:start + length])):
+                attr = attrs.get(name)
+                if not isinstance(attr, Attr):
+                    Attr(fromClass, name, value)
+                elif attr._list is not None:
+                    attr._list = list(value)
+                    attr._sorted = None
+                    if attr._set is not None:
+                        attr._set = set(value)
+                else:
+                    attr._value = value
+        return fromClass
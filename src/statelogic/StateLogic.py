@@ -24,6 +24,21 @@ class StateLogic(AppData, Sh):
     LIGHT_GREEN='\033[92m'
     LIGHT_TURQUOISE='\033[96m'
 
+    # Message levels: a message prints when its level >= logLevel()
+    INFO=20
+    SAFE=25
+    CRITICAL=50
+    OFF=100
+
+    # (time, header, message, tag, tag brackets) colors per level
+    PALETTES={
+        INFO: (BOLD+ITALICS+DARK_BLUE, BOLD+DARK_BLUE, ITALICS+LIGHT_BLUE, LIGHT_AMBER, LIGHT_BLUE),
+        SAFE: (BOLD+ITALICS+DARK_TURQUOISE, BOLD+DARK_TURQUOISE, ITALICS+LIGHT_TURQUOISE, LIGHT_GREEN, LIGHT_TURQUOISE),
+        CRITICAL: (BOLD+ITALICS+DARK_AMBER, BOLD+DARK_AMBER, ITALICS+LIGHT_AMBER, FLASHING+LIGHT_RED, LIGHT_AMBER),
+    }
+
+    __templates__ = {}
+
     @staticmethod
     def class_version():
         # NEW: Replace f-string with .format() for Py2 compat
@@ -44,156 +59,62 @@ class StateLogic(AppData, Sh):
             fromClass.__dict__['infoMsg'] = self.infoMsg.__get__(fromClass)
             fromClass.__dict__['criticalMsg'] = self.criticalMsg.__get__(fromClass)
             fromClass.__dict__['safeMsg'] = self.safeMsg.__get__(fromClass)
-            fromClass.__dict__['__timeMsg__'] = self.__timeMsg__.__get__(fromClass)
-            fromClass.__dict__['__header__'] = self.__header__.__get__(fromClass)
-            fromClass.__dict__['__coloredMsg__'] = self.__coloredMsg__.__get__(fromClass)
-            fromClass.__dict__['__tagMsg__'] = self.__tagMsg__.__get__(fromClass)
-            fromClass.__dict__['__formattedMsg__'] = self.__formattedMsg__.__get__(fromClass)
             fromClass.__dict__['prn'] = self.prn.__get__(fromClass)
+            fromClass.__dict__['logSink'] = self.logSink.__get__(fromClass)
             fromClass.__dict__['now'] = self.now.__get__(fromClass)
             fromClass.__dict__['version'] = self.version.__get__(fromClass)
+            # The signal dispatcher only holds this instance weakly
+            fromClass.__dict__['__signal_receiver__'] = self
         self.fromClass=fromClass
 
     def __init__msgbase__(self, fromClass):
         if not hasattr(fromClass, "__msgbase_inited__"):
             fromClass.__msgbase_inited__ = True
-            Attr(fromClass,"__colorMsgColor__", "")
-            Attr(fromClass,"__colorMsgTerm__","")
-            Attr(fromClass,"__headerColor__","")
-            Attr(fromClass,"__headerTerm__","")
-            Attr(fromClass,"__message__","")
-            Attr(fromClass,"__tag__","")
-            Attr(fromClass,"__tagColor__","")
-            Attr(fromClass,"__tagOutterColor__","")
-            Attr(fromClass,"__tagTerm__","")
-            Attr(fromClass,"__timeColor__","")
-            Attr(fromClass,"__timeTerm__","")
+            Attr(fromClass,"logLevel", StateLogic.INFO)
             Attr(fromClass,"useColor", not self.isGitBash())
             fromClass.useColor()
 
-    def __coloredMsg__(self,color=None):
-        fromClass = self.fromClass
-        if color is None :
-            if fromClass.__message__() == '':
-                return ''
-            else:
-                return "%s%s%s" % (fromClass.__colorMsgColor__(),\
-                    fromClass.__message__(),fromClass.__colorMsgTerm__())
-        else:
-            if color == '' or not fromClass.useColor():
-                fromClass.__colorMsgColor__('')
-                fromClass.__colorMsgTerm__('')
-            else:
-                fromClass.__colorMsgColor__(color)
-                fromClass.__colorMsgTerm__(StateLogic.END)
-            return self
+    @staticmethod
+    def __render__(fromClass, level, msg, tag, args):
+        if args:
+            msg = msg % args
+        useColor = bool(fromClass.useColor())
+        template = StateLogic.__templates__.get((level, useColor))
+        if template is None:
+            template = StateLogic.__templates__[(level, useColor)] = StateLogic.__template__(level, useColor)
+        timeFmt, headerFmt, noHeader, tagFmt, msgFmt = template
+        appName = fromClass.appName()
+        header = noHeader if appName == 'None' else headerFmt % (appName, fromClass.version())
+        return "%s %s %s\n  %s" % (timeFmt % fromClass.now(), header,
+            tagFmt % tag if tag != '' else '[]: ', msgFmt % (msg,) if msg != '' else '')
 
-    def __formattedMsg__(self):
-        fromClass = self.fromClass
-        return "%s %s %s\n  %s" % (fromClass.__timeMsg__(),fromClass.__header__(),\
-            fromClass.__tagMsg__(),fromClass.__coloredMsg__())
+    @staticmethod
+    def __template__(level, useColor):
+        """Format strings for the time, header, tag and message of one level."""
+        if not useColor:
+            return ("%s", "%s(v%s) ", "", "[%s]: ", "%s")
+        timeColor, headerColor, msgColor, tagColor, tagOutterColor = StateLogic.PALETTES[level]
+        end = StateLogic.END
+        return (timeColor + "%s" + end,
+            headerColor + "%s(v%s) " + end,
+            end,
+            tagOutterColor + "[" + end + tagColor + "%s" + end + tagOutterColor + "]:" + end + " ",
+            msgColor + "%s" + end)
 
-    def __header__(self,color=None):
+    def criticalMsg(self,msg,tag='',*args):
         fromClass = self.fromClass
-        if color is None:
-            if fromClass.appName() == 'None':
-                return fromClass.__headerTerm__()
-            else:
-                return "%s%s(v%s) %s" % (fromClass.__headerColor__(),\
-                    fromClass.appName(),fromClass.version(),\
-                    fromClass.__headerTerm__())
-        else:
-            if color == '' or not fromClass.useColor():
-                fromClass.__headerColor__('')\
-                    .__headerTerm__('')
-            else:
-                fromClass.__headerColor__(color)\
-                    .__headerTerm__(StateLogic.END)
+        if StateLogic.CRITICAL >= fromClass._["logLevel"]._value:
+            fromClass.prn(StateLogic.__render__(fromClass, StateLogic.CRITICAL, msg, tag, args))
         return self
 
-    def __tagMsg__(self,color=None,outterColor=None):
+    def infoMsg(self,msg,tag='',*args):
         fromClass = self.fromClass
-        if color is None:
-            if fromClass.__tag__() == '' or not fromClass.useColor():
-                return '[%s]: ' % fromClass.__tag__()
-            else:
-                return "%s[%s%s%s%s%s]:%s " % (fromClass.__tagOutterColor__(),\
-                    fromClass.__tagTerm__(),fromClass.__tagColor__(),\
-                    fromClass.__tag__(),fromClass.__tagTerm__(),\
-                    fromClass.__tagOutterColor__(),fromClass.__tagTerm__())
-        else:
-            if color == '':
-                fromClass.__tagColor__('')\
-                    .__tagOutterColor__('')\
-                    .__tagTerm__('')
-            else:
-                fromClass.__tagColor__(color)\
-                    .__tagOutterColor__(outterColor)\
-                    .__tagTerm__(StateLogic.END)
-            return self
-
-    def __timeMsg__(self, color=None):
-        fromClass = self.fromClass
-        if color is None:
-            return "%s%s%s" % (fromClass.__timeColor__(),fromClass.now(),\
-                fromClass.__timeTerm__())
-        else:
-            if color == '' or not fromClass.useColor():
-                fromClass.__timeColor__('')\
-                    .__timeTerm__('')
-            else:
-                fromClass.__timeColor__(color)\
-                    .__timeTerm__(StateLogic.END)
-            return self
-
-    def criticalMsg(self,msg,tag=''):
-        fromClass = self.fromClass
-        if fromClass.useColor():
-            fromClass.__tag__(tag).__message__(msg) \
-                .__timeMsg__(StateLogic.BOLD + StateLogic.ITALICS + \
-                StateLogic.DARK_AMBER) \
-                .__header__(StateLogic.BOLD + StateLogic.DARK_AMBER) \
-                .__coloredMsg__(StateLogic.ITALICS + StateLogic.LIGHT_AMBER) \
-                .__tagMsg__(StateLogic.FLASHING + StateLogic.LIGHT_RED,\
-                StateLogic.LIGHT_AMBER)
-        else:
-            fromClass.__tag__(tag).__message__(msg) \
-                .__timeMsg__('') \
-                .__header__(StateLogic.BOLD + StateLogic.DARK_AMBER) \
-                .__coloredMsg__('') \
-                .__tagMsg__('')
-        fromClass.prn("%s" % (fromClass.__formattedMsg__()))
+        if StateLogic.INFO >= fromClass._["logLevel"]._value:
+            fromClass.prn(StateLogic.__render__(fromClass, StateLogic.INFO, msg, tag, args))
         return self
 
-    def infoMsg(self,msg,tag=''):
+    def safeMsg(self,msg,tag='',*args):
         fromClass = self.fromClass
-        if fromClass.useColor():
-            fromClass.__tag__(tag).__message__(msg) \
-                .__timeMsg__(StateLogic.BOLD+StateLogic.ITALICS+StateLogic.DARK_BLUE) \
-                .__header__(StateLogic.BOLD+StateLogic.DARK_BLUE) \
-                .__coloredMsg__(StateLogic.ITALICS + StateLogic.LIGHT_BLUE) \
-                .__tagMsg__(StateLogic.LIGHT_AMBER,StateLogic.LIGHT_BLUE)
-        else:
-            fromClass.__tag__(tag).__message__(msg) \
-                .__timeMsg__('') \
-                .__header__('') \
-                .__coloredMsg__('') \
-                .__tagMsg__('')
-        fromClass.prn("%s" % (fromClass.__formattedMsg__()))
+        if StateLogic.SAFE >= fromClass._["logLevel"]._value:
+            fromClass.prn(StateLogic.__render__(fromClass, StateLogic.SAFE, msg, tag, args))
         return self
-
-    def safeMsg(self,msg,tag=''):
-        fromClass = self.fromClass
-        if fromClass.useColor():
-            fromClass.__tag__(tag).__message__(msg).__timeMsg__(StateLogic.BOLD + StateLogic.ITALICS + \
-                StateLogic.DARK_TURQUOISE) \
-                .__header__(StateLogic.BOLD + StateLogic.DARK_TURQUOISE) \
-                .__coloredMsg__(StateLogic.ITALICS + StateLogic.LIGHT_TURQUOISE) \
-                .__tagMsg__(StateLogic.LIGHT_GREEN,StateLogic.LIGHT_TURQUOISE)
-        else:
-            fromClass.__tag__(tag).__message__(msg).__timeMsg__('') \
-                .__header__('') \
-                .__coloredMsg__('') \
-                .__tagMsg__('')
-        fromClass.prn("%s" % (fromClass.__formattedMsg__()))
-        return self
\ No newline at end of file
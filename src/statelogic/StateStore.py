@@ -0,0 +1,212 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import io
+import mmap
+import os
+import struct
+from .Attr import Attr
+from .StoredAttr import StoredAttr
+
+class StateStore(object):
+    """Memory-mapped file of fixed-width state codes indexed by entity ID.
+
+    The file starts with a header ``(magic, version, record width, length of
+    the state names, capacity)``, then the state names, then one
+    little-endian record per entity at ``dataOffset + entity * width``.
+    A record holds the state's index in the state list, or ``-1`` for "no
+    state yet". The state list follows ``stateChoice()``, so codes match
+    ``FleetFSM``, and it is stored in the file: reopening a store, or
+    reading one from another process, needs no definition.
+    """
+
+    CLASSNAME = "StateStore"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    MAGIC = b"SLSS"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHIQ")
+    NONE = -1
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=StateStore.CLASSNAME, ver=StateStore)
+
+    @staticmethod
+    def stateList(source):
+        """States in code order from an FSM, Machine, SharedFSM class or list."""
+        machine = getattr(source, "machine", None)
+        if machine is not None and hasattr(machine, "stateList"):
+            source = machine
+        if hasattr(source, "stateList"):
+            return list(source.stateList())
+        if hasattr(source, "stateChoice"):
+            return list(source.stateChoice() or [])
+        return list(source)
+
+    def __init__(self, path, source=None, capacity=1024, readonly=False):
+        self.__path__ = path
+        self.__readonly__ = readonly
+        self.__map__ = None
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if not exists and (readonly or source is None):
+            raise IOError("no state store at %s" % path)
+        self.__file__ = io.open(path, "rb" if readonly else ("r+b" if exists else "w+b"))
+        try:
+            if exists:
+                self.__open__(source)
+            else:
+                self.__create__(StateStore.stateList(source), capacity)
+        except Exception:
+            self.close()
+            raise
+
+    def __layout__(self, states, width, capacity):
+        self.__states__ = states
+        self.__codes__ = dict((state, code) for code, state in enumerate(states))
+        self.__names__ = len("\n".join(states).encode("utf-8"))
+        self.__record__ = struct.Struct("<h" if width == 2 else "<i")
+        self.__width__ = width
+        self.__capacity__ = capacity
+
+    def __create__(self, states, capacity):
+        names = "\n".join(states).encode("utf-8")
+        width = 2 if len(states) < 32767 else 4
+        self.__layout__(states, width, 0)
+        self.__offset__ = (StateStore.HEADER.size + len(names) + 7) // 8 * 8
+        header = StateStore.HEADER.pack(StateStore.MAGIC, StateStore.VERSION, width, len(names), 0)
+        self.__file__.write(header + names + b"\0" * (self.__offset__ - len(header) - len(names)))
+        self.__file__.flush()
+        self.reserve(max(capacity, 1))
+
+    def __open__(self, source):
+        header = self.__file__.read(StateStore.HEADER.size)
+        magic, version, width, length, capacity = StateStore.HEADER.unpack(header)
+        if magic != StateStore.MAGIC or version != StateStore.VERSION:
+            raise ValueError("%s is not a state store" % self.__path__)
+        states = self.__file__.read(length).decode("utf-8").split("\n") if length else []
+        if source is not None and StateStore.stateList(source) != states:
+            raise ValueError("%s was created for the states %r" % (self.__path__, states))
+        self.__layout__(states, width, capacity)
+        self.__offset__ = (StateStore.HEADER.size + length + 7) // 8 * 8
+        self.__remap__()
+
+    def __remap__(self):
+        if self.__map__ is not None:
+            self.__map__.close()
+        access = mmap.ACCESS_READ if self.__readonly__ else mmap.ACCESS_WRITE
+        self.__map__ = mmap.mmap(self.__file__.fileno(), 0, access=access)
+
+    def __refresh__(self):
+        # Another process may have grown the file since it was mapped
+        capacity = StateStore.HEADER.unpack_from(self.__map__)[4]
+        if capacity != self.__capacity__:
+            self.__capacity__ = capacity
+            self.__remap__()
+
+    def attach(self, fsm, entity):
+        """Keep the ``state`` of ``fsm`` (an FSM, StateLogic or extended
+        object) in the record of ``entity``.
+
+        A record that already holds a state wins, so a restarted process
+        resumes where it stopped; otherwise the current state is written.
+        Every state of ``fsm`` must be in the store, so that no transition
+        can fail on writing its record after the hooks have run.
+        """
+        fromClass = fsm.fromClass if hasattr(fsm, 'fromClass') else fsm
+        missing = [state for state in StateStore.stateList(fromClass) if state not in self.__codes__]
+        if missing:
+            raise ValueError("states %r are not in %s" % (missing, self.__path__))
+        attr = fromClass._["state"]
+        current = attr._value
+        stored = StoredAttr(attr, self, entity)
+        if self.code(entity) == StateStore.NONE and current is not None and current != "":
+            self.state(entity, current)
+        fromClass._["state"] = stored
+        if isinstance(fromClass.__dict__.get("state"), Attr):
+            fromClass.__dict__["state"] = stored
+            fromClass.__dict__["stateChoice"] = stored.valueChoice
+        return fsm
+
+    def capacity(self):
+        return self.__capacity__
+
+    def close(self):
+        if self.__map__ is not None:
+            if not self.__readonly__:
+                self.__map__.flush()
+            self.__map__.close()
+            self.__map__ = None
+        if self.__file__ is not None:
+            self.__file__.close()
+            self.__file__ = None
+
+    def code(self, entity, code=None):
+        """Get the state code of ``entity``; with ``code``, write it."""
+        if code is not None:
+            if entity >= self.__capacity__:
+                self.reserve(entity + 1)
+            self.__record__.pack_into(self.__map__, self.__offset__ + entity * self.__width__, code)
+            return self
+        if entity >= self.__capacity__:
+            self.__refresh__()
+            if entity >= self.__capacity__:
+                return StateStore.NONE
+        return self.__record__.unpack_from(self.__map__, self.__offset__ + entity * self.__width__)[0]
+
+    def codes(self):
+        """NumPy view of every record, backed by the mapping itself.
+
+        The store cannot grow while a view is alive, so ``reserve()`` first.
+        """
+        import numpy  # optional: only needed for the array view
+        dtype = numpy.dtype(numpy.int16 if self.__width__ == 2 else numpy.int32).newbyteorder("<")
+        return numpy.frombuffer(self.__map__, dtype=dtype, count=self.__capacity__, offset=self.__offset__)
+
+    def flush(self):
+        """Write dirty pages to the file (``msync``)."""
+        if not self.__readonly__:
+            self.__map__.flush()
+        return self
+
+    def name(self, code):
+        if code == StateStore.NONE:
+            return None
+        return self.__states__[code]
+
+    def path(self):
+        return self.__path__
+
+    def reserve(self, capacity):
+        """Grow the file to hold at least ``capacity`` records (doubling)."""
+        if capacity <= self.__capacity__ or self.__readonly__:
+            return self
+        capacity = max(capacity, self.__capacity__ * 2)
+        if self.__map__ is not None:
+            self.__map__.close()
+            self.__map__ = None
+        f = self.__file__
+        f.seek(self.__offset__ + self.__capacity__ * self.__width__)
+        # 0xff bytes decode to -1 ("no state") at either width
+        f.write(b"\xff" * ((capacity - self.__capacity__) * self.__width__))
+        f.seek(0)
+        f.write(StateStore.HEADER.pack(StateStore.MAGIC, StateStore.VERSION, self.__width__,
+            self.__names__, capacity))
+        f.flush()
+        self.__capacity__ = capacity
+        self.__remap__()
+        return self
+
+    def state(self, entity, state=None):
+        """Get the state name of ``entity``; with ``state``, write it."""
+        if state is None:
+            return self.name(self.code(entity))
+        code = self.__codes__.get(state)
+        if code is None:
+            raise ValueError("state %r is not in this store" % (state,))
+        return self.code(entity, code)
+
+    def states(self):
+        """States in code order."""
+        return list(self.__states__)
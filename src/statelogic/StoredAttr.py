@@ -0,0 +1,41 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+from .Attr import Attr
+
+class StoredAttr(Attr):
+    """``state`` Attr whose value lives in a ``StateStore`` record.
+
+    Reads and writes of ``_value`` (``state()``, the event methods,
+    ``restore()``) go to the entity's record, so the store is the only copy.
+    """
+
+    CLASSNAME = "StoredAttr"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    __slots__ = ("_store", "_entity")
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=StoredAttr.CLASSNAME, ver=StoredAttr)
+
+    def __init__(self, attr, store, entity):
+        # Take over an existing Attr without going through Attr.__init__,
+        # which would write its initial value into the record
+        for name in ("_class", "_name", "_list", "_readonly", "_autostrip", "_sorting",
+            "_onChange", "_valueChoice", "_choiceSet", "_useChoiceOnly", "_set", "_sorted"):
+            setattr(self, name, getattr(attr, name))
+        self._store = store
+        self._entity = entity
+
+    def __get_value__(self):
+        return self._store.state(self._entity)
+
+    def __set_value__(self, value):
+        if value is None or value == "":
+            self._store.code(self._entity, self._store.NONE)
+        else:
+            self._store.state(self._entity, value)
+
+    _value = property(__get_value__, __set_value__)
@@ -0,0 +1,49 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+import sys
+from .LogSink import LogSink
+
+class StreamSink(LogSink):
+    """Write lines to a stream, ``sys.stdout`` by default.
+
+    Wrapped in a ``BufferedSink`` it moves console output off the caller's
+    thread: ``logSink(BufferedSink(StreamSink()))``.
+    """
+
+    CLASSNAME = "StreamSink"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=StreamSink.CLASSNAME, ver=StreamSink)
+
+    def __init__(self, stream=None):
+        try:
+            super().__init__()
+        except:
+            super(StreamSink, self).__init__()
+        self.__stream__ = stream
+
+    def close(self):
+        try:
+            super().close()
+        except TypeError:
+            super(StreamSink, self).close()
+
+    def flush(self):
+        try:
+            self.stream().flush()
+        except (IOError, OSError, ValueError):
+            pass
+
+    def stream(self):
+        # Looked up on every write, so a replaced sys.stdout is followed
+        return self.__stream__ if self.__stream__ is not None else sys.stdout
+
+    def writeLines(self, lines):
+        try:
+            self.stream().write(u"\n".join(lines) + u"\n")
+        except (IOError, OSError, ValueError):
+            pass
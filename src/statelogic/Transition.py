@@ -1,6 +1,9 @@
 from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
 
-from .Attr import Attr  # if you split it out, otherwise remove this line
+try:
+    basestring
+except NameError:
+    basestring=str  # Already Py2/3 compat shim
 
 class Transition(object):
 
@@ -14,7 +17,31 @@ class Transition(object):
         # NEW: Replace f-string with .format() for Py2 compat
         return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=Transition.CLASSNAME, ver=Transition)
 
+    __slots__ = ("_name", "_fromState", "_toState", "__hooks__")
+
     def __init__(self, name, fromState, toState):
-        Attr(self, attrName="name", value = name, readonly=True)
-        Attr(self, attrName="fromState", value = fromState, readonly=True)
-        Attr(self, attrName="toState", value = toState, readonly=True)
\ No newline at end of file
+        self._name = name.strip() if isinstance(name, basestring) else name
+        self._fromState = fromState.strip() if isinstance(fromState, basestring) else fromState
+        self._toState = toState.strip() if isinstance(toState, basestring) else toState
+        # (before, on, after) callables, kept up to date by FSM hook registration
+        self.__hooks__ = (None, None, None)
+
+    # Readonly accessors: a value argument is ignored and the Transition returned
+
+    def attrList(self):
+        return ["fromState", "name", "toState"]
+
+    def fromState(self, value=None):
+        if value is None:
+            return self._fromState
+        return self
+
+    def name(self, value=None):
+        if value is None:
+            return self._name
+        return self
+
+    def toState(self, value=None):
+        if value is None:
+            return self._toState
+        return self
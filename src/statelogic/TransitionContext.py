@@ -0,0 +1,39 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+class TransitionContext(object):
+    """Immutable view of a running transition, as seen by its hooks."""
+
+    CLASSNAME = "TransitionContext"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    __slots__ = ("_transitionName", "_fromState", "_toState", "_nextState")
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=TransitionContext.CLASSNAME, ver=TransitionContext)
+
+    def __init__(self, transitionName, fromState, toState, nextState=""):
+        object.__setattr__(self, "_transitionName", transitionName)
+        object.__setattr__(self, "_fromState", fromState)
+        object.__setattr__(self, "_toState", toState)
+        object.__setattr__(self, "_nextState", nextState)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TransitionContext is immutable")
+
+    def __repr__(self):
+        return "TransitionContext(%r, %r, %r, %r)" % (self._transitionName, self._fromState, self._toState, self._nextState)
+
+    def fromState(self):
+        return self._fromState
+
+    def nextState(self):
+        return self._nextState
+
+    def toState(self):
+        return self._toState
+
+    def transitionName(self):
+        return self._transitionName
@@ -0,0 +1,35 @@
+from __future__ import print_function, division, absolute_import  # NEW: Enhanced for Py2 compat
+
+from .Histogram import Histogram
+
+class TransitionStats(object):
+    """Counters and latency histograms of one instrumented transition."""
+
+    CLASSNAME = "TransitionStats"
+    MAJOR_VERSION = 1
+    MINOR_VERSION = 2
+    PATCH_VERSION = 3
+
+    __slots__ = ("fires", "rejected", "transition", "before", "on", "after")
+
+    @staticmethod
+    def class_version():
+        return "{classname} v{ver.major}.{ver.minor}.{ver.patch}".format(classname=TransitionStats.CLASSNAME, ver=TransitionStats)
+
+    def __init__(self):
+        self.fires = 0
+        self.rejected = 0
+        self.transition = Histogram()
+        self.before = Histogram()
+        self.on = Histogram()
+        self.after = Histogram()
+
+    def summary(self):
+        return {
+            "fires": self.fires,
+            "rejected": self.rejected,
+            "transition": self.transition.summary(),
+            "before": self.before.summary(),
+            "on": self.on.summary(),
+            "after": self.after.summary(),
+        }
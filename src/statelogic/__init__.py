@@ -1,7 +1,73 @@
 # statelogic/__init__.py
+import sys
 from .Attr import Attr
 from .FSM import FSM
-from .StateLogic import StateLogic
+from .Machine import Machine
+from .SharedFSM import SharedFSM
 
-__all__ = ['StateLogic', 'Attr', 'FSM']
-__version__ = "1.2.3" 
\ No newline at end of file
+# Imported on first access: StateLogic pulls in Sh/Signal/AppData and their
+# stdlib dependencies, the sinks need threading/atexit, FleetFSM needs numpy,
+# StateStore needs mmap, Journal needs threading, ShardedFleet needs
+# multiprocessing, Replay needs csv/json, SharedStateStore needs
+# multiprocessing.shared_memory
+__lazy__ = ('StateLogic', 'LogSink', 'FileSink', 'BufferedSink', 'StreamSink', 'FleetFSM',
+    'StateStore', 'SharedStateStore', 'Journal', 'Scheduler', 'Registry', 'HashRing', 'ShardedFleet', 'Replay', 'AsyncFSM', 'AsyncStateLogic', 'AsyncScheduler')
+
+__all__ = ['StateLogic', 'Attr', 'FSM', 'Machine', 'SharedFSM', 'LogSink', 'FileSink', 'BufferedSink', 'StreamSink', 'StateStore', 'Journal', 'Scheduler', 'Registry', 'HashRing', 'ShardedFleet', 'Replay', 'replay']
+
+if sys.version_info >= (3, 7):
+    import types
+    __all__ += ['FleetFSM', 'SharedStateStore', 'AsyncFSM', 'AsyncStateLogic', 'AsyncScheduler']
+
+    class __LazyPackage__(types.ModuleType):
+        # Importing a submodule binds it on the package under its own name,
+        # which is also its class's name: keep the class there instead
+        def __setattr__(self, name, value):
+            if name in __lazy__ and isinstance(value, types.ModuleType) \
+                and value.__name__ == self.__name__ + "." + name:
+                value = getattr(value, name)
+            types.ModuleType.__setattr__(self, name, value)
+
+    sys.modules[__name__].__class__ = __LazyPackage__
+
+    def __getattr__(name):
+        if name not in __lazy__:
+            raise AttributeError("module %r has no attribute %r" % (__name__, name))
+        __import__(name, globals(), None, [name], 1)
+        return globals()[name]
+
+    def __dir__():
+        return sorted(set(globals()) | set(__lazy__))
+else:
+    # No module __getattr__ (PEP 562) before Python 3.7: import eagerly
+    from .BufferedSink import BufferedSink
+    from .FileSink import FileSink
+    from .FleetFSM import FleetFSM
+    from .HashRing import HashRing
+    from .Journal import Journal
+    from .LogSink import LogSink
+    from .Registry import Registry
+    from .Replay import Replay
+    from .Scheduler import Scheduler
+    from .ShardedFleet import ShardedFleet
+    from .SharedStateStore import SharedStateStore
+    from .StateLogic import StateLogic
+    from .StateStore import StateStore
+    from .StreamSink import StreamSink
+    __all__ += ['FleetFSM', 'SharedStateStore']
+    # async/await syntax: Python 3.5+ only
+    try:
+        from .AsyncFSM import AsyncFSM
+        from .AsyncStateLogic import AsyncStateLogic
+        from .AsyncScheduler import AsyncScheduler
+        __all__ += ['AsyncFSM', 'AsyncStateLogic', 'AsyncScheduler']
+    except SyntaxError:
+        pass
+
+def replay(source, target, **options):
+    """Stream the events in a JSONL or CSV file through ``target`` and
+    return the final stats; the options are those of ``Replay``."""
+    from .Replay import Replay
+    return Replay(source, target, **options).run()
+
+__version__ = "1.2.3"
@@ -0,0 +1,8 @@
+# statelogic/core.py
+# The FSM engine alone: no Sh/Signal/AppData and none of their optional
+# stdlib imports (datetime, re, signal, pwd, time, threading)
+from .Attr import Attr
+from .FSM import FSM
+from .Transition import Transition
+
+__all__ = ['Attr', 'FSM', 'Transition']
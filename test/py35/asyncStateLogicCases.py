@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# async def is a syntax error before Python 3.5: only imported from
+# testAsyncStateLogic.py on 3.5+
+import statelogic
+
+class AsyncStateLogicCases(object):
+    """Test bodies for testAsyncStateLogic.py, mixed into a TestCase there."""
+
+    def setUp(self):
+        import asyncio
+        self.run = lambda coroutine: asyncio.new_event_loop().run_until_complete(coroutine)
+        self.s = statelogic.AsyncStateLogic()
+        self.s.transition("freeze", "LIQUID", "SOLID")
+        self.s.transition("condense", "GAS", "LIQUID")
+
+    def test_event_methods_should_be_coroutines(self):
+        self.s.state("GAS")
+        self.run(self.s.condense())
+        self.assertEqual(self.s.state(), "LIQUID")
+        self.run(self.s.fire("freeze"))
+        self.assertEqual(self.s.state(), "SOLID")
+
+    def test_should_await_async_hooks_in_order(self):
+        import asyncio
+        calls = []
+        async def before(self):
+            await asyncio.sleep(0)
+            calls.append("before")
+            return True
+        async def after(self):
+            calls.append("after")
+        self.s.before("condense", before)
+        self.s.on("condense", lambda self: calls.append("on"))
+        self.s.after("condense", after)
+        self.s.on("LIQUID", lambda self: calls.append("onLIQUID"))
+        self.s.state("GAS")
+        self.run(self.s.fire("condense"))
+        self.assertEqual(calls, ["before", "on", "after", "onLIQUID"])
+        self.assertEqual(self.s.state(), "LIQUID")
+
+    def test_async_before_hook_should_guard_transition(self):
+        async def before(self):
+            return False
+        self.s.before("condense", before)
+        self.s.state("GAS")
+        self.run(self.s.condense())
+        self.assertEqual(self.s.state(), "GAS")
+
+    def test_should_instrument_async_hooks(self):
+        import asyncio
+        async def before(self):
+            await asyncio.sleep(0)
+            return False
+        self.s.before("condense", before)
+        self.s.instrument()
+        self.s.state("GAS")
+        self.run(self.s.condense())
+        self.assertEqual(self.s.state(), "GAS")
+        stats = self.s.stats()["condense"]
+        self.assertEqual((stats["fires"], stats["rejected"], stats["before"]["count"]), (1, 1, 1))
+
+    def test_should_queue_awaited_events_until_commit(self):
+        async def on(self):
+            await self.freeze()
+            self.calls = self.state()
+        self.s.on("condense", on)
+        self.s.runToCompletion()
+        self.s.state("GAS")
+        self.run(self.s.condense())
+        self.assertEqual((self.s.calls, self.s.state()), ("GAS", "SOLID"))
+        self.s.post("freeze")
+        self.assertEqual(self.run(self.s.drain()), 1)
+
+    def test_concurrent_events_should_not_both_pass_a_guard(self):
+        import asyncio
+        self.s.transition("deposit", "GAS", "SOLID")
+        calls = []
+        async def before(self):
+            calls.append(self.transitionName())
+            await asyncio.sleep(0)
+            return True
+        self.s.before("condense", before)
+        self.s.before("deposit", before)
+        self.s.state("GAS")
+        async def main():
+            await asyncio.gather(self.s.condense(), self.s.deposit())
+        self.run(main())
+        self.assertEqual((calls, self.s.state()), (["condense"], "LIQUID"))
+
+    def test_interleaved_tasks_should_keep_their_transition_fields(self):
+        import asyncio
+        self.s.transition("melt", "SOLID", "LIQUID")
+        seen = []
+        def hooks(name):
+            async def check(self):
+                for step in ("before", "on", "after"):
+                    seen.append((name, self.transitionName()))
+                    await asyncio.sleep(0)
+                return True
+            return check
+        for name in ("freeze", "melt"):
+            self.s.before(name, hooks(name))
+            self.s.after(name, hooks(name))
+        self.s.state("LIQUID")
+        async def melt():
+            # Starts while freeze is still in its after hook
+            while self.s.state() != "SOLID":
+                await asyncio.sleep(0)
+            await self.s.melt()
+        async def main():
+            await asyncio.gather(self.s.freeze(), melt())
+        self.run(main())
+        self.assertEqual(self.s.state(), "LIQUID")
+        self.assertEqual([name for name, current in seen if name != current], [])
+        self.assertEqual(len(seen), 12)
+
+    def test_hooks_should_fire_events_on_the_same_machine(self):
+        # The on hook re-enters the lock held by its own task; the after hook
+        # runs once it is released
+        calls = []
+        async def on(self):
+            calls.append(self.state())
+            await self.freeze()
+        self.s.on("condense", on)
+        self.s.after("condense", lambda self: self.freeze())
+        self.s.state("GAS")
+        self.run(self.s.condense())
+        self.assertEqual((calls, self.s.state()), (["GAS"], "SOLID"))
+
+    def test_thread_safe_should_be_rejected(self):
+        with self.assertRaises(TypeError):
+            self.s.threadSafe()
+        self.assertIs(self.s.threadSafe(False), self.s)
+
+    def test_should_drive_timeouts_from_asyncio(self):
+        import asyncio
+        from statelogic.AsyncScheduler import AsyncScheduler
+        scheduler = AsyncScheduler()
+        self.s.timeout("GAS", 0.01, "condense")
+        self.s.transition("evaporate", "LIQUID", "GAS")
+        self.s.state("LIQUID")
+        scheduler.attach(self.s)
+        async def main():
+            task = asyncio.ensure_future(scheduler.run())
+            await self.s.evaporate()
+            await asyncio.sleep(0.05)
+            scheduler.stop()
+            await task
+        self.run(main())
+        self.assertEqual(self.s.state(), "LIQUID")
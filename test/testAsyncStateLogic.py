@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+import statelogic
+
+if sys.version_info >= (3, 5):
+    sys.path.insert(0, realpath(join(__file__, "../py35/")))
+    from asyncStateLogicCases import AsyncStateLogicCases
+else:
+    AsyncStateLogicCases = object
+
+@unittest.skipIf(not hasattr(statelogic, "AsyncStateLogic"), "asyncio needs Python 3.5+")
+class TestAsyncStateLogic(AsyncStateLogicCases, unittest.TestCase):
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import os
+import subprocess
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+import statelogic
+from statelogic.core import Attr, FSM, Transition
+
+SRC = realpath(join(__file__, "../../src/"))
+
+def loaded_by(statement):
+    code = "import sys; before = set(sys.modules); %s; print(' '.join(sorted(set(sys.modules) - before)))" % statement
+    out = subprocess.check_output([sys.executable, "-c", code], env=dict(os.environ, PYTHONPATH=SRC))
+    return set(out.decode().split())
+
+class TestCore(unittest.TestCase):
+    def test_core_should_run_a_machine(self):
+        fsm = FSM()
+        fsm.transition("melt", "SOLID", "LIQUID").state("SOLID")
+        self.assertEqual(fsm.melt().state(), "LIQUID")
+        self.assertIs(statelogic.FSM, FSM)
+        self.assertIs(statelogic.Attr, Attr)
+
+    @unittest.skipIf(sys.version_info < (3, 7), "statelogic imports everything eagerly before Python 3.7")
+    def test_core_should_skip_optional_stdlib_imports(self):
+        loaded = loaded_by("import statelogic.core")
+        for name in ("datetime", "pwd", "re", "signal", "threading", "statelogic.Sh", "statelogic.StateLogic"):
+            self.assertNotIn(name, loaded)
+
+    @unittest.skipIf(sys.version_info < (3, 7), "module __getattr__ needs Python 3.7+")
+    def test_state_logic_should_load_on_first_access(self):
+        self.assertNotIn("statelogic.StateLogic", loaded_by("import statelogic"))
+        self.assertIn("statelogic.StateLogic", loaded_by("from statelogic import StateLogic"))
+
+    def test_lazy_names_should_be_classes(self):
+        from statelogic.Signal import Signal  # Binds statelogic.LogSink
+        self.assertIsInstance(statelogic.LogSink, type)
+        self.assertIsInstance(statelogic.StateLogic, type)
+        self.assertIsInstance(statelogic.BufferedSink, type)
+
+    @unittest.skipIf(sys.version_info < (3, 5), "the async names are missing before Python 3.5")
+    def test_star_import_should_export_every_lazy_name(self):
+        self.assertEqual(set(statelogic.__lazy__) - set(statelogic.__all__), set())
+        names = {}
+        exec("from statelogic import *", names)
+        self.assertIsInstance(names["FleetFSM"], type)
+        self.assertIsInstance(names["SharedStateStore"], type)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM, Machine
+from statelogic.FleetFSM import FleetFSM, numpy
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestFleetFSM(unittest.TestCase):
+    def setUp(self):
+        fsm = FSM()
+        fsm.transition("freeze", "LIQUID", "SOLID")
+        fsm.transition("melts", "SOLID", "LIQUID")
+        fsm.transition("evaporate", "LIQUID", "GAS")
+        self.fleet = FleetFSM(fsm, 10, initial="LIQUID")
+
+    def test_should_start_in_initial_state(self):
+        self.assertEqual(self.fleet.countByState(), {"LIQUID": 10, "SOLID": 0, "GAS": 0})
+        self.assertEqual(self.fleet.state(3), "LIQUID")
+
+    def test_should_fire_event_for_batch(self):
+        changed = self.fleet.fire("freeze", [1, 2, 3])
+        self.assertEqual(list(changed), [1, 2, 3])
+        self.assertEqual(self.fleet.count("SOLID"), 3)
+        self.assertEqual(list(self.fleet.inState("SOLID")), [1, 2, 3])
+        # invalid from SOLID, valid from LIQUID
+        changed = self.fleet.fire("evaporate", [1, 4])
+        self.assertEqual(list(changed), [4])
+        self.assertEqual(self.fleet.state([1, 4]), ["SOLID", "GAS"])
+
+    def test_should_respect_guard_mask(self):
+        self.fleet.fire("freeze", [0, 1, 2], mask=[True, False, True])
+        self.assertEqual(self.fleet.state([0, 1, 2]), ["SOLID", "LIQUID", "SOLID"])
+
+    def test_should_apply_array_of_events(self):
+        self.fleet.fire(["freeze", "evaporate", "melts", "unknown"], [0, 1, 2, 3])
+        self.assertEqual(self.fleet.state([0, 1, 2, 3]), ["SOLID", "GAS", "LIQUID", "LIQUID"])
+
+    def test_should_skip_out_of_range_event_codes(self):
+        freeze = self.fleet.eventCodes("freeze")
+        changed = self.fleet.fire([freeze, 99, -2], [0, 1, 2], mask=[True, True, True])
+        self.assertEqual(list(changed), [0])
+        self.assertEqual(self.fleet.state([0, 1, 2]), ["SOLID", "LIQUID", "LIQUID"])
+        self.assertEqual(list(self.fleet.eventCodes([freeze, 99, -2])), [freeze, -1, -1])
+
+    def test_should_call_hooks_per_group(self):
+        calls = []
+        self.fleet.before("freeze", lambda ids: ids % 2 == 0)
+        self.fleet.after("freeze", lambda ids: calls.append(("afterFreeze", list(ids))))
+        self.fleet.on("GAS", lambda ids: calls.append(("onGAS", list(ids))))
+        self.fleet.fire(["freeze", "freeze", "freeze", "evaporate", "evaporate"], [0, 1, 2, 3, 4])
+        self.assertEqual(calls, [("afterFreeze", [0, 2]), ("onGAS", [3, 4])])
+        self.assertEqual(self.fleet.state(1), "LIQUID")
+
+    def test_should_build_from_machine(self):
+        fleet = FleetFSM(Machine([("go", "A", "B")]), 3)
+        self.assertEqual(fleet.state(0), None)
+        fleet.state([0, 1], "A")
+        fleet.fire("go")
+        self.assertEqual(fleet.state([0, 1, 2]), ["B", "B", None])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM
+from statelogic.Histogram import Histogram
+
+def machine():
+    fsm = FSM()
+    fsm.transition("start", "IDLE", "RUNNING").transition("stop", "RUNNING", "IDLE").state("IDLE")
+    return fsm
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.fsm = machine()
+        self.allow = True
+        test = self
+        self.fsm.before("start", lambda fsm: test.allow)
+        self.fsm.on("stop", lambda fsm: None)
+
+    def test_should_be_off_by_default(self):
+        self.assertIsNone(self.fsm.stats())
+        plain = machine().start.__func__.__code__
+        self.assertIs(self.fsm.start.__func__.__code__, plain)
+        self.fsm.instrument()
+        self.assertIsNot(self.fsm.start.__func__.__code__, plain)
+        self.fsm.instrument(False)
+        self.assertIs(self.fsm.start.__func__.__code__, plain)
+        self.assertIsNone(self.fsm.stats())
+
+    def test_should_count_fires_and_rejections(self):
+        self.fsm.instrument()
+        self.allow = False
+        self.fsm.start()
+        self.allow = True
+        self.fsm.start().stop().stop()
+        stats = self.fsm.stats()
+        self.assertEqual(stats["start"]["fires"], 2)
+        self.assertEqual(stats["start"]["rejected"], 1)
+        self.assertEqual(stats["start"]["before"]["count"], 2)
+        self.assertEqual(stats["start"]["transition"]["count"], 2)
+        self.assertEqual(stats["stop"]["fires"], 1)
+        self.assertEqual(stats["stop"]["on"]["count"], 1)
+        self.assertEqual(stats["stop"]["before"]["count"], 0)
+        self.assertEqual(self.fsm.state(), "IDLE")
+
+    def test_should_time_hooks_registered_later(self):
+        self.fsm.instrument()
+        self.fsm.after("start", lambda fsm: None)
+        self.fsm.start()
+        self.assertEqual(self.fsm.stats()["start"]["after"]["count"], 1)
+
+    def test_should_compose_with_thread_safety(self):
+        self.fsm.instrument().threadSafe()
+        self.fsm.fire("start").fire("stop")
+        self.assertEqual(self.fsm.stats()["stop"]["fires"], 1)
+
+    def test_should_render_text_snapshot(self):
+        self.fsm.instrument().start()
+        text = self.fsm.statsText()
+        self.assertIn("start", text)
+        self.assertIn("p99 us", text)
+
+    def test_histogram_should_bound_percentiles(self):
+        histogram = Histogram()
+        for ns in (100, 200, 300, 5000):
+            histogram.add(ns / 1e9)
+        self.assertEqual(histogram.count(), 4)
+        self.assertEqual(histogram.percentile(50), 256)
+        self.assertEqual(histogram.percentile(100), 5000)
+        self.assertEqual(histogram.summary()["min"], 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import os
+import shutil
+import tempfile
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+from statelogic import FSM
+from statelogic.Journal import Journal
+from statelogic.StateLogic import StateLogic
+
+def machine(fsm=None):
+    fsm = fsm if fsm is not None else FSM()
+    return fsm.fromTable([("start", "IDLE", "RUNNING"), ("stop", "RUNNING", "IDLE")]).state("IDLE")
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "journal.bin")
+        self.journal = Journal(self.path, batchSize=4, interval=0.01)
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.dir)
+
+    def test_should_record_committed_transitions(self):
+        fsm = self.journal.attach(machine(StateLogic()), 7)
+        fsm.before("stop", lambda self: False)
+        fsm.start()
+        fsm.stop()
+        self.journal.commit()
+        records = list(Journal.records(self.path))
+        self.assertEqual([record[:4] for record in records], [(7, "start", "IDLE", "RUNNING")])
+        self.assertEqual(self.journal.pending(), 0)
+
+    def test_should_replay_states_in_bulk(self):
+        machines = dict((entity, self.journal.attach(machine(), entity)) for entity in range(10))
+        for entity, fsm in machines.items():
+            fsm.start()
+            if entity % 2:
+                fsm.stop()
+        self.journal.close()
+        fresh = dict((entity, machine()) for entity in range(10))
+        states = Journal.replay(self.path, fresh)
+        self.assertEqual(states[2], "RUNNING")
+        self.assertEqual(states[3], "IDLE")
+        self.assertEqual(fresh[4].state(), "RUNNING")
+        fresh[4].stop()
+        self.assertEqual(fresh[4].state(), "IDLE")
+
+    def test_should_compact_into_states(self):
+        fsm = self.journal.attach(machine(), 1)
+        for i in range(20):
+            fsm.start().stop()
+        fsm.start()
+        self.journal.commit()
+        size = os.path.getsize(self.path)
+        self.journal.compact()
+        self.assertLess(os.path.getsize(self.path), size)
+        self.assertEqual(list(Journal.records(self.path)), [(1, None, None, "RUNNING", None)])
+        fsm.stop()
+        self.journal.commit()
+        self.assertEqual(Journal.replay(self.path), {1: "IDLE"})
+
+    def test_attach_should_reject_entities_that_do_not_fit(self):
+        with self.assertRaises(TypeError):
+            self.journal.attach(machine(), "order-7")
+        with self.assertRaises(ValueError):
+            self.journal.attach(machine(), 1 << 63)
+
+    def test_should_raise_when_the_name_table_is_full(self):
+        with patch.object(Journal, "MAX_NAMES", 4):
+            fsm = self.journal.attach(machine(), 1)
+            with self.assertRaises(ValueError):
+                self.journal.attach(machine().transition("fail", "RUNNING", "FAILED"), 2)
+            with self.assertRaises(ValueError):
+                self.journal.append(3, "reset", "IDLE", "IDLE")
+            fsm.start()
+        self.journal.commit()
+        self.assertEqual(Journal.replay(self.path), {1: "RUNNING"})
+
+    def test_should_refuse_records_after_close(self):
+        fsm = self.journal.attach(machine(), 1)
+        fsm.start()
+        self.journal.close()
+        with self.assertRaises(ValueError):
+            fsm.stop()
+        for method in (self.journal.commit, self.journal.compact):
+            with self.assertRaises(ValueError):
+                method()
+        self.assertEqual(Journal.replay(self.path), {1: "RUNNING"})
+
+    def test_should_ignore_torn_tail(self):
+        self.journal.attach(machine(), 1).start()
+        self.journal.close()
+        with open(self.path, "ab") as handle:
+            handle.write(b"T\x01\x00")
+        self.assertEqual(Journal.replay(self.path), {1: "RUNNING"})
+        self.journal = Journal(self.path)
+        self.journal.attach(machine(), 2).start()
+        self.journal.commit()
+        self.assertEqual(Journal.replay(self.path), {1: "RUNNING", 2: "RUNNING"})
+
+if __name__ == '__main__':
+    unittest.main()
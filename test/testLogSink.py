@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import os
+import shutil
+import tempfile
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+import io
+from statelogic import Attr, BufferedSink, FileSink, LogSink, StateLogic, StreamSink
+
+class TestLogSink(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = join(self.dir, "app.log")
+
+    def tearDown(self):
+        LogSink.closeAll()
+        shutil.rmtree(self.dir)
+
+    def read(self, path=None):
+        with open(path or self.path) as f:
+            return f.read()
+
+    def test_file_sink_should_keep_one_handle(self):
+        sink = FileSink(self.path)
+        sink.write("one").write("two")
+        handle = sink.__handle__
+        sink.write("three")
+        self.assertIs(sink.__handle__, handle)
+        self.assertEqual(self.read(), "one\ntwo\nthree\n")
+
+    def test_file_sink_should_rotate_by_size(self):
+        sink = FileSink(self.path, maxBytes=8, backupCount=2)
+        for line in ("aaaa", "bbbb", "cccc", "dddd"):
+            sink.write(line)
+        sink.flush()
+        self.assertEqual(self.read(), "dddd\n")
+        self.assertEqual(self.read(self.path + ".1"), "cccc\n")
+        self.assertEqual(self.read(self.path + ".2"), "bbbb\n")
+        self.assertFalse(os.path.exists(self.path + ".3"))
+
+    def test_buffered_sink_should_write_in_order_on_flush(self):
+        sink = BufferedSink(FileSink(self.path), batchSize=1000, interval=10)
+        for i in range(500):
+            sink.write("line %d" % i)
+        sink.flush()
+        self.assertEqual(self.read().splitlines(), ["line %d" % i for i in range(500)])
+        self.assertEqual(sink.pending(), 0)
+
+    def test_buffered_sink_should_drop_when_full(self):
+        sink = BufferedSink(FileSink(self.path), maxSize=3, policy="drop", batchSize=1000, interval=10)
+        sink.writeLines(["a", "b", "c", "d", "e"])
+        self.assertEqual(sink.dropped(), 2)
+        sink.close()
+        self.assertEqual(self.read(), "a\nb\nc\n")
+
+    def test_buffered_sink_should_block_until_drained(self):
+        sink = BufferedSink(FileSink(self.path), maxSize=2, batchSize=2, interval=0.01)
+        sink.writeLines(["line %d" % i for i in range(20)])
+        sink.close()
+        self.assertEqual(len(self.read().splitlines()), 20)
+        self.assertEqual(sink.dropped(), 0)
+
+    def test_buffered_sink_should_reject_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            BufferedSink(FileSink(self.path), policy="spill")
+
+    def test_prn_should_write_to_log_to(self):
+        app = StateLogic()
+        Attr(app, "logTo", self.path)
+        app.prn("hello").prn("world")
+        self.assertIs(app.logSink(), LogSink.forPath(self.path))
+        self.assertIsInstance(app.logSink(), BufferedSink)
+        LogSink.flushAll()
+        self.assertEqual(self.read(), "hello\nworld\n")
+
+    def test_prn_should_use_configured_sink(self):
+        app = StateLogic()
+        sink = BufferedSink(FileSink(self.path), interval=10)
+        app.logSink(sink).prn("queued")
+        self.assertEqual(sink.pending(), 1)
+        LogSink.flushAll()
+        self.assertEqual(self.read(), "queued\n")
+
+    def test_file_sink_should_rotate_by_bytes(self):
+        sink = FileSink(self.path, maxBytes=10, backupCount=1)
+        sink.write(u"\u00e9\u00e9\u00e9").write(u"\u00e9\u00e9")
+        sink.close()
+        self.assertTrue(os.path.exists(self.path + ".1"))
+
+    def test_buffered_sink_should_write_a_batch_interrupted_by_a_signal(self):
+        # As Signal.signal_handler() does when it interrupts the writer:
+        # flush every sink, then exit before the interrupted write finishes
+        class Interrupted(LogSink):
+            def __init__(self):
+                LogSink.__init__(self)
+                self.lines = []
+                self.signalled = False
+            def writeLines(self, lines):
+                if not self.signalled:
+                    self.signalled = True
+                    LogSink.flushAll()
+                    raise SystemExit(1)
+                self.lines.extend(lines)
+        inner = Interrupted()
+        sink = BufferedSink(inner, interval=10)
+        sink.write("one").write("two")
+        with self.assertRaises(SystemExit):
+            sink.flush()
+        self.assertEqual(inner.lines, ["one", "two"])
+        sink.write("three")
+        sink.flush()
+        self.assertEqual(inner.lines, ["one", "two", "three"])
+
+    def test_prn_should_send_every_line_to_a_configured_sink(self):
+        stream = io.StringIO()
+        app = StateLogic()
+        sink = BufferedSink(StreamSink(stream), interval=10)
+        app.logSink(sink).prn(u"quiet")
+        self.assertEqual(stream.getvalue(), u"")
+        sink.flush()
+        self.assertEqual(stream.getvalue(), u"quiet\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import Machine, SharedFSM
+
+class Matter(SharedFSM):
+    machine = Machine([
+        ("freeze", "LIQUID", "SOLID"),
+        ("melts", "SOLID", "LIQUID"),
+        ("evaporate", "LIQUID", "GAS"),
+        ("condense", "GAS", "LIQUID", {"before": "check_condense", "after": "log"}),
+        ("return", "LIQUID", "PLASMA"),
+    ], initial="LIQUID", stateHooks={"SOLID": "log"})
+
+    def __init__(self, temperature=100, state=None):
+        SharedFSM.__init__(self, state)
+        self.temperature = temperature
+        self.log_entries = []
+
+    def check_condense(self):
+        return self.temperature < 120
+
+    def log(self):
+        self.log_entries.append("%s:%s->%s" % (self.transitionName(), self.fromState(), self.toState()))
+
+class TestMachine(unittest.TestCase):
+
+    def test_should_start_in_initial_state(self):
+        self.assertEqual(Matter().state(), "LIQUID")
+
+    def test_should_share_definition_between_instances(self):
+        a, b = Matter(), Matter()
+        self.assertIs(a.machine, b.machine)
+        self.assertNotIn("freeze", a.__dict__)
+        a.freeze()
+        self.assertEqual(a.state(), "SOLID")
+        self.assertEqual(b.state(), "LIQUID")
+
+    def test_should_list_events_and_states(self):
+        m = Matter()
+        self.assertEqual(m.events(), ["condense", "evaporate", "freeze", "melts"])
+        self.assertEqual(m.states(), ["GAS", "LIQUID", "PLASMA", "SOLID"])
+
+    def test_should_only_fire_valid_transitions(self):
+        m = Matter()
+        self.assertTrue(m.can("freeze"))
+        self.assertFalse(m.can("melts"))
+        m.fire("melts")
+        self.assertEqual(m.state(), "LIQUID")
+        m.fire("freeze")
+        self.assertEqual(m.state(), "SOLID")
+
+    def test_should_run_hooks_through_definition(self):
+        m = Matter(temperature=100, state="GAS")
+        m.condense()
+        self.assertEqual(m.state(), "LIQUID")
+        self.assertEqual(m.log_entries, ["condense:GAS->LIQUID"])
+        m.freeze()
+        self.assertEqual(m.log_entries, ["condense:GAS->LIQUID", "freeze:LIQUID->SOLID"])
+
+    def test_should_block_transition_when_before_hook_fails(self):
+        m = Matter(temperature=130, state="GAS")
+        m.condense()
+        self.assertEqual(m.state(), "GAS")
+
+    def test_definition_should_be_immutable(self):
+        with self.assertRaises(AttributeError):
+            Matter.machine.extra = 1
+        machine = Matter.machine
+        machine.states().append("LOST")
+        machine.events().append("lose")
+        self.assertEqual(machine.states(), ["GAS", "LIQUID", "PLASMA", "SOLID"])
+        self.assertEqual(machine.events(), ["condense", "evaporate", "freeze", "melts"])
+        if sys.version_info >= (3, 3):  # Py2 keeps plain copies
+            for table in (machine.__dispatch__, machine.__eventIndex__, machine.__codes__, machine.__stateHooks__):
+                with self.assertRaises(TypeError):
+                    table["lose"] = None
+
+    def test_from_and_to_state_should_differ_from_fsm(self):
+        # SharedFSM reports source and target; FSM keeps its swapped order
+        from statelogic import FSM
+        seen = []
+        hook = lambda self: seen.append((self.fromState(), self.toState()))
+        class Order(SharedFSM):
+            machine = Machine([("pay", "NEW", "PAID", {"on": hook})], initial="NEW")
+        Order().pay()
+        FSM().fromTable([("pay", "NEW", "PAID", {"on": hook})]).state("NEW").pay()
+        self.assertEqual(seen, [("NEW", "PAID"), ("PAID", "NEW")])
+
+if __name__ == '__main__':
+    unittest.main()
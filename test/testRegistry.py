@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import gc
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM
+from statelogic.Registry import Registry
+from statelogic.StateLogic import StateLogic
+
+class Order(StateLogic):
+    def __init__(self):
+        try:
+            super().__init__()
+        except:
+            super(Order, self).__init__()
+        self.fromTable([("pay", "NEW", "PAID"), ("fail", "NEW", "FAILED"), ("retry", "FAILED", "NEW")])
+        self.state("NEW")
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_should_index_registered_class_at_construction(self):
+        self.registry.register(Order)
+        try:
+            orders = [Order() for i in range(6)]
+        finally:
+            del Order.__registry__
+        orders[0].fail()
+        orders[1].fail()
+        orders[2].pay()
+        self.assertEqual(self.registry.countByState(), {"NEW": 3, "FAILED": 2, "PAID": 1})
+        self.assertEqual(set(self.registry.inState("FAILED")), set(orders[:2]))
+        self.assertEqual(self.registry.states(), ["FAILED", "NEW", "PAID"])
+
+    def test_should_broadcast_to_one_state(self):
+        machines = [self.registry.join(FSM().fromTable([("go", "A", "B"), ("back", "B", "A")]).state("A")) for i in range(4)]
+        machines[0].go()
+        self.assertEqual(self.registry.broadcast("go", state="A"), 3)
+        self.assertEqual(self.registry.countByState(), {"B": 4})
+        self.assertEqual(self.registry.broadcast("back"), 4)
+        self.assertEqual(self.registry.inState("B"), [])
+
+    def test_should_follow_restore(self):
+        source = FSM().fromTable([("go", "A", "B")]).state("A").go()
+        fsm = self.registry.join(FSM().fromTable([("go", "A", "B")]).state("A"))
+        fsm.restore(source.snapshot())
+        self.assertEqual(self.registry.countByState(), {"B": 1})
+
+    def test_should_not_keep_members_alive(self):
+        self.registry.join(FSM().fromTable([("go", "A", "B")]).state("A"))
+        gc.collect()
+        self.assertEqual(self.registry.countByState(), {})
+
+if __name__ == '__main__':
+    unittest.main()
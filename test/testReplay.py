@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM, replay
+from statelogic.FleetFSM import FleetFSM, numpy
+from statelogic.Replay import Replay
+
+ROWS = [("pay", "NEW", "PAID"), ("ship", "PAID", "SHIPPED"), ("restock", "SHIPPED", "NEW")]
+CYCLE = ("pay", "ship", "restock")
+
+def machine(entity=None):
+    return FSM().fromTable(ROWS).state("NEW")
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.dir, "replay.ckpt")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, lines):
+        path = os.path.join(self.dir, name)
+        with io.open(path, "w", encoding="utf-8") as f:
+            f.write(u"".join(line + u"\n" for line in lines))
+        return path
+
+    def test_should_replay_jsonl_into_machines(self):
+        path = self.write("events.jsonl", [json.dumps({"entity": i % 3, "event": CYCLE[i // 3 % 3]}) for i in range(8)]
+            + [u"not json", json.dumps({"entity": 7})])
+        machines = {}
+        stats = replay(path, machines, factory=machine, chunkSize=64)
+        self.assertEqual(stats["records"], 8)
+        self.assertEqual(stats["errors"], 2)
+        self.assertEqual(stats["offset"], os.path.getsize(path))
+        self.assertEqual(dict((entity, fsm.state()) for entity, fsm in machines.items()),
+            {0: "NEW", 1: "NEW", 2: "SHIPPED"})
+
+    def test_should_replay_csv_into_one_machine(self):
+        path = self.write("events.csv", [u"at,event", u"1,pay", u"2,ship", u"3,restock", u"4,pay"])
+        fsm = machine()
+        stats = Replay(path, fsm).run()
+        self.assertEqual(stats["records"], 4)
+        self.assertEqual(fsm.state(), "PAID")
+
+    def test_should_not_shift_records_after_a_line_with_two_values(self):
+        lines = [json.dumps({"entity": 0, "event": "pay"}),
+            json.dumps({"entity": 1, "event": "pay"}) + u"," + json.dumps({"entity": 1, "event": "ship"}),
+            json.dumps({"entity": 0, "event": "ship"})]
+        machines = {}
+        stats = replay(self.write("events.jsonl", lines), machines, factory=machine)
+        self.assertEqual((stats["records"], stats["errors"]), (2, 1))
+        self.assertEqual(dict((entity, fsm.state()) for entity, fsm in machines.items()), {0: "SHIPPED"})
+
+    def test_should_keep_quoted_newlines_in_csv_fields(self):
+        rows = [u'entity,note,event'] + [u'%d,"line one\nline ""two""",%s' % (i % 2, CYCLE[i // 2 % 3]) for i in range(4)]
+        machines = {}
+        for chunkSize in (16, 40, None):
+            machines.clear()
+            stats = replay(self.write("events.csv", rows), machines, factory=machine, chunkSize=chunkSize)
+            self.assertEqual((stats["records"], stats["errors"]), (4, 0))
+            self.assertEqual(dict((entity, fsm.state()) for entity, fsm in machines.items()), {"0": "SHIPPED", "1": "SHIPPED"})
+
+    def test_should_convert_csv_entities_for_a_mapping(self):
+        path = self.write("events.csv", [u"entity,event", u"1,pay", u"2,pay", u"x,pay", u"1,ship"])
+        machines = {1: machine(), 2: machine()}
+        stats = replay(path, machines, entityType=int)
+        self.assertEqual((stats["records"], stats["errors"], stats["skipped"]), (3, 1, 0))
+        self.assertEqual((machines[1].state(), machines[2].state()), ("SHIPPED", "PAID"))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_should_apply_fleet_events_in_order(self):
+        events = [(i % 5, CYCLE[i // 5 % 3]) for i in range(40)] + [(2, "restock"), (9, "pay")]
+        path = self.write("events.csv", [u"entity,event"] + [u"%d,%s" % event for event in events])
+        fleet = FleetFSM(machine(), 5, initial="NEW")
+        stats = replay(path, fleet, chunkSize=256)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(fleet.state([0, 1, 2, 3, 4]), ["SHIPPED", "SHIPPED", "NEW", "SHIPPED", "SHIPPED"])
+
+    def test_should_resume_from_checkpoint(self):
+        path = self.write("events.jsonl", [json.dumps([i % 4, CYCLE[i // 4 % 3]]) for i in range(40)])
+        machines = {}
+        progress = []
+        run = Replay(path, machines, fields=(0, 1), factory=machine, checkpoint=self.checkpoint,
+            every=8, progress=progress.append, chunkSize=48)
+        blocks = iter(run)
+        for stats in blocks:
+            if stats["records"] >= 20:
+                break
+        blocks.close()
+        self.assertTrue(progress and progress[-1]["records"] < 40)
+        # A fresh process: new machines, state and position from the checkpoint
+        resumed = {}
+        stats = Replay(path, resumed, fields=(0, 1), factory=machine, checkpoint=self.checkpoint,
+            resume=True).run()
+        self.assertEqual(stats["records"], 40)
+        self.assertEqual(dict((entity, fsm.state()) for entity, fsm in resumed.items()),
+            {0: "PAID", 1: "PAID", 2: "PAID", 3: "PAID"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM
+from statelogic.StateLogic import StateLogic
+
+def machine(fsm=None):
+    fsm = fsm if fsm is not None else FSM()
+    return fsm.fromTable([("start", "IDLE", "RUNNING"), ("finish", "RUNNING", "DONE"),
+        ("reset", "DONE", "IDLE")]).state("IDLE")
+
+class TestRunToCompletion(unittest.TestCase):
+    def test_should_queue_events_raised_by_hooks(self):
+        calls = []
+        fsm = machine().runToCompletion()
+        fsm.on("start", lambda self: (self.finish(), calls.append((self.transitionName(), self.state()))))
+        fsm.after("finish", lambda self: calls.append((self.transitionName(), self.state())))
+        fsm.start()
+        self.assertEqual(fsm.state(), "DONE")
+        self.assertEqual(calls, [("start", "IDLE"), ("finish", "DONE")])
+
+    def test_should_run_nested_without_it(self):
+        fsm = machine()
+        fsm.on("start", lambda self: self.finish())
+        fsm.start()
+        # finish could not fire from IDLE while start was still running
+        self.assertEqual(fsm.state(), "RUNNING")
+
+    def test_should_drain_posted_events_in_order(self):
+        fsm = machine().runToCompletion()
+        fsm.after("start", lambda self: self.fire("finish"))
+        for event in ["start", "reset", "start"]:
+            fsm.post(event)
+        self.assertEqual(fsm.drain(max=1), 1)
+        self.assertEqual(fsm.state(), "RUNNING")
+        # finish was queued behind the posted events
+        self.assertEqual(fsm.drain(), 3)
+        self.assertEqual(fsm.state(), "DONE")
+        self.assertEqual(fsm.drain(), 0)
+
+    def test_should_work_with_thread_safety_in_extension_mode(self):
+        fsm = machine(StateLogic()).threadSafe().runToCompletion()
+        fsm.on("start", lambda self: self.finish())
+        fsm.start()
+        self.assertEqual(fsm.state(), "DONE")
+        fsm.runToCompletion(False)
+        fsm.on("reset", lambda self: self.start())
+        fsm.reset()
+        self.assertEqual(fsm.state(), "IDLE")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import gc
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM
+from statelogic.Scheduler import Scheduler
+from statelogic.StateLogic import StateLogic
+
+def machine(fsm=None):
+    fsm = fsm if fsm is not None else FSM()
+    fsm.fromTable([("submit", "NEW", "PENDING"), ("expire", "PENDING", "EXPIRED"),
+        ("approve", "PENDING", "APPROVED"), ("reopen", "APPROVED", "PENDING")]).state("NEW")
+    return fsm.timeout("PENDING", 30, "expire")
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.scheduler = Scheduler(clock=lambda: self.now)
+
+    def test_should_fire_after_timeout(self):
+        fsm = self.scheduler.attach(machine())
+        fsm.submit()
+        self.assertEqual(self.scheduler.nextDeadline(), 30)
+        self.now = 29.9
+        self.assertEqual(self.scheduler.tick(), 0)
+        self.now = 30
+        self.assertEqual(self.scheduler.tick(), 1)
+        self.assertEqual(fsm.state(), "EXPIRED")
+
+    def test_should_drop_timeout_on_exit(self):
+        fsm = self.scheduler.attach(machine(StateLogic()))
+        calls = []
+        fsm.on("PENDING", lambda self: calls.append(self.state()))
+        fsm.submit()
+        self.now = 10
+        fsm.approve()
+        self.now = 20
+        fsm.reopen()
+        self.now = 35
+        # The first visit's deadline is stale; the second one is not due yet
+        self.assertEqual(self.scheduler.tick(), 0)
+        self.assertEqual(fsm.state(), "PENDING")
+        self.now = 50
+        self.assertEqual(self.scheduler.tick(), 1)
+        self.assertEqual(fsm.state(), "EXPIRED")
+        self.assertEqual(calls, ["PENDING", "PENDING"])
+
+    def test_should_arm_current_state_and_cancel(self):
+        fsm = machine()
+        fsm.submit()
+        self.assertEqual(self.scheduler.pending(), 0)
+        self.scheduler.attach(fsm)
+        self.scheduler.cancel(fsm)
+        self.now = 60
+        self.assertEqual(self.scheduler.tick(), 0)
+        self.assertEqual(fsm.state(), "PENDING")
+
+    def test_should_not_keep_machines_alive(self):
+        self.scheduler.attach(machine()).submit()
+        gc.collect()
+        self.now = 60
+        self.assertEqual(self.scheduler.tick(), 0)
+        self.assertEqual(self.scheduler.pending(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import os
+import unittest
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch  # Requires 'pip install mock' for Python 2.7
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import Attr, FSM, StateLogic
+from statelogic.Settings import Settings
+
+class TestSettings(unittest.TestCase):
+    def tearDown(self):
+        Settings.refresh()
+
+    def test_should_snapshot_environment_until_refresh(self):
+        with patch.dict(os.environ, {"STATE": "show"}):
+            Settings.refresh()
+            with patch.dict(os.environ, {"STATE": "hide"}):
+                self.assertTrue(Settings.showState())
+                Settings.refresh()
+                self.assertFalse(Settings.showState())
+
+    def test_should_skip_state_changed_when_nothing_logs(self):
+        with patch.dict(os.environ, {"STATE": "", "state": ""}):
+            Settings.refresh()
+            fsm = FSM()
+            fsm.transition("melt", "SOLID", "LIQUID").state("SOLID")
+            fsm.melt()
+            self.assertIsNone(fsm._["__changed__"])
+
+    def test_should_log_after_refresh(self):
+        with patch.dict(os.environ, {"STATE": "", "state": ""}):
+            Settings.refresh()
+            app = StateLogic()
+            app.transition("melt", "SOLID", "LIQUID").transition("freeze", "LIQUID", "SOLID").state("SOLID")
+            with patch.object(app, "infoMsg") as info:
+                app.melt()
+                info.assert_not_called()
+                os.environ["STATE"] = "show"
+                Settings.refresh()
+                app.freeze()
+                info.assert_called_once()
+
+    def test_should_keep_overridden_state_changed(self):
+        Settings.__snapshot__ = None  # as in a fresh process
+        class Audited(FSM):
+            def stateChanged(self, func=""):
+                self.changes = getattr(self, "changes", 0) + 1
+                return self
+        fsm = Audited()
+        fsm.transition("melt", "SOLID", "LIQUID").state("SOLID")
+        fsm.melt()
+        self.assertEqual(fsm.changes, 1)
+
+    def test_should_log_to_attr_added_after_first_transition(self):
+        with patch.dict(os.environ, {"STATE": "", "state": ""}):
+            Settings.refresh()
+            app = StateLogic()
+            app.transition("melt", "SOLID", "LIQUID").transition("freeze", "LIQUID", "SOLID").state("SOLID")
+            with patch.object(app, "infoMsg") as info:
+                app.melt()
+                info.assert_not_called()
+                Attr(app, "logTo", "transitions.log")
+                app.freeze()
+                info.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM, Machine, SharedFSM
+from statelogic.HashRing import HashRing
+from statelogic.ShardedFleet import ShardedFleet
+
+ROWS = [("pay", "NEW", "PAID"), ("ship", "PAID", "SHIPPED"), ("cancel", "NEW", "CANCELLED")]
+
+class Order(FSM):
+    # Module level so that worker processes can unpickle it
+    def __init__(self):
+        try:
+            super().__init__()
+        except:
+            super(Order, self).__init__()
+        self.fromTable(ROWS).state("NEW")
+        self.on("SHIPPED", lambda self: self.emit("shipped"))
+
+def shipped(order):
+    order.emit("shipped")
+
+EMITTING = [("pay", "NEW", "PAID"), ("ship", "PAID", "SHIPPED", {"after": shipped})]
+
+class Parcel(SharedFSM):
+    __slots__ = ()
+    machine = Machine(EMITTING, initial="NEW")
+
+class Faulty(Order):
+    def __init__(self):
+        try:
+            super().__init__()
+        except:
+            super(Faulty, self).__init__()
+        self.on("PAID", lambda self: 1 // 0)
+
+class TestShardedFleet(unittest.TestCase):
+    def test_should_apply_events_in_order_per_entity(self):
+        fleet = ShardedFleet(ROWS, workers=2, initial="NEW", batchSize=4)
+        try:
+            for entity in range(10):
+                fleet.submit(entity, "pay")
+            fleet.submitMany((entity, "ship") for entity in range(0, 10, 2))
+            fleet.submit(10, "cancel")
+            changes, outputs = fleet.join()
+            states = fleet.states()
+        finally:
+            fleet.close()
+        self.assertEqual(len(changes), 16)
+        self.assertEqual(sorted(change for change in changes if change[0] == 4),
+            [(4, "pay", "NEW", "PAID"), (4, "ship", "PAID", "SHIPPED")])
+        self.assertEqual(outputs, [])
+        self.assertEqual(states[4], "SHIPPED")
+        self.assertEqual(states[5], "PAID")
+        self.assertEqual(states[10], "CANCELLED")
+
+    def test_should_collect_hook_outputs_from_machine_class(self):
+        fleet = ShardedFleet(Order, workers=2)
+        try:
+            fleet.submitMany([("a", "pay"), ("b", "pay"), ("a", "ship"), ("b", "cancel")])
+            changes, outputs = fleet.join()
+            self.assertEqual(fleet.collect(), ([], []))
+            self.assertEqual(fleet.states(), {"a": "SHIPPED", "b": "PAID"})
+        finally:
+            fleet.close()
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(outputs, [("a", "shipped")])
+
+    def test_should_collect_hook_outputs_across_joins(self):
+        fleet = ShardedFleet(Order, workers=1, batchSize=1)
+        try:
+            fleet.submit("a", "pay").submit("a", "ship")
+            first = fleet.join()[1]
+            fleet.submit("b", "pay").submit("b", "ship")
+            second = fleet.join()[1]
+        finally:
+            fleet.close()
+        self.assertEqual((first, second), ([("a", "shipped")], [("b", "shipped")]))
+
+    def test_should_collect_hook_outputs_from_rows_and_shared_machines(self):
+        for source in (EMITTING, Parcel):
+            fleet = ShardedFleet(source, workers=1, initial="NEW")
+            try:
+                changes, outputs = fleet.submitMany([("a", "pay"), ("a", "ship"), ("b", "pay")]).join()
+            finally:
+                fleet.close()
+            self.assertEqual((len(changes), outputs), (3, [("a", "shipped")]))
+
+    def test_should_raise_worker_failures(self):
+        fleet = ShardedFleet(Faulty, workers=1)
+        try:
+            fleet.submit("a", "cancel").submit("b", "pay").submit("c", "cancel")
+            with self.assertRaises(RuntimeError) as raised:
+                fleet.join()
+            self.assertIn("ZeroDivisionError", str(raised.exception))
+            # The worker survives the failed batch
+            self.assertEqual(fleet.states(), {"a": "CANCELLED", "b": "PAID"})
+            fleet.__processes__[0].terminate()
+            fleet.__processes__[0].join()
+            fleet.submit("c", "cancel")
+            with self.assertRaises(RuntimeError):
+                fleet.join()
+        finally:
+            fleet.close()
+
+    def test_should_route_entities_stably(self):
+        ring = HashRing(range(4))
+        shards = [ring.shard("order-%d" % i) for i in range(1000)]
+        self.assertEqual(shards, [HashRing(range(4)).shard("order-%d" % i) for i in range(1000)])
+        self.assertEqual(set(shards), set(range(4)))
+        # Adding a shard only moves entities onto the new shard
+        grown = HashRing(range(5))
+        for i, shard in enumerate(shards):
+            moved = grown.shard("order-%d" % i)
+            self.assertTrue(moved == shard or moved == 4)
+
+if __name__ == '__main__':
+    unittest.main()
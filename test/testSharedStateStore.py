@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import multiprocessing
+import threading
+import time
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM
+from statelogic.FleetFSM import FleetFSM, numpy
+from statelogic.SharedStateStore import SharedStateStore, shared_memory
+
+def machine(fsm=None):
+    fsm = fsm if fsm is not None else FSM()
+    return fsm.fromTable([("start", "IDLE", "RUNNING"), ("stop", "RUNNING", "IDLE")]).state("IDLE")
+
+def read(name, ids, results):
+    reader = SharedStateStore(name, readonly=True)
+    try:
+        results.put(reader.statesOf(ids))
+    finally:
+        reader.close()
+
+@unittest.skipIf(shared_memory is None, "multiprocessing.shared_memory is not available")
+class TestSharedStateStore(unittest.TestCase):
+    def setUp(self):
+        self.store = SharedStateStore(source=machine(), capacity=8)
+        self.reader = SharedStateStore(self.store.path(), readonly=True)
+
+    def tearDown(self):
+        self.reader.close()
+        self.store.close()
+
+    def test_should_read_writer_states(self):
+        fsm = self.store.attach(machine(), 2)
+        self.assertEqual(self.reader.states(), ["IDLE", "RUNNING"])
+        self.assertEqual(self.reader.stateOf(2), "IDLE")
+        fsm.start()
+        self.assertEqual(self.reader.stateOf(2), "RUNNING")
+        self.assertEqual(self.reader.statesOf([2, 3, 100]), ["RUNNING", None, None])
+        with self.assertRaises(IOError):
+            self.reader.state(3, "IDLE")
+        with self.assertRaises(ValueError):
+            self.store.state(8, "IDLE")
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_should_back_a_fleet_and_count_writes(self):
+        fleet = FleetFSM(machine(), 8, initial="IDLE", store=self.store)
+        version = self.reader.version()
+        fleet.fire("start", [1, 5])
+        self.assertEqual(self.reader.version(), version + 1)
+        self.assertEqual(self.reader.statesOf(range(8)).count("RUNNING"), 2)
+        del fleet
+
+    def test_should_wait_for_write_section(self):
+        self.store.state(4, "IDLE")
+        self.store.begin()
+        self.store.code(4, 1)
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(self.reader.stateOf(4)))
+        thread.start()
+        time.sleep(0.05)
+        self.assertEqual(seen, [])
+        self.store.end()
+        thread.join()
+        self.assertEqual(seen, ["RUNNING"])
+
+    def test_should_give_up_on_a_dead_writer(self):
+        self.store.state(4, "IDLE")
+        reader = SharedStateStore(self.store.path(), readonly=True, timeout=0.05)
+        try:
+            self.store.begin()
+            with self.assertRaises(IOError):
+                reader.stateOf(4)
+            with self.assertRaises(IOError):
+                reader.statesOf([4])
+            self.store.end()
+            self.assertEqual(reader.stateOf(4), "IDLE")
+        finally:
+            reader.close()
+
+    def test_should_serialize_writer_threads(self):
+        version = self.store.version()
+        done = []
+        self.store.begin()
+        thread = threading.Thread(target=lambda: done.append(self.store.code(5, 1)))
+        thread.start()
+        time.sleep(0.05)
+        self.assertEqual(done, [])
+        self.store.end()
+        thread.join()
+        self.assertEqual(self.reader.version(), version + 2)
+        self.assertEqual(self.reader.stateOf(5), "RUNNING")
+
+    def test_should_read_from_another_process(self):
+        self.store.state(0, "RUNNING").state(6, "IDLE")
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=read, args=(self.store.path(), [0, 6, 7], results))
+        process.start()
+        states = results.get(timeout=30)
+        process.join()
+        self.assertEqual(states, ["RUNNING", "IDLE", None])
+        self.assertEqual(self.reader.stateOf(0), "RUNNING")
+
+if __name__ == '__main__':
+    unittest.main()
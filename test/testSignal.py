@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import gc
+import signal
+import unittest
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch  # Requires 'pip install mock' for Python 2.7
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import StateLogic
+from statelogic.Signal import Signal
+
+patch_target = '__builtin__.print' if sys.version_info[0] < 3 else 'builtins.print'
+
+class TestSignal(unittest.TestCase):
+    def test_should_install_one_process_wide_handler(self):
+        StateLogic()
+        StateLogic()
+        self.assertIs(signal.getsignal(signal.SIGINT), Signal.__dispatch__)
+
+    def test_should_build_error_state_on_first_use(self):
+        app = StateLogic()
+        self.assertNotIn('__error_state__', app.__dict__)
+        app.ignoreError()
+        self.assertEqual(app.errorState.state(), "errorIgnored")
+        self.assertTrue(app.testIgnoredResetNormal())
+        self.assertEqual(app.hasError().errorState.state(), "error")
+
+    @patch(patch_target)
+    def test_should_fan_out_to_live_instances(self, mock_print):
+        first, last = StateLogic(), StateLogic()
+        with self.assertRaises(SystemExit):
+            Signal.__dispatch__(signal.SIGINT, None)
+        self.assertEqual(first.signal(), signal.SIGINT)
+        self.assertEqual(last.signal(), signal.SIGINT)
+        self.assertEqual(mock_print.call_count, 1)
+
+    def test_should_not_keep_instances_alive(self):
+        gc.collect()
+        app = StateLogic()
+        count = len(Signal.__receivers__)
+        del app
+        gc.collect()
+        self.assertEqual(len(Signal.__receivers__), count - 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import pickle
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import Attr, FSM
+from statelogic.StateLogic import StateLogic
+from statelogic.Snapshot import Snapshot
+
+def machine(fsm=None):
+    fsm = fsm if fsm is not None else FSM()
+    return fsm.fromTable([("start", "IDLE", "RUNNING"), ("stop", "RUNNING", "IDLE")]).state("IDLE")
+
+class TestSnapshot(unittest.TestCase):
+    def test_should_restore_state_and_attrs(self):
+        source = machine(StateLogic())
+        source.start()
+        Attr(source, "counter", 3)
+        Attr(source, "tags", ["a", "b"], indexed=True)
+        record = source.snapshot()
+        self.assertIsInstance(record, bytes)
+
+        target = machine(StateLogic())
+        Attr(target, "tags", [], indexed=True)
+        target.restore(record)
+        self.assertEqual(target.state(), "RUNNING")
+        self.assertEqual(target.counter(), 3)
+        self.assertTrue(target._["tags"].contains("b"))
+        target.stop()
+        self.assertEqual(target.state(), "IDLE")
+
+    def test_should_keep_plain_records_small(self):
+        fsm = machine()
+        self.assertEqual(len(fsm.snapshot()), Snapshot.HEADER.size)
+        self.assertEqual(Snapshot.definition(fsm)[0], Snapshot.definition(machine())[0])
+
+    def test_should_pack_an_attr_recreated_under_the_same_name(self):
+        source = machine(StateLogic())
+        Attr(source, "counter", 3)
+        source.snapshot()
+        Attr(source, "counter", 4)
+        target = machine(StateLogic())
+        target.restore(source.snapshot())
+        self.assertEqual(target.counter(), 4)
+
+    def test_should_bound_shared_definitions(self):
+        shared = Snapshot.SHARED
+        Snapshot.SHARED = 2
+        try:
+            for i in range(5):
+                Snapshot.definition(FSM().fromTable([("go%d" % i, "A", "B")]))
+                self.assertLessEqual(len(Snapshot.__shared__), 2)
+        finally:
+            Snapshot.SHARED = shared
+
+    def test_should_reject_another_machine(self):
+        other = FSM().transition("go", "A", "B").state("A")
+        with self.assertRaises(ValueError):
+            other.restore(machine().snapshot())
+
+    def test_should_pickle_round_trip(self):
+        fsm = machine()
+        fsm.start()
+        Attr(fsm, "owner", "ops")
+        copy = pickle.loads(pickle.dumps(fsm))
+        self.assertIsInstance(copy, FSM)
+        self.assertEqual(copy.state(), "RUNNING")
+        self.assertEqual(copy.owner(), "ops")
+        self.assertEqual(copy.snapshot(), fsm.snapshot())
+        copy.stop()
+        self.assertEqual(copy.state(), "IDLE")
+        self.assertEqual(fsm.state(), "RUNNING")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,7 +11,7 @@ import sys
 
 # Adjust the path to import StateLogic
 sys.path.insert(0, realpath(join(__file__, "../../src/")))
-from statelogic import StateLogic
+from statelogic import Attr, StateLogic
 patch_target = '__builtin__.print' if sys.version_info[0] < 3 else 'builtins.print'
 
 class TestStateLogic(unittest.TestCase):
@@ -75,6 +75,77 @@ class TestStateLogic(unittest.TestCase):
         s.freeze()
         self.assertEqual(s.state(), "SOLID")
 
+    def test_can_should_report_events_valid_from_current_state(self):
+        self.state_logic.state("GAS")
+        self.assertTrue(self.state_logic.can("condense"))
+        self.assertFalse(self.state_logic.can("freeze"))
+        self.assertFalse(self.state_logic.can("unknown"))
+        self.state_logic.condense()
+        self.assertTrue(self.state_logic.can("freeze"))
+        self.assertFalse(self.state_logic.can("condense"))
+
+    def test_fire_should_ignore_event_from_wrong_state(self):
+        self.state_logic.state("GAS")
+        self.state_logic.fire("freeze")
+        self.assertEqual(self.state_logic.state(), "GAS")
+
+    def test_should_call_hooks_registered_through_method(self):
+        calls = []
+        self.state_logic.method("afterCondense", lambda self: calls.append("afterCondense"))
+        self.state_logic.on("SOLID", lambda self: calls.append("onSOLID"))
+        self.state_logic.state("GAS")
+        self.state_logic.condense()
+        self.state_logic.freeze()
+        self.assertEqual(calls, ["afterCondense", "onSOLID"])
+
+    def test_should_define_transitions_from_table(self):
+        calls = []
+        s = StateLogic()
+        s.fromTable([
+            ("melts", "SOLID", "LIQUID"),
+            ("evaporate", "LIQUID", "GAS", {"after": lambda self: calls.append("afterEvaporate")}),
+            ("return", "GAS", "PLASMA"),
+        ])
+        self.assertEqual(s.events(), ["evaporate", "melts"])
+        self.assertEqual(s.states(), ["GAS", "LIQUID", "PLASMA", "SOLID"])
+        s.state("SOLID")
+        s.melts().evaporate()
+        self.assertEqual(s.state(), "GAS")
+        self.assertEqual(calls, ["afterEvaporate"])
+
+    def test_should_keep_state_choices_unique_for_large_tables(self):
+        s = StateLogic()
+        s.fromTable([("e%d" % i, "S%d" % i, "S%d" % (i + 1)) for i in range(3000)])
+        s.fromTable([("back%d" % i, "S%d" % (i + 1), "S%d" % i) for i in range(3000)])
+        self.assertEqual(s.stateChoice(), ["S%d" % i for i in range(3001)])
+        s.state("S9999")
+        self.assertIsNone(s.state())
+        s.state("S3000")
+        self.assertEqual(s.fire("back2999").state(), "S2999")
+
+    def test_sorted_lists_should_be_copies(self):
+        events = self.state_logic.events()
+        events.append("boil")
+        self.assertEqual(self.state_logic.events(), ["condense", "freeze"])
+
+    def test_should_accept_unhashable_value_choices(self):
+        s = StateLogic()
+        Attr(s, "shape", valueChoice=[{"sides": 4}, "ring", {"sides": 4}], useChoiceOnly=True)
+        self.assertEqual(s.shapeChoice(), [{"sides": 4}, "ring"])
+        s.shape({"sides": 4})
+        self.assertEqual(s.shape(), {"sides": 4})
+        s.shape({"sides": 3})
+        self.assertEqual(s.shape(), {"sides": 4})
+        s.shape("ring")
+        self.assertEqual(s.shape(), "ring")
+
+    def test_should_define_transitions_from_dict(self):
+        s = StateLogic()
+        s.fromTable({"freeze": ("LIQUID", "SOLID"), "melts": ("SOLID", "LIQUID")})
+        s.state("LIQUID")
+        s.fire("freeze")
+        self.assertEqual(s.state(), "SOLID")
+
     @patch(patch_target)
     def test_should_log_messages(self, mock_print):
         self.state_logic.infoMsg("Starting state transition")
@@ -35,6 +35,15 @@ class TestStateLogic(unittest.TestCase):
         expected_transitions = ["condense", "freeze"]
         self.assertEqual(state_logic.events(), expected_transitions)
 
+    def test_should_refresh_sorted_states_after_new_transition(self):
+        state_logic = StateLogic()
+        state_logic.transition("freeze", "LIQUID", "SOLID")
+        self.assertEqual(state_logic.states(), ["LIQUID", "SOLID"])
+        state_logic.transition("evaporate", "LIQUID", "GAS")
+        self.assertEqual(state_logic.states(), ["GAS", "LIQUID", "SOLID"])
+        self.assertTrue(state_logic._["states"].contains("GAS"))
+        self.assertFalse(state_logic._["states"].contains("PLASMA"))
+
     def test_should_handle_illegal_state_gracefully(self):
         state_logic = StateLogic()
         state_logic.state("illegalState")
@@ -97,6 +106,36 @@ class TestStateLogic(unittest.TestCase):
         state_logic.infoMsg("Starting state transition")
         mock_print.assert_called()  # Check if logging occurred
 
+    @patch(patch_target)
+    def test_should_filter_messages_below_log_level(self, mock_print):
+        state_logic = StateLogic()
+        state_logic.logLevel(StateLogic.CRITICAL)
+        state_logic.infoMsg("%d items", "FSM", object())  # Never formatted
+        state_logic.safeMsg("done")
+        mock_print.assert_not_called()
+        state_logic.criticalMsg("failed")
+        self.assertEqual(mock_print.call_count, 1)
+        state_logic.logLevel(StateLogic.OFF).criticalMsg("failed")
+        self.assertEqual(mock_print.call_count, 1)
+
+    def test_fsm_messages_should_pass_arguments_unformatted(self):
+        state_logic = StateLogic()
+        state_logic.transition("melt", "SOLID", "LIQUID").state("SOLID")
+        with patch.object(state_logic, "infoMsg") as info:
+            state_logic.fire("boil")
+            info.assert_called_once_with("No transition named '%s' found from state '%s'", "FSM", "boil", "SOLID")
+            state_logic.on("melt", lambda machine: machine.stateChanged())
+            with patch("statelogic.Settings.Settings.showState", return_value=True):
+                state_logic.fire("melt")
+            info.assert_called_with("Transition (%s) : [%s] -> [%s]", "STATE CHANGED", "melt", "SOLID", "LIQUID")
+
+    @patch(patch_target)
+    def test_should_format_deferred_arguments(self, mock_print):
+        state_logic = StateLogic()
+        state_logic.useColor(False)
+        state_logic.infoMsg("%d of %s", "COUNT", 3, "items")
+        self.assertTrue(mock_print.call_args[0][0].endswith(" [COUNT]: \n  3 of items"))
+
     def test_should_call_hook_methods_on_state_transition(self):
         state_logic = StateLogic()  # Creating instance directly
         state_logic.transition("condense", "GAS", "LIQUID")  # ADD THIS LINE
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import os
+import shutil
+import tempfile
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM
+from statelogic.StateLogic import StateLogic
+from statelogic.StateStore import StateStore
+from statelogic.FleetFSM import FleetFSM, numpy
+
+def machine(fsm=None):
+    fsm = fsm if fsm is not None else FSM()
+    return fsm.fromTable([("start", "IDLE", "RUNNING"), ("stop", "RUNNING", "IDLE")]).state("IDLE")
+
+class TestStateStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "states.bin")
+        self.store = StateStore(self.path, machine(), capacity=4)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.dir)
+
+    def test_should_keep_state_in_record(self):
+        fsm = self.store.attach(machine(StateLogic()), 2)
+        self.assertEqual(self.store.state(2), "IDLE")
+        fsm.start()
+        self.assertEqual(fsm.state(), "RUNNING")
+        self.assertEqual(self.store.code(2), 1)
+        self.assertEqual(self.store.state(0), None)
+
+    def test_should_resume_after_reopen(self):
+        self.store.attach(machine(), 9).start()
+        self.assertGreaterEqual(self.store.capacity(), 10)
+        self.store.close()
+        self.store = StateStore(self.path, machine())
+        fsm = self.store.attach(machine(), 9)
+        self.assertEqual(fsm.state(), "RUNNING")
+        fsm.stop()
+        self.assertEqual(fsm.state(), "IDLE")
+        with self.assertRaises(ValueError):
+            StateStore(self.path, ["OTHER"])
+
+    def test_attach_should_reject_unknown_states(self):
+        fsm = machine(StateLogic())
+        fsm.transition("fail", "RUNNING", "FAILED")
+        with self.assertRaises(ValueError):
+            self.store.attach(fsm, 1)
+        self.assertEqual(self.store.state(1), None)
+        fsm.start()
+        fsm.fail()
+        self.assertEqual(fsm.state(), "FAILED")
+
+    def test_should_read_from_another_handle(self):
+        fsm = self.store.attach(machine(), 1)
+        reader = StateStore(self.path, readonly=True)
+        try:
+            self.assertEqual(reader.states(), ["IDLE", "RUNNING"])
+            fsm.start()
+            self.assertEqual(reader.state(1), "RUNNING")
+            self.store.state(50, "IDLE")
+            self.assertEqual(reader.state(50), "IDLE")
+        finally:
+            reader.close()
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_should_back_a_fleet(self):
+        self.store.state(3, "RUNNING")
+        fleet = FleetFSM(machine(), 8, initial="IDLE", store=self.store)
+        self.assertEqual(fleet.state([0, 3]), ["IDLE", "RUNNING"])
+        fleet.fire("start", [0])
+        self.assertEqual(self.store.state(0), "RUNNING")
+        del fleet
+
+if __name__ == '__main__':
+    unittest.main()
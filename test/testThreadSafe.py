@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function, absolute_import, division
+import threading
+import unittest
+from os.path import join, realpath
+import sys
+
+# Adjust the path to import StateLogic
+sys.path.insert(0, realpath(join(__file__, "../../src/")))
+from statelogic import FSM
+
+class TestThreadSafe(unittest.TestCase):
+    def setUp(self):
+        self.fsm = FSM()
+        self.fsm.transition("start", "IDLE", "RUNNING")
+        self.fsm.transition("stop", "RUNNING", "IDLE")
+        self.fsm.threadSafe()
+
+    def test_should_still_transition(self):
+        self.fsm.state("IDLE")
+        self.fsm.start()
+        self.assertEqual(self.fsm.state(), "RUNNING")
+        self.assertIsNone(self.fsm.context())
+
+    def test_hooks_should_see_their_own_context_when_nested(self):
+        seen = []
+        def afterStart(self):
+            seen.append(self.context().transitionName())
+            self.fire("stop")
+            seen.append(self.context().transitionName())
+        def onStop(self):
+            seen.append(self.context().transitionName())
+        self.fsm.after("start", afterStart)
+        self.fsm.on("stop", onStop)
+        self.fsm.state("IDLE")
+        self.fsm.start()
+        self.assertEqual(seen, ["start", "stop", "start"])
+
+    def test_context_should_be_immutable(self):
+        contexts = []
+        self.fsm.before("start", lambda self: contexts.append(self.context()) or True)
+        self.fsm.state("IDLE")
+        self.fsm.start()
+        self.assertEqual(contexts[0].fromState(), "IDLE")
+        self.assertEqual(contexts[0].toState(), "RUNNING")
+        with self.assertRaises(AttributeError):
+            contexts[0]._toState = "X"
+
+    def test_concurrent_fires_should_each_transition_once(self):
+        counts = {"start": 0, "stop": 0}
+        def count(self):
+            name = self.context().transitionName()
+            counts[name] += 1
+        self.fsm.after("start", count)
+        self.fsm.after("stop", count)
+        self.fsm.state("IDLE")
+        def worker():
+            for i in range(500):
+                self.fsm.fire("start")
+                self.fsm.fire("stop")
+        threads = [threading.Thread(target=worker) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(counts["start"] - counts["stop"], 1 if self.fsm.state() == "RUNNING" else 0)
+
+if __name__ == '__main__':
+    unittest.main()